@@ -0,0 +1,67 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from django.conf import settings
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of resolved auth tokens with a time-to-live.
+
+    Entries are kept per process, so the TTL bounds how long a token revoked
+    by another worker can still be used here.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, token = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return token
+
+    def set(self, key: str, token: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, token)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_user(self, user_id: Any) -> None:
+        with self._lock:
+            stale = [
+                key
+                for key, (_, token) in self._entries.items()
+                if token.user_id == user_id
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = TokenCache(
+    max_size=getattr(settings, "AUTH_TOKEN_CACHE_SIZE", 1024),
+    ttl=getattr(settings, "AUTH_TOKEN_CACHE_TTL", 60),
+)
@@ -2,9 +2,11 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractUser, UserManager
 from django.core.validators import MinLengthValidator, RegexValidator
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from authentication.cache import token_cache
+
 
 class CustomUserManager(UserManager):
 
@@ -90,3 +92,17 @@ def save_profile(sender, instance, **kwargs):  # type: ignore
         instance.employee.save()
     elif instance.user_type == "owner" and hasattr(instance, "owner"):
         instance.owner.save()
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver([post_save, post_delete], sender=Owner)
+@receiver([post_save, post_delete], sender=Employee)
+@receiver([post_save, post_delete], sender=Customer)
+def invalidate_cached_tokens(sender, instance, **kwargs):  # type: ignore
+    # Drop cached tokens so the next request reloads the user and its profile
+    token_cache.invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender="authtoken.Token")
+def invalidate_deleted_token(sender, instance, **kwargs):  # type: ignore
+    token_cache.invalidate(instance.key)
@@ -4,6 +4,8 @@ from rest_framework import permissions
 from rest_framework.request import Request
 from rest_framework.views import APIView
 
+from restaurants.scopes import in_scope
+
 
 class IsOwner(permissions.BasePermission):
     def has_permission(self, request: Request, view: APIView) -> bool:
@@ -31,23 +33,8 @@ class IsOwnerOrEmployeeOrReadOnly(permissions.BasePermission):
             return True
 
         # creator of the object
-        if request.user == obj.user:
-            return True
-
-        # allowed for the user, usertype is "owner" and owner of the related restaurant
-        if (
-            request.user.user_type == "owner"
-            and hasattr(obj, "restaurant")
-            and request.user.owner == obj.restaurant.owner
-        ):
+        if obj.created_by_id == request.user.pk:
             return True
 
-        # usertype is "employee" and employee of the related restaurant
-        if (
-            request.user.user_type == "employee"
-            and hasattr(obj, "restaurant")
-            and request.user.employee.restaurant == obj.restaurant
-        ):
-            return True
-
-        return False
+        # owner or employee of the related restaurant
+        return hasattr(obj, "restaurant_id") and in_scope(request, obj.restaurant_id)
@@ -1,10 +1,15 @@
 from django.contrib.auth import authenticate, get_user_model
 from rest_framework import exceptions, serializers
 
+from core.metrics import SerializeTimingMixin
+from core.sparse_fields import SparseFieldsMixin
+
 user_model = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(
+    SerializeTimingMixin, SparseFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = user_model
         fields = "__all__"
@@ -0,0 +1,67 @@
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import exceptions, status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from authentication.authentication import CachedTokenAuthentication
+from authentication.cache import TokenCache, token_cache
+from authentication.models import User
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+
+    def setUp(self) -> None:
+        token_cache.clear()
+        self.user = User.objects.create_user(
+            username="owner1", password="Test@1234", user_type="owner"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.authentication = CachedTokenAuthentication()
+
+    def test_cache_hit_costs_no_queries(self) -> None:
+        # Test the user and its profile are served from the cache
+        with self.assertNumQueries(1):
+            self.authentication.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            user, token = self.authentication.authenticate_credentials(self.token.key)
+            self.assertEqual(user.owner.pk, self.user.pk)
+        self.assertEqual(token.key, self.token.key)
+
+    def test_invalid_token(self) -> None:
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authentication.authenticate_credentials("invalid")
+
+    def test_logout_invalidates(self) -> None:
+        # Test a token cached before logout is rejected afterwards
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.token.key)
+        response = self.client.post(reverse("authentication:logout"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(reverse("authentication:logout"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_save_invalidates(self) -> None:
+        # Test deactivating a user takes effect on the next request
+        self.authentication.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            self.authentication.authenticate_credentials(self.token.key)
+
+
+class TokenCacheTests(SimpleTestCase):
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache = TokenCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(len(cache), 2)
+
+    def test_expired_entry_is_dropped(self) -> None:
+        cache = TokenCache(max_size=2, ttl=-1)
+        cache.set("a", 1)
+        self.assertIsNone(cache.get("a"))
@@ -112,3 +112,10 @@ class UserDetailsViewTests(APITestCase):
         self.client.credentials()  # Remove token
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_sparse_fields(self) -> None:
+        # Test ?fields= limits the user details to the requested fields
+        response = self.client.get(self.url, {"fields": "id,username"})
+        self.assertEqual(
+            response.data, {"id": self.user.pk, "username": self.user.username}
+        )
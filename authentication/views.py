@@ -6,6 +6,7 @@ from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from authentication.cache import token_cache
 from authentication.serializers import (
     LoginSerializer,
     UserRegistrationSerializer,
@@ -50,6 +51,8 @@ class LogoutView(APIView):
             request.user.auth_token.delete()
         except (AttributeError, ObjectDoesNotExist):
             pass
+        if request.auth is not None:
+            token_cache.invalidate(request.auth.key)
         return Response(
             {"detail": "Successfully logged out."},
             status=status.HTTP_200_OK,
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+# Read by the settings: persistent connections are not reused under ASGI
+os.environ.setdefault("DJANGO_SERVER", "asgi")
 
 application = get_asgi_application()
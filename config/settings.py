@@ -10,22 +10,37 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
-# Quick-start development settings - unsuitable for production
-# See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
+# Settings profile: "dev" (default), "test" (picked automatically by
+# `manage.py test`) or "prod". The profile selects the database setup below.
+PROFILE = os.environ.get(
+    "DJANGO_PROFILE", "test" if sys.argv[1:2] == ["test"] else "dev"
+)
+if PROFILE not in ("dev", "test", "prod"):
+    raise ValueError(f"Unknown DJANGO_PROFILE {PROFILE!r}")
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = "django-insecure-rdzf1($7%r8g$l9v^09t*w(kj&+6$beck&8l=)69_n89n^dus="
+if PROFILE == "prod":
+    SECRET_KEY = os.environ["DJANGO_SECRET_KEY"]
+else:
+    SECRET_KEY = os.environ.get(
+        "DJANGO_SECRET_KEY",
+        "django-insecure-rdzf1($7%r8g$l9v^09t*w(kj&+6$beck&8l=)69_n89n^dus=",
+    )
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = PROFILE != "prod"
 
-ALLOWED_HOSTS: list[str] = []
+ALLOWED_HOSTS: list[str] = [
+    host for host in os.environ.get("DJANGO_ALLOWED_HOSTS", "").split(",") if host
+]
 
 
 # Application definition
@@ -42,11 +57,13 @@ INSTALLED_APPS = [
     "rest_framework.authtoken",
     "drf_spectacular",
     # Created Apps
+    "core.apps.CoreConfig",
     "authentication.apps.AuthenticationConfig",
     "restaurants.apps.RestaurantsConfig",
 ]
 
 MIDDLEWARE = [
+    "core.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -80,14 +97,84 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# "prod" uses PostgreSQL configured through DATABASE_* environment variables.
+# With DATABASE_POOL=1 connections come from psycopg's pool (Django 5.1+ and the
+# `postgres` extra); otherwise each worker keeps its connection open for
+# CONN_MAX_AGE seconds and checks it is still alive before reusing it. The
+# two are mutually exclusive.
+#
+# Under ASGI the sync code of every request runs in a thread of its own and
+# connections belong to threads, so a persistent connection is never reused
+# and lingers until it is garbage collected. config/asgi.py sets
+# DJANGO_SERVER=asgi, which makes CONN_MAX_AGE default to 0 there; reuse
+# connections under ASGI with DATABASE_POOL=1 instead.
+SERVING_ASGI = os.environ.get("DJANGO_SERVER") == "asgi"
+if PROFILE == "prod":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get("DATABASE_NAME", "restaurants"),
+            "USER": os.environ.get("DATABASE_USER", "restaurants"),
+            "PASSWORD": os.environ.get("DATABASE_PASSWORD", ""),
+            "HOST": os.environ.get("DATABASE_HOST", "localhost"),
+            "PORT": os.environ.get("DATABASE_PORT", "5432"),
+            "OPTIONS": {},
+        }
+    }
+    if os.environ.get("DATABASE_POOL") == "1":
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.environ.get("DATABASE_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.environ.get("DATABASE_POOL_MAX_SIZE", 10)),
+            "timeout": 10,
+        }
+    else:
+        DATABASES["default"]["CONN_MAX_AGE"] = int(
+            os.environ.get("DATABASE_CONN_MAX_AGE", 0 if SERVING_ASGI else 600)
+        )
+        DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+            "CONN_MAX_AGE": int(
+                os.environ.get("DATABASE_CONN_MAX_AGE", 0 if SERVING_ASGI else 60)
+            ),
+            "CONN_HEALTH_CHECKS": True,
+        }
     }
+
+# PRAGMAs applied to every new SQLite connection (see core.db). WAL lets
+# readers and a writer work concurrently, synchronous=NORMAL is durable in WAL
+# mode while skipping most fsyncs, and mmap serves reads from the page cache.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Pre-rendered public menu documents. Point this at FileBasedCache or
+    # RedisCache to share the documents between workers, e.g.
+    #   "BACKEND": "django.core.cache.backends.redis.RedisCache",
+    #   "LOCATION": "redis://127.0.0.1:6379/1",
+    "menu_documents": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "menu-documents",
+        "TIMEOUT": 60 * 60 * 24,
+    },
+}
+
+MENU_DOCUMENT_CACHE = "menu_documents"
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -133,10 +220,40 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Custom User Model
 AUTH_USER_MODEL = "authentication.User"
 
+if PROFILE == "test":
+    # Tests create many users; a slow hasher only costs time there
+    PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
 # DRF Configurations
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "authentication.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "restaurants.pagination.KeysetPagination",
+    "PAGE_SIZE": 50,
+}
+
+# Resolved auth tokens cached per process. The TTL bounds how long a token
+# revoked through another worker keeps working in this one.
+AUTH_TOKEN_CACHE_SIZE = 1024
+AUTH_TOKEN_CACHE_TTL = 60
+
+# Number of recent requests kept per route for the /api/metrics/ percentiles
+REQUEST_METRICS_WINDOW = 1000
+
+# Pub/sub backend fanning order status events out to the SSE streams. The
+# in-process broker only reaches clients connected to the same worker.
+ORDER_EVENTS_BROKER = "restaurants.events.InProcessBroker"
+# Seconds between keep-alive comments on idle event streams
+ORDER_EVENTS_HEARTBEAT = 15
+
+# Seconds a stored Idempotency-Key response is replayed for
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+
+# Cache-Control of list and detail responses, as patch_cache_control keyword
+# arguments per router basename. Responses vary by user, so the default lets
+# clients keep them but revalidate with the ETag on every use.
+READ_CACHE_CONTROL = {
+    "default": {"private": True, "no_cache": True},
 }
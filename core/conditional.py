@@ -0,0 +1,149 @@
+"""
+Conditional GET for read endpoints.
+
+Validators are computed from the loaded objects without serializing
+anything: the ids and ``updated_at`` of the rows on the requested page for
+lists, which catch rows added, removed or changed, and the object's
+``updated_at`` for details, whose ``Last-Modified`` is held back until the
+second of the last change is over. A request whose ``If-None-Match`` or
+``If-Modified-Since`` still matches gets a ``304 Not Modified`` before the
+body is built. Relations rendered into the representation, e.g. the lines
+embedded in an order, change the validators too: nested serializers are
+followed automatically, other relations are listed in ``conditional_related``.
+Related rows without an ``updated_at``, such as users, are stamped with their
+loaded column values.
+
+``Cache-Control`` comes from the ``READ_CACHE_CONTROL`` setting, keyed by
+the router basename of the view, with ``"default"`` as the fallback.
+"""
+
+import hashlib
+from typing import Any
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.generics import GenericAPIView
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+
+DEFAULT_CACHE_CONTROL = {"private": True, "no_cache": True}
+
+
+def related_objects(instance: Any, path: str) -> list[Any]:
+    # Walks loaded (select_related or prefetched) relations only
+    objects = [instance]
+    for name in path.split("__"):
+        found = []
+        for obj in objects:
+            value = getattr(obj, name)
+            if hasattr(value, "all"):
+                found.extend(value.all())
+            elif value is not None:
+                found.append(value)
+        objects = found
+    return objects
+
+
+def stamp(obj: Any) -> tuple:
+    if hasattr(obj, "updated_at"):
+        return obj.pk, obj.updated_at
+    # Read from __dict__ so deferred columns are not loaded one by one
+    fields = obj._meta.concrete_fields
+    return obj.pk, tuple(obj.__dict__.get(field.attname) for field in fields)
+
+
+class ConditionalGetMixin(GenericAPIView):
+    # Relation paths read through by fields of the representation, such as
+    # ``restaurant`` for a ``restaurant.name`` source
+    conditional_related: list[str] = []
+
+    def rendered_related(self) -> list[str]:
+        fields = self.get_serializer().fields.values()
+        sources = {field.source.split(".")[0] for field in fields}
+        related = [
+            path for path in self.conditional_related if path.split("__")[0] in sources
+        ]
+        # Nested objects, e.g. relations embedded by ``?expand=``
+        related += [
+            field.source
+            for field in fields
+            if isinstance(field, BaseSerializer) and field.source not in related
+        ]
+        return related
+
+    def stamps(self, instances: list[Any], related: list[str]) -> list[tuple]:
+        stamps = []
+        for instance in instances:
+            stamps.append(stamp(instance))
+            for path in related:
+                stamps += [stamp(obj) for obj in related_objects(instance, path)]
+        return stamps
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Any:
+        # Only the page is stamped, and it is loaded once for both the
+        # validators and the body
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        instances = list(queryset) if page is None else page
+
+        # A deleted row moves no timestamp, so lists only get an ETag
+        etag = self.make_etag(request, self.stamps(instances, self.rendered_related()))
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            data = self.get_serializer(instances, many=True).data
+            if page is None:
+                response = Response(data)
+            else:
+                response = self.get_paginated_response(data)
+        return self.add_validators(response, etag)
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Any:
+        instance = self.get_object()
+        related = self.rendered_related()
+
+        etag = self.make_etag(request, self.stamps([instance], related))
+        # HTTP dates have whole seconds, so Last-Modified is only sent once the
+        # second of the last change is over: a later change within it, such as
+        # the counters every new order bumps on its restaurant, would carry the
+        # same date. A removed related row would not move the latest
+        # updated_at, so only the ETag is sent for those too.
+        last_modified = int(instance.updated_at.timestamp())
+        if related or last_modified >= int(timezone.now().timestamp()):
+            last_modified = None
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+        return self.add_validators(response, etag, last_modified)
+
+    def make_etag(self, request: Request, stamps: Any) -> str:
+        # The representation also depends on the user, the query string
+        # (page, ?fields=, ?expand=) and the negotiated media type
+        accepted = getattr(request, "accepted_media_type", "")
+        key = f"{request.user.pk}\n{request.get_full_path()}\n{accepted}\n{stamps}"
+        return f'W/"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+    def add_validators(
+        self, response: HttpResponse, etag: str, last_modified: int | None = None
+    ) -> HttpResponse:
+        if response.status_code not in (200, 304):
+            return response
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        rules = getattr(settings, "READ_CACHE_CONTROL", {})
+        patch_cache_control(
+            response,
+            **rules.get(self.basename, rules.get("default", DEFAULT_CACHE_CONTROL)),
+        )
+        patch_vary_headers(response, ("Accept", "Authorization"))
+        return response
@@ -0,0 +1,16 @@
+from typing import Any
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def configure_sqlite(sender: Any, connection: Any, **kwargs: Any) -> None:
+    # Apply SQLITE_PRAGMAS once per connection; persistent connections pay
+    # for this only when they are opened, not on every request.
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for name, value in getattr(settings, "SQLITE_PRAGMAS", {}).items():
+            cursor.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,159 @@
+import json
+import platform
+import statistics
+import time
+from typing import Any, Callable
+
+import django
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from core.metrics import percentile
+from core.middleware import QueryTimer
+from restaurants.models import Item, Order
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the REST API hot paths through the Django test client and "
+        "report throughput, latency percentiles and query counts as JSON."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--requests", type=int, default=50, help="Requests per scenario."
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=5, help="Untimed requests per scenario."
+        )
+        parser.add_argument(
+            "--username", help="User to benchmark as (defaults to a customer)."
+        )
+        parser.add_argument("--password", default="password")
+        parser.add_argument("--host", default="localhost")
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            dest="scenarios",
+            help="Only run the given scenario(s).",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.client = Client(HTTP_HOST=options["host"])
+        self.username = options["username"] or self.default_username()
+        self.password = options["password"]
+        token = self.login().json()["token"]
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Token {token}"
+
+        scenarios = self.scenarios()
+        selected = options["scenarios"] or list(scenarios)
+        unknown = set(selected) - set(scenarios)
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+        report = {
+            "meta": {
+                "timestamp": timezone.now().isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "requests": options["requests"],
+                "user": self.username,
+            },
+            "scenarios": {
+                name: self.run(scenarios[name], options["requests"], options["warmup"])
+                for name in selected
+            },
+        }
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def default_username(self) -> str:
+        order = Order.objects.select_related("client").order_by("-id").first()
+        if order is None:
+            raise CommandError("No orders found; run the seed_data command first.")
+        return order.client.username
+
+    def scenarios(self) -> dict[str, Callable[[], HttpResponse]]:
+        order = Order.objects.filter(client__username=self.username).last()
+        if order is None:
+            raise CommandError(f"User {self.username} has no orders to benchmark.")
+        items = list(
+            Item.objects.filter(restaurant_id=order.restaurant_id, is_available=True)
+            .order_by("id")
+            .values_list("id", flat=True)[:5]
+        )
+        cart = {
+            "restaurant": order.restaurant_id,
+            "address": "Benchmark Address",
+            "payment_method": "cash",
+            "items": [{"item_id": pk, "quantity": 1} for pk in items],
+        }
+        list_url = reverse("restaurants:order-list")
+        detail_url = reverse("restaurants:order-detail", kwargs={"pk": order.pk})
+        place_url = reverse("restaurants:order-place")
+
+        return {
+            "order-list": lambda: self.client.get(list_url),
+            "order-detail": lambda: self.client.get(detail_url),
+            "order-create": lambda: self.client.post(
+                place_url, cart, content_type="application/json"
+            ),
+            "login": self.login,
+        }
+
+    def login(self) -> HttpResponse:
+        return self.client.post(
+            reverse("authentication:login"),
+            {"username": self.username, "password": self.password},
+            content_type="application/json",
+            HTTP_AUTHORIZATION="",
+        )
+
+    def run(self, request: Callable[[], HttpResponse], count: int, warmup: int) -> dict:
+        for _ in range(warmup):
+            request()
+
+        latencies: list[float] = []
+        queries: list[int] = []
+        errors = 0
+        started = time.perf_counter()
+        for _ in range(count):
+            timer = QueryTimer()
+            start = time.perf_counter()
+            with connection.execute_wrapper(timer):
+                response = request()
+            latencies.append((time.perf_counter() - start) * 1000)
+            queries.append(timer.count)
+            if response.status_code >= 400:
+                errors += 1
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        queries.sort()
+        return {
+            "requests": count,
+            "errors": errors,
+            "throughput_rps": round(count / elapsed, 2) if elapsed else None,
+            "latency_ms": {
+                "mean": round(statistics.fmean(latencies), 3) if latencies else 0,
+                "p50": round(percentile(latencies, 50), 3),
+                "p95": round(percentile(latencies, 95), 3),
+                "p99": round(percentile(latencies, 99), 3),
+                "max": round(latencies[-1], 3) if latencies else 0,
+            },
+            "queries": {
+                "p50": percentile(queries, 50),
+                "max": queries[-1] if queries else 0,
+            },
+        }
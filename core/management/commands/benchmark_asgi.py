@@ -0,0 +1,190 @@
+import asyncio
+import json
+import platform
+import threading
+import time
+from typing import Any
+
+import django
+from asgiref.sync import ThreadSensitiveContext
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, connections
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from core.metrics import percentile
+from restaurants.models import Order
+
+# Sparse fields of the sync order detail matching the async status payload
+STATUS_FIELDS = "id,order_id,is_paid,updated_at"
+
+SCENARIOS = {
+    # name: (sync URL name, sync query string, async URL name, object whose pk
+    # is in the URL); the query string makes both sides return the same payload
+    "menu-document": (
+        "restaurants:restaurant-menu-document",
+        "",
+        "restaurants:async-menu-document",
+        "restaurant",
+    ),
+    "order-list": ("restaurants:order-list", "", "restaurants:async-order-list", None),
+    "order-status": (
+        "restaurants:order-detail",
+        f"?fields={STATUS_FIELDS}",
+        "restaurants:async-order-status",
+        "order",
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync (WSGI) read endpoints with their async (ASGI) "
+        "versions under concurrent load and report throughput and latency "
+        "percentiles as JSON. Requests go through the in-process WSGI and ASGI "
+        "handlers, so the numbers compare handler and thread costs; point an "
+        "external load generator at a real server for wire-level figures."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per run."
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=20, help="Requests in flight."
+        )
+        parser.add_argument(
+            "--username", help="User to benchmark as (defaults to a customer)."
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            dest="scenarios",
+            choices=list(SCENARIOS),
+            help="Only run the given scenario(s).",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        order = Order.objects.select_related("client").order_by("-id")
+        if options["username"]:
+            order = order.filter(client__username=options["username"])
+        latest = order.first()
+        if latest is None:
+            raise CommandError("No orders found; run the seed_data command first.")
+        token, _ = Token.objects.get_or_create(user=latest.client)
+        self.headers = {"Authorization": f"Token {token.key}"}
+
+        report: dict[str, Any] = {
+            "meta": {
+                "timestamp": timezone.now().isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "requests": options["requests"],
+                "concurrency": options["concurrency"],
+                "user": latest.client.username,
+            },
+            "scenarios": {},
+        }
+        # AsyncClient always sends "testserver" as the host
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for name in options["scenarios"] or list(SCENARIOS):
+                report["scenarios"][name] = self.compare(name, latest, options)
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(output + "\n")
+        else:
+            self.stdout.write(output)
+
+    def compare(self, name: str, order: Order, options: dict) -> dict:
+        sync_name, sync_query, async_name, target = SCENARIOS[name]
+        pks = {"restaurant": order.restaurant_id, "order": order.pk}
+        kwargs = {"pk": pks[target]} if target else {}
+        count, concurrency = options["requests"], options["concurrency"]
+
+        sync_url = reverse(sync_name, kwargs=kwargs) + sync_query
+        wsgi = self.run_wsgi(sync_url, count, concurrency)
+        asgi = asyncio.run(
+            self.run_asgi(reverse(async_name, kwargs=kwargs), count, concurrency)
+        )
+        return {
+            "wsgi": wsgi,
+            "asgi": asgi,
+            "speedup": (
+                round(asgi["throughput_rps"] / wsgi["throughput_rps"], 2)
+                if wsgi["throughput_rps"]
+                else None
+            ),
+        }
+
+    def run_wsgi(self, url: str, count: int, concurrency: int) -> dict:
+        # One thread per concurrent client, as a threaded WSGI server would use
+        latencies: list[float] = []
+        errors = [0]
+        remaining = [count]
+        lock = threading.Lock()
+
+        def worker() -> None:
+            client = Client(headers=self.headers)
+            while True:
+                with lock:
+                    if remaining[0] == 0:
+                        break
+                    remaining[0] -= 1
+                start = time.perf_counter()
+                response = client.get(url)
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    latencies.append(elapsed)
+                    errors[0] += response.status_code >= 400
+            connections.close_all()
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.summarize(latencies, errors[0], time.perf_counter() - started)
+
+    async def run_asgi(self, url: str, count: int, concurrency: int) -> dict:
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies: list[float] = []
+        errors = 0
+
+        async def request() -> None:
+            nonlocal errors
+            async with semaphore:
+                # Mirror ASGIHandler, which gives each request its own
+                # thread for sync code instead of sharing a single one
+                async with ThreadSensitiveContext():
+                    start = time.perf_counter()
+                    response = await client.get(url, headers=self.headers)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    errors += response.status_code >= 400
+
+        started = time.perf_counter()
+        await asyncio.gather(*(request() for _ in range(count)))
+        return self.summarize(latencies, errors, time.perf_counter() - started)
+
+    @staticmethod
+    def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+        latencies.sort()
+        return {
+            "requests": len(latencies),
+            "errors": errors,
+            "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else None,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 3),
+                "p95": round(percentile(latencies, 95), 3),
+                "p99": round(percentile(latencies, 99), 3),
+                "max": round(latencies[-1], 3) if latencies else 0,
+            },
+        }
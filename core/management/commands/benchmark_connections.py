@@ -0,0 +1,72 @@
+import json
+import statistics
+import time
+from typing import Any, Callable
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connections
+
+from core.metrics import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure what opening a database connection per request costs compared "
+        "with reusing a persistent or pooled one, and report it as JSON."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--database", default="default")
+        parser.add_argument(
+            "--query", default="SELECT 1", help="Query run after connecting."
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        connection = connections[options["database"]]
+        query = options["query"]
+
+        def run_query() -> None:
+            with connection.cursor() as cursor:
+                cursor.execute(query)
+                cursor.fetchall()
+
+        def reconnect() -> None:
+            # What every request pays with CONN_MAX_AGE=0 and no pool: a new
+            # connection (plus its setup, e.g. the SQLite PRAGMAs) per request
+            connection.close()
+            run_query()
+
+        run_query()
+        reused = self.measure(run_query, options["iterations"])
+        fresh = self.measure(reconnect, options["iterations"])
+        connection.close()
+
+        settings_dict = connection.settings_dict
+        report = {
+            "meta": {
+                "database": connection.vendor,
+                "conn_max_age": settings_dict["CONN_MAX_AGE"],
+                "conn_health_checks": settings_dict["CONN_HEALTH_CHECKS"],
+                "pool": bool(settings_dict["OPTIONS"].get("pool")),
+                "iterations": options["iterations"],
+            },
+            "new_connection_ms": fresh,
+            "reused_connection_ms": reused,
+            "setup_overhead_ms": round(fresh["mean"] - reused["mean"], 4),
+        }
+        self.stdout.write(json.dumps(report, indent=2))
+
+    @staticmethod
+    def measure(operation: Callable[[], None], iterations: int) -> dict:
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            operation()
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        return {
+            "mean": round(statistics.fmean(timings), 4),
+            "p50": round(percentile(timings, 50), 4),
+            "p95": round(percentile(timings, 95), 4),
+        }
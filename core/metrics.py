@@ -0,0 +1,102 @@
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, NamedTuple
+
+from django.conf import settings
+from rest_framework import serializers
+
+
+class RequestSample(NamedTuple):
+    total_ms: float
+    db_ms: float
+    queries: int
+    serialize_ms: float
+    render_ms: float
+
+
+def percentile(values: list[float], rank: float) -> float:
+    # Nearest-rank percentile of an already sorted list
+    if not values:
+        return 0.0
+    index = max(math.ceil(rank / 100 * len(values)) - 1, 0)
+    return values[index]
+
+
+class MetricsRegistry:
+    """
+    Rolling, in-process latency histogram per route.
+
+    Only the most recent ``window`` samples of each route are kept, so memory
+    stays bounded and percentiles follow the current traffic.
+    """
+
+    percentiles = (50, 95, 99)
+
+    def __init__(self, window: int = 1000) -> None:
+        self.window = window
+        self._samples: dict[str, deque[RequestSample]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, sample: RequestSample) -> None:
+        with self._lock:
+            samples = self._samples.get(route)
+            if samples is None:
+                samples = self._samples[route] = deque(maxlen=self.window)
+            samples.append(sample)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            routes = {route: list(samples) for route, samples in self._samples.items()}
+
+        return {
+            route: {
+                "count": len(samples),
+                "total_ms": self.summarize([s.total_ms for s in samples]),
+                "db_ms": self.summarize([s.db_ms for s in samples]),
+                "queries": self.summarize([s.queries for s in samples]),
+                "serialize_ms": self.summarize([s.serialize_ms for s in samples]),
+                "render_ms": self.summarize([s.render_ms for s in samples]),
+            }
+            for route, samples in sorted(routes.items())
+        }
+
+    def summarize(self, values: list) -> dict[str, float]:
+        values = sorted(values)
+        return {
+            f"p{rank}": round(percentile(values, rank), 3) for rank in self.percentiles
+        }
+
+
+registry = MetricsRegistry(window=getattr(settings, "REQUEST_METRICS_WINDOW", 1000))
+
+
+class SerializeTimingMixin(serializers.BaseSerializer):
+    """
+    Add the time a serializer spends building the representation of the
+    response to the ``serialize`` timing of the request.
+
+    Only top-level objects are timed, once each item of a ``many=True`` list;
+    nested and expanded serializers are part of their parent's time.
+    """
+
+    def to_representation(self, instance: Any) -> Any:
+        parent = self.parent
+        if parent is not None and not (
+            isinstance(parent, serializers.ListSerializer) and parent.parent is None
+        ):
+            return super().to_representation(instance)
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            # DRF wraps the Django request the middleware annotated
+            request = self.context.get("request")
+            request = getattr(request, "_request", request)
+            if hasattr(request, "_serialize_duration"):
+                request._serialize_duration += time.perf_counter() - start
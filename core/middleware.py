@@ -0,0 +1,130 @@
+import time
+from contextlib import ExitStack
+from typing import Any, Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+from core.metrics import RequestSample, registry
+
+
+class QueryTimer:
+    """Database execute wrapper counting queries and the time spent in them."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(
+        self, execute: Callable, sql: str, params: Any, many: bool, context: dict
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class RequestMetricsMiddleware:
+    """
+    Record query count, SQL, serializer, render and wall time per request.
+
+    The numbers are returned as ``Server-Timing`` headers and added to the
+    rolling per-route histogram exposed by ``/api/metrics/``. Routes are keyed
+    by their resolved URL name, e.g. ``restaurants:order-list``.
+
+    Serializer time is what serializers using ``SerializeTimingMixin`` spend
+    building the response data inside the view; render time is spent encoding
+    the response to bytes afterwards.
+
+    The middleware supports both request paths, so it does not force async
+    views under ASGI back onto a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.is_async:
+            return self.__acall__(request)
+        timer = QueryTimer()
+        self.start_timings(request)
+        start = time.perf_counter()
+        with self.timing_queries(timer):
+            response = self.get_response(request)
+        return self.finish(request, response, timer, time.perf_counter() - start)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        timer = QueryTimer()
+        self.start_timings(request)
+        start = time.perf_counter()
+        # Connections are per thread: wrap the ones of the thread that runs
+        # this request's async ORM calls, not the event loop's.
+        stack = await sync_to_async(self.timing_queries)(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.finish(request, response, timer, time.perf_counter() - start)
+
+    @staticmethod
+    def start_timings(request: HttpRequest) -> None:
+        request._serialize_duration = 0.0  # type: ignore
+        request._render_duration = 0.0  # type: ignore
+
+    @staticmethod
+    def timing_queries(timer: QueryTimer) -> ExitStack:
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timer))
+        return stack
+
+    def finish(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        timer: QueryTimer,
+        total: float,
+    ) -> HttpResponse:
+        sample = RequestSample(
+            total_ms=total * 1000,
+            db_ms=timer.duration * 1000,
+            queries=timer.count,
+            serialize_ms=request._serialize_duration * 1000,  # type: ignore
+            render_ms=request._render_duration * 1000,  # type: ignore
+        )
+        registry.record(self.route_name(request), sample)
+        response["Server-Timing"] = (
+            f'db;dur={sample.db_ms:.2f};desc="{sample.queries} queries", '
+            f"serialize;dur={sample.serialize_ms:.2f}, "
+            f"render;dur={sample.render_ms:.2f}, "
+            f"total;dur={sample.total_ms:.2f}"
+        )
+        return response
+
+    def process_template_response(
+        self, request: HttpRequest, response: Any
+    ) -> HttpResponse:
+        # Called right before rendering; time it with a post-render callback
+        start = time.perf_counter()
+
+        def finished(rendered: HttpResponse) -> None:
+            request._render_duration = time.perf_counter() - start  # type: ignore
+
+        response.add_post_render_callback(finished)
+        return response
+
+    @staticmethod
+    def route_name(request: HttpRequest) -> str:
+        match = request.resolver_match
+        if match is None or not match.view_name:
+            return "unresolved"
+        return match.view_name
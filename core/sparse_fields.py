@@ -0,0 +1,135 @@
+"""
+Sparse fieldsets and expansions for read requests.
+
+``?fields=id,name,price`` limits a response to the listed fields and
+``?expand=menu`` replaces a foreign key id with the nested object. The
+serializer mixin drops the other fields before anything is serialized, and
+the view mixin narrows the SQL to match: ``.only()`` the columns behind the
+remaining fields, ``select_related`` the expanded relations, and no joins or
+prefetches for relations that are not rendered.
+"""
+
+from typing import Any
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, QuerySet
+from rest_framework import serializers
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import SAFE_METHODS
+
+
+def query_list(request: Any, name: str) -> list[str]:
+    value = request.query_params.get(name, "")
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+class SparseFieldsMixin(serializers.Serializer):
+    # Foreign keys that ``?expand=`` may replace with the related object
+    expandable_fields: dict[str, type[serializers.Serializer]] = {}
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Only the top-level serializer of a read request is narrowed; nested
+        # serializers are created without the request in their context.
+        request = kwargs.get("context", {}).get("request")
+        if request is None or request.method not in SAFE_METHODS:
+            return
+
+        expand = [
+            name
+            for name in query_list(request, "expand")
+            if name in self.expandable_fields
+        ]
+        for name in expand:
+            self.fields[name] = self.expandable_fields[name](read_only=True)
+
+        fields = query_list(request, "fields")
+        if fields:
+            keep = set(fields) | set(expand)
+            for name in list(self.fields):
+                if name not in keep:
+                    self.fields.pop(name)
+
+
+class SparseQuerysetMixin(GenericAPIView):
+    """
+    Narrow the queryset of read requests to the fields being serialized.
+
+    The primary key, ``created_at`` (the keyset pagination ordering) and
+    ``updated_at`` (the conditional GET validators) are always loaded. When
+    a rendered field is backed by something other than a model field, e.g. a
+    property, the columns are left alone.
+    """
+
+    def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+        # Runs after get_queryset for both lists and get_object
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+        params = self.request.query_params
+        if "fields" not in params and "expand" not in params:
+            return queryset
+        return narrow_queryset(queryset, self.get_serializer())
+
+
+def narrow_queryset(queryset: QuerySet, serializer: Any) -> QuerySet:
+    model = queryset.model
+    sources = set()
+    for field in serializer.fields.values():
+        if field.source == "*":
+            return queryset
+        sources.add(field.source.split(".")[0])
+
+    columns = {model._meta.pk.name}
+    # The pagination ordering and the conditional GET validators
+    for name in ("created_at", "updated_at"):
+        if any(field.name == name for field in model._meta.concrete_fields):
+            columns.add(name)
+    forward_relations = set()
+    for source in sources:
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            # A property or method may read any column
+            return queryset
+        if model_field.concrete and not model_field.many_to_many:
+            columns.add(source)
+            if model_field.is_relation:
+                forward_relations.add(source)
+
+    # Keep only the joins and prefetches of relations that are rendered
+    joins = [
+        path
+        for path in select_related_paths(queryset.query.select_related)
+        if path.split("__")[0] in sources
+    ]
+    joins += [
+        name
+        for name, field in serializer.fields.items()
+        if isinstance(field, serializers.BaseSerializer) and name in forward_relations
+    ]
+    prefetches = [
+        lookup
+        for lookup in queryset._prefetch_related_lookups
+        if prefetch_root(lookup) in sources
+    ]
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if joins:
+        queryset = queryset.select_related(*joins)
+    return queryset.prefetch_related(*prefetches).only(*columns)
+
+
+def select_related_paths(select_related: Any, prefix: str = "") -> list[str]:
+    # Query.select_related is False, True or a nested dict of relation names
+    if not isinstance(select_related, dict):
+        return []
+    paths = []
+    for name, nested in select_related.items():
+        paths.append(prefix + name)
+        paths += select_related_paths(nested, f"{prefix}{name}__")
+    return paths
+
+
+def prefetch_root(lookup: str | Prefetch) -> str:
+    path = lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup
+    return path.split("__")[0]
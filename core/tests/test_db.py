@@ -0,0 +1,29 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from core.db import configure_sqlite
+
+
+class SQLitePragmasTest(TestCase):
+
+    def setUp(self) -> None:
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite only")
+
+    def pragma(self, name: str) -> object:
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_on_connect(self) -> None:
+        # Test new connections are configured by the connection_created hook
+        self.assertEqual(self.pragma("synchronous"), 1)
+
+    def test_pragmas_come_from_settings(self) -> None:
+        default = self.pragma("cache_size")
+        with override_settings(SQLITE_PRAGMAS={"cache_size": -4000}):
+            configure_sqlite(sender=None, connection=connection)
+        self.assertEqual(self.pragma("cache_size"), -4000)
+
+        with override_settings(SQLITE_PRAGMAS={"cache_size": default}):
+            configure_sqlite(sender=None, connection=connection)
@@ -0,0 +1,57 @@
+from typing import Any
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from authentication.models import User
+from core.metrics import registry
+from restaurants.models import Company
+
+
+class RequestMetricsMiddlewareTest(APITestCase):
+
+    def setUp(self) -> None:
+        registry.reset()
+        self.owner_user = User.objects.create_user(
+            username="owner", password="password", user_type="owner"
+        )
+        self.staff_user = User.objects.create_user(
+            username="staff", password="password", is_staff=True
+        )
+        self.client.force_authenticate(user=self.owner_user)
+
+    def test_server_timing_header(self) -> None:
+        # Test every response reports db, serialize, render and total timings
+        response = self.client.get(reverse("restaurants:company-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn("serialize;dur=", timing)
+        self.assertIn("render;dur=", timing)
+        self.assertIn("total;dur=", timing)
+
+    def test_serializer_time(self) -> None:
+        # Test the time spent in the serializer inside the view is recorded
+        for i in range(20):
+            Company.objects.create(name=f"Company {i}")
+        self.client.get(reverse("restaurants:company-list"))
+        route = registry.snapshot()["restaurants:company-list"]
+        self.assertGreater(route["serialize_ms"]["p50"], 0)
+        self.assertGreater(route["render_ms"]["p50"], 0)
+
+    def test_metrics_endpoint(self) -> None:
+        # Test the staff only endpoint reports percentiles keyed by URL name
+        for _ in range(3):
+            self.client.get(reverse("restaurants:company-list"))
+
+        response: Any = self.client.get(reverse("core:metrics"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.staff_user)
+        response = self.client.get(reverse("core:metrics"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        route = response.data["restaurants:company-list"]
+        self.assertEqual(route["count"], 3)
+        self.assertEqual(set(route["total_ms"]), {"p50", "p95", "p99"})
+        self.assertGreater(route["queries"]["p50"], 0)
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from core.views import MetricsView
+
+app_name = "core"
+
+urlpatterns = [
+    path("", MetricsView.as_view(), name="metrics"),
+]
@@ -0,0 +1,16 @@
+from typing import Any
+
+from rest_framework import permissions
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.metrics import registry
+
+
+class MetricsView(APIView):
+    # Latency, SQL time and query count percentiles per route
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return Response(registry.snapshot())
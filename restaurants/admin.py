@@ -3,6 +3,8 @@ from django.contrib import admin
 from restaurants.models import (
     Category,
     Company,
+    DailyOrders,
+    DailySales,
     Item,
     Menu,
     Order,
@@ -12,6 +14,8 @@ from restaurants.models import (
 
 admin.site.register(Category)
 admin.site.register(Company)
+admin.site.register(DailyOrders)
+admin.site.register(DailySales)
 admin.site.register(Item)
 admin.site.register(Menu)
 admin.site.register(Order)
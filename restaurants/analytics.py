@@ -0,0 +1,162 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from typing import Any
+
+from django.core.cache import cache
+from django.db.models import Avg, Count, DecimalField, F, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from restaurants.models import DailyOrders, DailySales, Order, OrderItem
+
+BUCKETS = {
+    "day": (TruncDay, timedelta(days=1)),
+    "hour": (TruncHour, timedelta(hours=1)),
+}
+
+# How long results are cached once every bucket in the range is closed, and
+# while the range still covers the current, growing bucket.
+CLOSED_RANGE_TIMEOUT = 60 * 60 * 24
+OPEN_RANGE_TIMEOUT = 60
+
+CENT = Decimal("0.01")
+
+
+def money(value: Any) -> str:
+    return str(Decimal(str(value or 0)).quantize(CENT))
+
+
+def average(revenue: Decimal | None, orders: int) -> Decimal | None:
+    return revenue / orders if orders else None
+
+
+def align(moment: datetime, bucket: str) -> datetime:
+    # Truncate a moment to the start of its bucket in the current time zone
+    moment = timezone.localtime(moment).replace(minute=0, second=0, microsecond=0)
+    if bucket == "day":
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def order_analytics(
+    restaurant_id: int, start: datetime, end: datetime, bucket: str
+) -> tuple[dict, int]:
+    """
+    Revenue, order count and average ticket per bucket plus the top items.
+
+    ``start`` and ``end`` are aligned to bucket boundaries so every request
+    within the same bucket shares a cache entry, and ranges made only of
+    closed buckets are cached much longer than ones still growing. Returns
+    the result and the number of seconds it may be cached for.
+    """
+    # The bucket containing ``end`` is included in the range
+    start = align(start, bucket)
+    end = align(end, bucket) + BUCKETS[bucket][1]
+    current_bucket = align(timezone.now(), bucket)
+    timeout = CLOSED_RANGE_TIMEOUT if end <= current_bucket else OPEN_RANGE_TIMEOUT
+
+    key = f"analytics:{restaurant_id}:{bucket}:{start.isoformat()}:{end.isoformat()}"
+    result = cache.get(key)
+    if result is None:
+        result = compute_order_analytics(restaurant_id, start, end, bucket)
+        cache.set(key, result, timeout)
+    return result, timeout
+
+
+def compute_order_analytics(
+    restaurant_id: int, start: datetime, end: datetime, bucket: str
+) -> dict[str, Any]:
+    if bucket == "day":
+        # Whole days are answered from the rollups, whose size grows with the
+        # number of days and items rather than the number of orders.
+        days = DailyOrders.objects.filter(
+            restaurant_id=restaurant_id, date__gte=start.date(), date__lt=end.date()
+        )
+        series = [
+            {
+                "bucket": timezone.make_aware(datetime.combine(row.date, time())),
+                "orders": row.order_count,
+                "revenue": row.revenue,
+                "average": average(row.revenue, row.order_count),
+            }
+            for row in days.order_by("date")
+            if row.order_count
+        ]
+        totals = days.aggregate(orders=Sum("order_count"), revenue=Sum("revenue"))
+        totals["orders"] = totals["orders"] or 0
+        totals["average"] = average(totals["revenue"], totals["orders"])
+        top_items = (
+            DailySales.objects.filter(
+                restaurant_id=restaurant_id,
+                date__gte=start.date(),
+                date__lt=end.date(),
+            )
+            .values("item_id", "item__name")
+            .annotate(units=Sum("quantity"), revenue=Sum("revenue"))
+        )
+    else:
+        orders = Order.objects.filter(
+            restaurant_id=restaurant_id, created_at__gte=start, created_at__lt=end
+        )
+        series = (
+            orders.annotate(bucket=TruncHour("created_at"))
+            .values("bucket")
+            .annotate(
+                orders=Count("id"),
+                revenue=Sum("total_amount"),
+                average=Avg("total_amount"),
+            )
+            .order_by("bucket")
+        )
+        totals = orders.aggregate(
+            orders=Count("id"),
+            revenue=Sum("total_amount"),
+            average=Avg("total_amount"),
+        )
+        top_items = (
+            OrderItem.objects.filter(
+                order__restaurant_id=restaurant_id,
+                order__created_at__gte=start,
+                order__created_at__lt=end,
+            )
+            .values("item_id", "item__name")
+            .annotate(
+                units=Sum("quantity"),
+                revenue=Sum(
+                    F("price") * F("quantity"),
+                    output_field=DecimalField(max_digits=12, decimal_places=2),
+                ),
+            )
+        )
+    top_items = top_items.order_by("-units", "item_id")[:10]
+
+    return {
+        "bucket": bucket,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "totals": {
+            "orders": totals["orders"],
+            "revenue": money(totals["revenue"]),
+            "average": money(totals["average"]),
+        },
+        # Rows are positional to keep long series compact
+        "fields": ["bucket", "orders", "revenue", "average"],
+        "series": [
+            [
+                row["bucket"].isoformat(),
+                row["orders"],
+                money(row["revenue"]),
+                money(row["average"]),
+            ]
+            for row in series
+        ],
+        "top_items": [
+            {
+                "item": row["item_id"],
+                "name": row["item__name"],
+                "quantity": row["units"],
+                "revenue": money(row["revenue"]),
+            }
+            for row in top_items
+        ],
+    }
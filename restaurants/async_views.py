@@ -0,0 +1,186 @@
+"""
+Async read endpoints.
+
+Native async views for the highest volume reads, built on the async ORM and
+cache APIs. Under an ASGI server they hold no thread while waiting, so one
+worker can serve many slow clients at once. DRF views are sync only, so these
+are plain Django views that reuse the DRF serializers, pagination and token
+authentication of their sync counterparts and return the same payloads.
+Orders are limited to the user's own and those of the restaurants they
+manage, as for the order event streams.
+
+The order event streams only make sense under ASGI: under WSGI every open
+stream holds a worker thread for as long as the client stays connected.
+"""
+
+import json
+from functools import wraps
+from typing import Any, AsyncIterator, Callable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_GET
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from authentication.authentication import CachedTokenAuthentication
+from restaurants import events
+from restaurants.menu_document import aget_menu_document
+from restaurants.models import Order
+from restaurants.pagination import KeysetPagination
+from restaurants.scopes import resolve_scope
+from restaurants.serializers import OrderReadSerializer
+from restaurants.views import OrderViewSet
+
+authentication = CachedTokenAuthentication()
+
+
+def render(data: Any, status_code: int = status.HTTP_200_OK) -> HttpResponse:
+    return HttpResponse(
+        JSONRenderer().render(data),
+        status=status_code,
+        content_type="application/json",
+    )
+
+
+def token_required(view: Callable) -> Callable:
+    @wraps(view)
+    async def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+        try:
+            credentials = await authentication.aauthenticate(request)
+            if credentials is None:
+                raise NotAuthenticated()
+        except APIException as error:
+            response = render({"detail": error.detail}, error.status_code)
+            response["WWW-Authenticate"] = authentication.authenticate_header(
+                request  # type: ignore
+            )
+            return response
+        request.user, request.auth = credentials  # type: ignore
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+@require_GET
+async def menu_document(request: HttpRequest, pk: int) -> HttpResponse:
+    document = await aget_menu_document(pk)
+    if document is None:
+        return render({"detail": "Not found."}, status.HTTP_404_NOT_FOUND)
+    body, etag = document
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+@require_GET
+@token_required
+async def order_list(request: HttpRequest) -> HttpResponse:
+    drf_request = Request(request)
+    paginator = KeysetPagination()
+    queryset = await visible_orders(request, OrderViewSet.queryset)
+    page = await paginator.apaginate_queryset(queryset, drf_request)
+    serializer = OrderReadSerializer(page, many=True, context={"request": drf_request})
+    return render(
+        {
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
+            "results": serializer.data,
+        }
+    )
+
+
+@require_GET
+@token_required
+async def order_status(request: HttpRequest, pk: int) -> HttpResponse:
+    # Light payload for clients polling the progress of an order
+    orders = await visible_orders(request, Order.objects.filter(pk=pk))
+    try:
+        order = await orders.values("id", "order_id", "is_paid", "updated_at").aget()
+    except Order.DoesNotExist:
+        return render({"detail": "Not found."}, status.HTTP_404_NOT_FOUND)
+    return render(order)
+
+
+def event_stream(
+    subscription: events.Subscription, initial: list[dict]
+) -> StreamingHttpResponse:
+    async def stream() -> AsyncIterator[str]:
+        try:
+            for event in initial:
+                yield format_event(event)
+            heartbeat = getattr(settings, "ORDER_EVENTS_HEARTBEAT", 15)
+            # A subscriber that fell behind is dropped; the client reconnects
+            # and starts again from the current state
+            while not subscription.overflowed:
+                event = await subscription.get(timeout=heartbeat)
+                yield ": heartbeat\n\n" if event is None else format_event(event)
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    # Also release the subscription when the server closes the response
+    # without finishing the iteration, e.g. when the client disconnects
+    response._resource_closers.append(subscription.close)
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def format_event(event: dict) -> str:
+    return f"event: order\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+async def in_scope(request: HttpRequest, restaurant_id: int) -> bool:
+    scope = await sync_to_async(resolve_scope)(request.user)
+    return scope is None or restaurant_id in scope
+
+
+async def visible_orders(request: HttpRequest, queryset: QuerySet) -> QuerySet:
+    # The user's own orders and the orders of the restaurants they manage
+    scope = await sync_to_async(resolve_scope)(request.user)
+    if scope is None:
+        return queryset
+    if not scope:
+        return queryset.filter(client_id=request.user.pk)
+    return queryset.filter(Q(client_id=request.user.pk) | Q(restaurant_id__in=scope))
+
+
+@require_GET
+@token_required
+async def restaurant_events(request: HttpRequest, pk: int) -> HttpResponse:
+    # Status changes of every order of a restaurant, for kitchen screens
+    if not await in_scope(request, pk):
+        return render({"detail": "Not found."}, status.HTTP_404_NOT_FOUND)
+    subscription = events.get_broker().subscribe(events.restaurant_channel(pk))
+    return event_stream(subscription, [])
+
+
+@require_GET
+@token_required
+async def order_events(request: HttpRequest, pk: int) -> HttpResponse:
+    # Status of one order: its current state first, then every change
+    subscription = events.get_broker().subscribe(events.order_channel(pk))
+    # Read the state after subscribing so no change can fall in between
+    order = await (
+        Order.objects.filter(pk=pk)
+        .values("id", "order_id", "restaurant_id", "is_paid", "updated_at", "client_id")
+        .afirst()
+    )
+    if order is None or not (
+        order["client_id"] == request.user.pk
+        or await in_scope(request, order["restaurant_id"])
+    ):
+        subscription.close()
+        return render({"detail": "Not found."}, status.HTTP_404_NOT_FOUND)
+    return event_stream(subscription, [events.order_event(order)])
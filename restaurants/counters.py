@@ -0,0 +1,89 @@
+"""
+Denormalized order counters on ``Restaurant``.
+
+``order_count``, ``unpaid_order_count`` and ``revenue`` (the total of paid
+orders) are incremented in SQL with ``F()`` when an order is created,
+deleted or its payment flips, so concurrent writers cannot lose updates.
+Other changes, such as editing the total of a paid order or writing orders
+in bulk, are not tracked; ``reconcile`` recomputes the counters from the
+orders and the ``reconcile_restaurant_counters`` command runs it. Every
+write bumps ``updated_at``, which the conditional GET validators rely on.
+"""
+
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from restaurants.models import Order, Restaurant
+
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+
+def record_order(order: Order, sign: int = 1) -> None:
+    """Count a new order in, or with ``sign=-1`` a deleted one out."""
+    Restaurant.objects.filter(pk=order.restaurant_id).update(
+        order_count=F("order_count") + sign,
+        unpaid_order_count=F("unpaid_order_count") + (0 if order.is_paid else sign),
+        revenue=F("revenue") + (sign * order.total_amount if order.is_paid else 0),
+        updated_at=timezone.now(),
+    )
+
+
+def record_payment(order: Order, sign: int = 1) -> None:
+    """Move an order out of (or with ``sign=-1`` back into) the unpaid count."""
+    Restaurant.objects.filter(pk=order.restaurant_id).update(
+        unpaid_order_count=F("unpaid_order_count") - sign,
+        revenue=F("revenue") + sign * order.total_amount,
+        updated_at=timezone.now(),
+    )
+
+
+def actual_counters() -> dict:
+    """Expressions computing each counter of a restaurant from its orders."""
+    orders = Order.objects.filter(restaurant=OuterRef("pk")).order_by()
+    count = orders.values("restaurant").annotate(count=Count("pk")).values("count")
+    unpaid = orders.filter(is_paid=False).values("restaurant")
+    paid = orders.filter(is_paid=True).values("restaurant")
+    return {
+        "order_count": Coalesce(Subquery(count), 0),
+        "unpaid_order_count": Coalesce(
+            Subquery(unpaid.annotate(count=Count("pk")).values("count")), 0
+        ),
+        "revenue": Coalesce(
+            Subquery(paid.annotate(total=Sum("total_amount")).values("total")),
+            Value(Decimal("0")),
+            output_field=MONEY,
+        ),
+    }
+
+
+def reconcile(restaurant_ids: list[int] | None = None) -> int:
+    """
+    Recompute the counters that drifted from the orders; returns how many
+    restaurants were fixed.
+
+    The counters are rewritten by a single UPDATE computing them in SQL, so
+    increments committed concurrently are not overwritten by stale values.
+    """
+    restaurants = Restaurant.objects.all()
+    if restaurant_ids is not None:
+        restaurants = restaurants.filter(pk__in=restaurant_ids)
+    expressions = actual_counters()
+    drifted = list(
+        restaurants.annotate(
+            **{f"actual_{name}": expression for name, expression in expressions.items()}
+        )
+        .exclude(
+            order_count=F("actual_order_count"),
+            unpaid_order_count=F("actual_unpaid_order_count"),
+            revenue=F("actual_revenue"),
+        )
+        .values_list("pk", flat=True)
+    )
+    if drifted:
+        Restaurant.objects.filter(pk__in=drifted).update(
+            **expressions, updated_at=timezone.now()
+        )
+    return len(drifted)
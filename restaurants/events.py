@@ -0,0 +1,133 @@
+"""
+Order status events.
+
+Order changes are published to per-restaurant and per-order channels once
+their transaction commits, and fanned out to the Server-Sent Events streams
+subscribed to those channels. The default broker keeps subscribers in
+process, which is enough for a single ASGI worker; deployments running
+several workers point ``ORDER_EVENTS_BROKER`` at a class with the same
+interface backed by a shared pub/sub service.
+"""
+
+import asyncio
+import threading
+from functools import cache
+from typing import Any
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from restaurants.models import Order
+
+
+def restaurant_channel(restaurant_id: int) -> str:
+    return f"restaurant:{restaurant_id}"
+
+
+def order_channel(order_id: int) -> str:
+    return f"order:{order_id}"
+
+
+def order_event(order: Any) -> dict[str, Any]:
+    """Status payload of an ``Order`` instance or ``values()`` row."""
+    if isinstance(order, Order):
+        order = {
+            "id": order.pk,
+            "order_id": order.order_id,
+            "restaurant_id": order.restaurant_id,
+            "is_paid": order.is_paid,
+            "updated_at": order.updated_at,
+        }
+    return {
+        "id": order["id"],
+        "order_id": order["order_id"],
+        "restaurant": order["restaurant_id"],
+        "is_paid": order["is_paid"],
+        "updated_at": order["updated_at"].isoformat(),
+    }
+
+
+class Subscription:
+    """
+    Queue of the events published to a channel since subscribing.
+
+    Created on the event loop of the consuming stream; publishers on any
+    thread hand events over with ``call_soon_threadsafe``. A subscriber that
+    falls ``queue_size`` events behind is marked as overflowed so its stream
+    can end and the client reconnect, rather than buffering without bound.
+    """
+
+    def __init__(self, broker: "InProcessBroker", channel: str, queue_size: int):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.overflowed = False
+
+    def put(self, event: dict) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The loop of an abandoned stream has been closed
+            self.close()
+
+    def _put(self, event: dict) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout: float) -> dict | None:
+        """Next event, or ``None`` when nothing arrived within ``timeout``."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    def __init__(self, queue_size: int = 100) -> None:
+        self.queue_size = queue_size
+        self._channels: dict[str, set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, event: dict) -> None:
+        with self._lock:
+            subscriptions = list(self._channels.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(event)
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(self, channel, self.queue_size)
+        with self._lock:
+            self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._channels.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._channels[subscription.channel]
+
+    def subscriber_count(self, channel: str) -> int:
+        with self._lock:
+            return len(self._channels.get(channel, ()))
+
+
+@cache
+def get_broker() -> Any:
+    broker_class = getattr(
+        settings, "ORDER_EVENTS_BROKER", "restaurants.events.InProcessBroker"
+    )
+    return import_string(broker_class)()
+
+
+def publish_order_event(event: dict) -> None:
+    broker = get_broker()
+    broker.publish(restaurant_channel(event["restaurant"]), event)
+    broker.publish(order_channel(event["id"]), event)
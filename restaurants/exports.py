@@ -0,0 +1,110 @@
+import csv
+import io
+import json
+from datetime import datetime
+from itertools import groupby
+from typing import Iterable, Iterator
+
+from restaurants.models import Order
+
+COLUMNS = (
+    "order_id",
+    "created_at",
+    "client",
+    "payment_method",
+    "is_paid",
+    "total_amount",
+    "item",
+    "item_name",
+    "quantity",
+    "price",
+)
+
+# Rows buffered into a single chunk of the streamed response
+ROWS_PER_CHUNK = 500
+
+
+def order_rows(
+    restaurant_id: int,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    chunk_size: int = 2000,
+) -> Iterator[tuple]:
+    """
+    Yield one flat tuple per order line (or per order without lines).
+
+    Rows come straight from the cursor via ``values_list().iterator()``, so
+    no model instances are built and the result set is never held in memory.
+    """
+    orders = Order.objects.filter(restaurant_id=restaurant_id)
+    if start is not None:
+        orders = orders.filter(created_at__gte=start)
+    if end is not None:
+        orders = orders.filter(created_at__lt=end)
+    return (
+        orders.order_by("created_at", "id", "order_items__id")
+        .values_list(
+            "order_id",
+            "created_at",
+            "client_id",
+            "payment_method",
+            "is_paid",
+            "total_amount",
+            "order_items__item_id",
+            "order_items__item__name",
+            "order_items__quantity",
+            "order_items__price",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def text(value: object) -> object:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def csv_stream(rows: Iterable[tuple]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([text(value) for value in row])
+        if count % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def ndjson_stream(rows: Iterable[tuple]) -> Iterator[str]:
+    # Rows arrive ordered by order, so consecutive lines can be folded into
+    # one JSON document per order without buffering the export.
+    chunk = []
+    for order_id, lines in groupby(rows, key=lambda row: row[0]):
+        first, *rest = lines
+        document = {
+            "order_id": order_id,
+            "created_at": text(first[1]),
+            "client": first[2],
+            "payment_method": first[3],
+            "is_paid": first[4],
+            "total_amount": str(first[5]),
+            "items": [
+                {
+                    "item": line[6],
+                    "item_name": line[7],
+                    "quantity": line[8],
+                    "price": str(line[9]),
+                }
+                for line in (first, *rest)
+                if line[6] is not None
+            ],
+        }
+        chunk.append(json.dumps(document, separators=(",", ":")))
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk) + "\n"
@@ -0,0 +1,170 @@
+"""
+Geohash-indexed nearest neighbour lookups.
+
+Each restaurant stores the geohash of its coordinates in an indexed column.
+Points sharing a geohash prefix lie in the same cell, so the restaurants of a
+cell are one B-tree range scan on that column. A lookup reads the cell around
+the search point and its eight neighbours, and only moves to coarser cells
+while the k-th nearest candidate could still be beaten by a restaurant
+outside those nine cells. No spatial database extension is required.
+"""
+
+import math
+from typing import Any
+
+from django.db.models import Q, QuerySet
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+# Sorts after every geohash character, so ``prefix + END`` bounds a range
+END = "~"
+PRECISION = 9
+EARTH_RADIUS_KM = 6371.0088
+# Precision of the first cells read when no radius is given, about 1 km wide
+START_PRECISION = 6
+
+
+def encode(latitude: float, longitude: float, precision: int = PRECISION) -> str:
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        # Bits alternate between longitude and latitude, longitude first
+        bounds, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> tuple[float, float]:
+    """Height and width in degrees of the cells of a precision."""
+    bits = 5 * precision
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+
+def block(latitude: float, longitude: float, precision: int) -> set[str]:
+    """The cell containing a point and its (up to) eight neighbours."""
+    height, width = cell_size(precision)
+    # Centre of the cell containing the point
+    center_lat = (math.floor((latitude + 90) / height) + 0.5) * height - 90
+    center_lng = (math.floor((longitude + 180) / width) + 0.5) * width - 180
+    cells = set()
+    for dy in (-1, 0, 1):
+        lat = center_lat + dy * height
+        if not -90 < lat < 90:
+            continue
+        for dx in (-1, 0, 1):
+            lng = (center_lng + dx * width + 180) % 360 - 180
+            cells.add(encode(lat, lng, precision))
+    return cells
+
+
+def covered_radius(latitude: float, precision: int) -> float:
+    """
+    Distance in km from a point to the edge of its block at a precision.
+
+    The point lies in the centre cell, so the block reaches at least one cell
+    height north and south and one cell width east and west of it. Every
+    restaurant within this distance is inside the block.
+    """
+    height, width = cell_size(precision)
+    north_south = EARTH_RADIUS_KM * math.radians(height)
+    east_west = EARTH_RADIUS_KM * math.asin(
+        math.cos(math.radians(latitude)) * math.sin(math.radians(min(width, 90)))
+    )
+    return min(north_south, east_west)
+
+
+def distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in km (haversine)."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi, d_lambda = phi2 - phi1, math.radians(lng2 - lng1)
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def in_cells(cells: set[str]) -> Q:
+    condition = Q()
+    for cell in cells:
+        condition |= Q(geohash__gte=cell, geohash__lt=cell + END)
+    return condition
+
+
+def nearest(
+    queryset: QuerySet,
+    latitude: float,
+    longitude: float,
+    limit: int,
+    radius: float | None = None,
+) -> list[tuple[float, Any]]:
+    """
+    The ``limit`` objects of ``queryset`` nearest to a point, as
+    ``(distance in km, object)`` pairs ordered by distance, optionally
+    only those within ``radius`` km.
+
+    Candidates are read as bare coordinates; only the winners are loaded.
+    """
+    precision = START_PRECISION
+    if radius is not None:
+        precision = covering_precision(latitude, radius)
+
+    while precision > 0:
+        cells = block(latitude, longitude, precision)
+        matches = measure(queryset.filter(in_cells(cells)), latitude, longitude)
+        if radius is not None:
+            matches = [match for match in matches if match[0] <= radius]
+        covered = covered_radius(latitude, precision)
+        if radius is not None and radius <= covered:
+            return load(queryset, matches[:limit])
+        if len(matches) < limit:
+            precision -= 1
+            continue
+        bound = matches[limit - 1][0]
+        if bound <= covered:
+            return load(queryset, matches[:limit])
+        # The true k-th nearest is no further than the k-th candidate, so the
+        # block covering that distance holds the answer
+        precision = min(precision - 1, covering_precision(latitude, bound))
+
+    # Too few objects near the point, or near a pole: measure all of them
+    matches = measure(queryset.exclude(geohash=""), latitude, longitude)
+    if radius is not None:
+        matches = [match for match in matches if match[0] <= radius]
+    return load(queryset, matches[:limit])
+
+
+def covering_precision(latitude: float, radius: float) -> int:
+    """The finest precision whose block covers ``radius`` km, or 0."""
+    precision = START_PRECISION
+    while precision > 0 and covered_radius(latitude, precision) < radius:
+        precision -= 1
+    return precision
+
+
+def measure(
+    queryset: QuerySet, latitude: float, longitude: float
+) -> list[tuple[float, int]]:
+    rows = queryset.values_list("pk", "latitude", "longitude")
+    matches = [(distance(latitude, longitude, lat, lng), pk) for pk, lat, lng in rows]
+    matches.sort()
+    return matches
+
+
+def load(
+    queryset: QuerySet, matches: list[tuple[float, int]]
+) -> list[tuple[float, Any]]:
+    if not matches:
+        return []
+    objects = queryset.in_bulk([pk for _, pk in matches])
+    return [(km, objects[pk]) for km, pk in matches]
@@ -0,0 +1,124 @@
+"""
+Idempotent create requests.
+
+A client that sends an ``Idempotency-Key`` header with a create request can
+retry it safely: the first successful response is stored under the key, and
+a retry with the same key and body replays it without running the view
+again. Reusing a key for a different request is rejected. The key row is
+inserted in the transaction that creates the object, so two concurrent
+requests with the same key cannot both create it.
+"""
+
+import hashlib
+import json
+from datetime import timedelta
+from functools import partial
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.generics import GenericAPIView
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from restaurants.models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+class KeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = f"{HEADER} was already used for a different request."
+    default_code = "idempotency_key_reused"
+
+
+def key_ttl() -> timedelta:
+    return timedelta(seconds=getattr(settings, "IDEMPOTENCY_KEY_TTL", 24 * 60 * 60))
+
+
+def fingerprint(request: Request) -> str:
+    data = request.data
+    if hasattr(data, "lists"):
+        # Form and multipart bodies are QueryDicts
+        data = sorted(data.lists())
+    body = json.dumps(data, sort_keys=True, default=str)
+    payload = f"{request.method}\n{request.path}\n{body}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def replay(record: IdempotencyKey) -> HttpResponse:
+    response = HttpResponse(
+        bytes(record.response),
+        status=record.status_code,
+        content_type="application/json",
+    )
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+class IdempotentCreateMixin(GenericAPIView):
+
+    def create(self, request: Request, *args: Any, **kwargs: Any) -> Any:
+        handler = partial(super().create, request, *args, **kwargs)  # type: ignore
+        return self.idempotent(request, handler)
+
+    def idempotent(self, request: Request, handler: Callable[[], Response]) -> Any:
+        """Run ``handler`` at most once per ``Idempotency-Key`` of the user."""
+        key = request.headers.get(HEADER)
+        if key is None:
+            return handler()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise ValidationError(
+                {HEADER: f"Must be 1 to {MAX_KEY_LENGTH} characters long."}
+            )
+
+        digest = fingerprint(request)
+        stored = self.stored_response(request, key, digest)
+        if stored is not None:
+            return stored
+
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    user=request.user,
+                    key=key,
+                    fingerprint=digest,
+                    status_code=0,
+                    response=b"",
+                )
+                response = handler()
+                if response.status_code >= 400:
+                    # Only successes are stored; a failed request may be
+                    # retried with the same key once it has been corrected
+                    transaction.set_rollback(True)
+                    return response
+                record.status_code = response.status_code
+                record.response = JSONRenderer().render(response.data)
+                record.save(update_fields=["status_code", "response"])
+        except IntegrityError:
+            # A concurrent request with the same key committed first
+            stored = self.stored_response(request, key, digest)
+            if stored is None:
+                raise
+            return stored
+        return response
+
+    def stored_response(
+        self, request: Request, key: str, digest: str
+    ) -> HttpResponse | None:
+        record = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+        if record is None:
+            return None
+        if record.created_at < timezone.now() - key_ttl():
+            # Expired but not purged yet: the key is free again
+            record.delete()
+            return None
+        if record.fingerprint != digest:
+            raise KeyReused()
+        return replay(record)
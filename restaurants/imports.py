@@ -0,0 +1,193 @@
+"""
+Bulk menu import.
+
+Rows describe items by menu and category *name*; names are resolved to ids
+through a lookup map loaded once per import, missing menus and categories are
+created in bulk, and items are upserted on ``(menu, name)`` in batches.
+"""
+
+import csv
+import io
+import json
+from typing import IO, Any, Iterable, Iterator
+
+from django.db import transaction
+from rest_framework import serializers
+
+from restaurants import search
+from restaurants.menu_document import invalidate_menu_document
+from restaurants.models import Category, Item, Menu, Restaurant
+
+# Cap on the per-row errors returned, so a broken file cannot blow up the
+# response; ``error_count`` still reports the total.
+MAX_REPORTED_ERRORS = 1000
+
+
+class MenuImportRowSerializer(serializers.Serializer):
+    menu = serializers.CharField(max_length=255)
+    category = serializers.CharField(max_length=255)
+    name = serializers.CharField(max_length=255)
+    description = serializers.CharField(
+        required=False, allow_blank=True, allow_null=True
+    )
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    is_available = serializers.BooleanField(default=True)
+
+
+def parse_rows(file: IO[bytes], filename: str) -> Iterator[dict]:
+    """
+    Yield rows from a CSV, NDJSON or JSON upload, picked by file extension.
+
+    CSV and NDJSON are read line by line; a JSON document has to be loaded
+    as a whole, so prefer the other two for very large files. A file that is
+    not UTF-8 or not valid CSV fails the whole import.
+    """
+    extension = filename.rsplit(".", 1)[-1].lower()
+    try:
+        if extension == "csv":
+            yield from csv.DictReader(io.TextIOWrapper(file, encoding="utf-8-sig"))
+        elif extension in ("ndjson", "jsonl"):
+            for line in io.TextIOWrapper(file, encoding="utf-8"):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Reported as an invalid row rather than failing the file
+                    yield line
+        elif extension == "json":
+            rows = parse_json(file.read())
+            if not isinstance(rows, list):
+                raise serializers.ValidationError(
+                    "A JSON import must be a list of rows."
+                )
+            yield from rows
+        else:
+            raise serializers.ValidationError(
+                "Unsupported file type; upload a .csv, .ndjson or .json file."
+            )
+    except UnicodeDecodeError:
+        raise serializers.ValidationError("The file is not UTF-8 encoded.")
+    except csv.Error as error:
+        raise serializers.ValidationError(f"Invalid CSV: {error}")
+
+
+def parse_json(data: str | bytes) -> Any:
+    try:
+        return json.loads(data)
+    except ValueError as error:
+        raise serializers.ValidationError(f"Invalid JSON: {error}")
+
+
+class MenuImporter:
+    def __init__(
+        self, restaurant: Restaurant, user: Any, batch_size: int = 500
+    ) -> None:
+        self.restaurant = restaurant
+        self.user = user
+        self.batch_size = batch_size
+        self.imported = 0
+        self.errors: list[dict] = []
+        self.error_count = 0
+        self.menus: dict[str, int] = {}
+        self.categories: dict[str, int] = {}
+
+    def run(self, rows: Iterable[Any]) -> dict:
+        """Import ``rows`` in one transaction; invalid rows are skipped."""
+        with transaction.atomic():
+            self.menus = self.lookup(Menu)
+            self.categories = self.lookup(Category)
+
+            batch: list[dict] = []
+            for number, row in enumerate(rows, start=1):
+                serializer = MenuImportRowSerializer(data=row)
+                if not serializer.is_valid():
+                    self.error(number, serializer.errors)
+                    continue
+                batch.append(serializer.validated_data)
+                if len(batch) >= self.batch_size:
+                    self.flush(batch)
+                    batch = []
+            self.flush(batch)
+
+            # bulk_create skips the signals that keep the search index in sync
+            restaurant_id = self.restaurant.pk
+            search.reindex_restaurants([restaurant_id])
+            transaction.on_commit(lambda: invalidate_menu_document(restaurant_id))
+
+        return {
+            "imported": self.imported,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+    def error(self, row: int, errors: Any) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+    def lookup(self, model: Any) -> dict[str, int]:
+        # Oldest row wins when a restaurant has duplicate names
+        return dict(
+            model.objects.filter(restaurant=self.restaurant)
+            .order_by("-id")
+            .values_list("name", "id")
+        )
+
+    def create_missing(self, model: Any, names: set[str], lookup: dict) -> None:
+        missing = sorted(names - set(lookup))
+        if not missing:
+            return
+        created = model.objects.bulk_create(
+            [
+                model(
+                    restaurant=self.restaurant,
+                    name=name,
+                    created_by=self.user,
+                    last_updated_by=self.user,
+                )
+                for name in missing
+            ]
+        )
+        lookup.update({instance.name: instance.pk for instance in created})
+
+    def flush(self, batch: list[dict]) -> None:
+        if not batch:
+            return
+        self.create_missing(Menu, {row["menu"] for row in batch}, self.menus)
+        self.create_missing(
+            Category, {row["category"] for row in batch}, self.categories
+        )
+
+        # A row repeated within one statement cannot be upserted twice, so
+        # the last occurrence of an item wins.
+        items: dict[tuple[int, str], Item] = {}
+        for row in batch:
+            menu_id = self.menus[row["menu"]]
+            items[(menu_id, row["name"])] = Item(
+                restaurant=self.restaurant,
+                menu_id=menu_id,
+                category_id=self.categories[row["category"]],
+                name=row["name"],
+                description=row.get("description"),
+                price=row["price"],
+                is_available=row["is_available"],
+                created_by=self.user,
+                last_updated_by=self.user,
+            )
+
+        Item.objects.bulk_create(
+            list(items.values()),
+            update_conflicts=True,
+            unique_fields=["menu", "name"],
+            update_fields=[
+                "category",
+                "description",
+                "price",
+                "is_available",
+                "last_updated_by",
+                "updated_at",
+            ],
+        )
+        # Rows repeated within the batch wrote a single item
+        self.imported += len(items)
@@ -0,0 +1,48 @@
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from rest_framework.exceptions import ValidationError
+
+from restaurants.imports import MenuImporter, parse_rows
+from restaurants.models import Restaurant
+
+
+class Command(BaseCommand):
+    help = "Import menus, categories and items for a restaurant from a file."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("restaurant", type=int, help="Restaurant id.")
+        parser.add_argument("path", help="A .csv, .ndjson or .json file.")
+        parser.add_argument(
+            "--user", help="Username recorded as creator (defaults to the owner)."
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            restaurant = Restaurant.objects.select_related("owner__user").get(
+                pk=options["restaurant"]
+            )
+        except Restaurant.DoesNotExist:
+            raise CommandError(f"Restaurant {options['restaurant']} does not exist.")
+
+        user = restaurant.owner.user
+        if options["user"]:
+            user = get_user_model().objects.get(username=options["user"])
+
+        importer = MenuImporter(restaurant, user, batch_size=options["batch_size"])
+        try:
+            with open(options["path"], "rb") as file:
+                result = importer.run(parse_rows(file, options["path"]))
+        except ValidationError as error:
+            raise CommandError(str(error.detail))
+
+        for error in result["errors"]:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result['imported']} rows, "
+                f"skipped {result['error_count']} invalid rows."
+            )
+        )
@@ -0,0 +1,33 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from restaurants.idempotency import key_ttl
+from restaurants.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Delete stored Idempotency-Key responses older than IDEMPOTENCY_KEY_TTL."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Rows deleted per DELETE."
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        expired = IdempotencyKey.objects.filter(
+            created_at__lt=timezone.now() - key_ttl()
+        )
+        # Short batches keep each DELETE from locking the table for long
+        deleted = 0
+        while True:
+            batch = list(
+                expired.order_by("created_at").values_list("pk", flat=True)[
+                    : options["batch_size"]
+                ]
+            )
+            if not batch:
+                break
+            deleted += IdempotencyKey.objects.filter(pk__in=batch).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired key(s)."))
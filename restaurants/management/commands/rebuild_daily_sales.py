@@ -0,0 +1,53 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from restaurants import rollups
+from restaurants.models import Restaurant
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild or backfill the DailySales and DailyOrders rollups from "
+        "orders, in batches."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--restaurant",
+            type=int,
+            action="append",
+            dest="restaurants",
+            help="Only rebuild the given restaurant id(s).",
+        )
+        parser.add_argument(
+            "--since", type=parse_date, help="Only rebuild days from YYYY-MM-DD."
+        )
+        parser.add_argument(
+            "--restaurants-per-batch",
+            type=int,
+            default=100,
+            help="Restaurants rebuilt per transaction.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Rows written per INSERT."
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        restaurant_ids = options["restaurants"] or list(
+            Restaurant.objects.order_by("pk").values_list("pk", flat=True)
+        )
+        per_batch = options["restaurants_per_batch"]
+
+        written = 0
+        for start in range(0, len(restaurant_ids), per_batch):
+            batch = restaurant_ids[start : start + per_batch]
+            with transaction.atomic():
+                written += rollups.rebuild(
+                    batch, since=options["since"], batch_size=options["batch_size"]
+                )
+            self.stdout.write(f"Rebuilt {len(batch)} restaurant(s)")
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} daily sales rows."))
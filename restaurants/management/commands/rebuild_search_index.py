@@ -0,0 +1,15 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from restaurants import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text item search index from scratch."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        with transaction.atomic():
+            indexed = search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} items."))
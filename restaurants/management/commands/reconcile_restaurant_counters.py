@@ -0,0 +1,22 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from restaurants import counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the order counters and revenue of restaurants that drifted."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--restaurant",
+            type=int,
+            action="append",
+            dest="restaurants",
+            help="Only reconcile the given restaurant id(s).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        fixed = counters.reconcile(options["restaurants"])
+        self.stdout.write(self.style.SUCCESS(f"Fixed {fixed} restaurant(s)."))
@@ -0,0 +1,270 @@
+import random
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.utils import timezone
+
+from authentication.models import Customer, Owner, User
+from restaurants import counters, geo, rollups, search
+from restaurants.models import (
+    Category,
+    Company,
+    Item,
+    Menu,
+    Order,
+    OrderItem,
+    Restaurant,
+)
+
+# Restaurants are placed at random within this many degrees of the centre
+SEED_CENTER = (23.78, 90.40)
+SEED_SPREAD = 0.2
+
+
+class Command(BaseCommand):
+    help = "Seed a configurable volume of companies, menus, users and orders."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--companies", type=int, default=2)
+        parser.add_argument(
+            "--restaurants", type=int, default=2, help="Restaurants per company."
+        )
+        parser.add_argument(
+            "--menus", type=int, default=2, help="Menus per restaurant."
+        )
+        parser.add_argument(
+            "--categories", type=int, default=4, help="Categories per restaurant."
+        )
+        parser.add_argument("--items", type=int, default=10, help="Items per category.")
+        parser.add_argument("--customers", type=int, default=50)
+        parser.add_argument(
+            "--orders", type=int, default=100, help="Orders per restaurant."
+        )
+        parser.add_argument("--lines", type=int, default=3, help="Lines per order.")
+        parser.add_argument(
+            "--days", type=int, default=30, help="Spread orders over this many days."
+        )
+        parser.add_argument("--password", default="password")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.batch_size = options["batch_size"]
+        self.random = random.Random(options["seed"])
+        # Unique names let the command run repeatedly against the same database
+        self.run = uuid.uuid4().hex[:6]
+        # Hash once; PBKDF2 per user would dominate the seeding time
+        self.password = make_password(options["password"])
+
+        with transaction.atomic():
+            owners = self.create_users("owner", options["companies"], Owner)
+            customers = self.create_users("customer", options["customers"], Customer)
+            restaurants = self.create_restaurants(owners, options["restaurants"])
+            items = self.create_menus(
+                restaurants,
+                options["menus"],
+                options["categories"],
+                options["items"],
+            )
+            # bulk_create skips the signals that keep the search index in sync
+            search.reindex_restaurants([restaurant.pk for restaurant in restaurants])
+            orders, lines = self.create_orders(
+                restaurants,
+                items,
+                customers,
+                options["orders"],
+                options["lines"],
+                options["days"],
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded run {self.run}: {len(owners)} owners, "
+                f"{len(customers)} customers, {len(restaurants)} restaurants, "
+                f"{sum(len(i) for i in items.values())} items, "
+                f"{orders} orders, {lines} order lines."
+            )
+        )
+
+    def create_users(self, user_type: str, count: int, profile: Any) -> list[User]:
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username=f"{user_type}-{self.run}-{i}",
+                    password=self.password,
+                    user_type=user_type,
+                    first_name=user_type.title(),
+                    last_name=str(i),
+                    phone_number="01700000000",
+                    address=f"{i} Seed Street",
+                )
+                for i in range(count)
+            ],
+            batch_size=self.batch_size,
+        )
+        # bulk_create skips the post_save handler that creates profiles
+        profile.objects.bulk_create(
+            [profile(user=user) for user in users], batch_size=self.batch_size
+        )
+        return users
+
+    def create_restaurants(
+        self, owners: list[User], per_company: int
+    ) -> list[Restaurant]:
+        companies = Company.objects.bulk_create(
+            [
+                Company(name=f"Company {self.run}-{i}", created_by=owner)
+                for i, owner in enumerate(owners)
+            ],
+            batch_size=self.batch_size,
+        )
+        return Restaurant.objects.bulk_create(
+            [
+                Restaurant(
+                    company=company,
+                    owner_id=owner.pk,
+                    name=f"Restaurant {self.run}-{i}-{j}",
+                    phone_number="01700000000",
+                    address=f"{j} Seed Avenue",
+                    created_by=owner,
+                    **self.location(),
+                )
+                for i, (company, owner) in enumerate(zip(companies, owners))
+                for j in range(per_company)
+            ],
+            batch_size=self.batch_size,
+        )
+
+    def location(self) -> dict[str, Any]:
+        # bulk_create bypasses Restaurant.save, which derives the geohash
+        latitude = SEED_CENTER[0] + self.random.uniform(-SEED_SPREAD, SEED_SPREAD)
+        longitude = SEED_CENTER[1] + self.random.uniform(-SEED_SPREAD, SEED_SPREAD)
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "geohash": geo.encode(latitude, longitude),
+        }
+
+    def create_menus(
+        self,
+        restaurants: list[Restaurant],
+        menus_per_restaurant: int,
+        categories_per_restaurant: int,
+        items_per_category: int,
+    ) -> dict[int, list[Item]]:
+        menus = Menu.objects.bulk_create(
+            [
+                Menu(restaurant=restaurant, name=f"Menu {i}")
+                for restaurant in restaurants
+                for i in range(menus_per_restaurant)
+            ],
+            batch_size=self.batch_size,
+        )
+        categories = Category.objects.bulk_create(
+            [
+                Category(restaurant=restaurant, name=f"Category {i}")
+                for restaurant in restaurants
+                for i in range(categories_per_restaurant)
+            ],
+            batch_size=self.batch_size,
+        )
+
+        menus_by_restaurant: dict[int, list[Menu]] = {}
+        for menu in menus:
+            menus_by_restaurant.setdefault(menu.restaurant_id, []).append(menu)
+
+        new_items = []
+        for category in categories:
+            restaurant_menus = menus_by_restaurant[category.restaurant_id]
+            for i in range(items_per_category):
+                new_items.append(
+                    Item(
+                        restaurant_id=category.restaurant_id,
+                        menu=restaurant_menus[i % len(restaurant_menus)],
+                        category=category,
+                        name=f"{category.name} Item {i}",
+                        price=Decimal(self.random.randint(100, 2500)) / 100,
+                    )
+                )
+
+        items: dict[int, list[Item]] = {}
+        for item in Item.objects.bulk_create(new_items, batch_size=self.batch_size):
+            items.setdefault(item.restaurant_id, []).append(item)
+        return items
+
+    def create_orders(
+        self,
+        restaurants: list[Restaurant],
+        items: dict[int, list[Item]],
+        customers: list[User],
+        orders_per_restaurant: int,
+        lines_per_order: int,
+        days: int,
+    ) -> tuple[int, int]:
+        if not customers:
+            return 0, 0
+
+        orders: list[Order] = []
+        carts: list[list[tuple[Item, int]]] = []
+        for restaurant in restaurants:
+            menu = items.get(restaurant.pk, [])
+            if not menu:
+                continue
+            for _ in range(orders_per_restaurant):
+                cart = [
+                    (item, self.random.randint(1, 3))
+                    for item in self.random.sample(
+                        menu, min(lines_per_order, len(menu))
+                    )
+                ]
+                order = Order(
+                    restaurant=restaurant,
+                    client=self.random.choice(customers),
+                    address="Seed Address",
+                    payment_method=self.random.choice(["card", "cash"]),
+                    is_paid=self.random.random() < 0.8,
+                    total_amount=sum(
+                        (item.price * quantity for item, quantity in cart),
+                        Decimal("0"),
+                    ),
+                )
+                # bulk_create bypasses Order.save, which assigns the order_id
+                order.order_id = order.generate_order_id()
+                orders.append(order)
+                carts.append(cart)
+
+        orders = Order.objects.bulk_create(orders, batch_size=self.batch_size)
+        lines = OrderItem.objects.bulk_create(
+            [
+                OrderItem(order=order, item=item, quantity=quantity, price=item.price)
+                for order, cart in zip(orders, carts)
+                for item, quantity in cart
+            ],
+            batch_size=self.batch_size,
+        )
+        self.spread_orders(orders, days)
+        # bulk_create skips the signals that maintain the sales rollup and the
+        # restaurant counters
+        restaurant_ids = [restaurant.pk for restaurant in restaurants]
+        rollups.rebuild(restaurant_ids)
+        counters.reconcile(restaurant_ids)
+        return len(orders), len(lines)
+
+    def spread_orders(self, orders: list[Order], days: int) -> None:
+        # created_at is auto_now_add, so back-date the orders after inserting
+        if days <= 1:
+            return
+        now = timezone.now()
+        by_day: dict[int, list[int]] = {}
+        for order in orders:
+            by_day.setdefault(self.random.randrange(days), []).append(order.pk)
+        for day, pks in by_day.items():
+            for start in range(0, len(pks), self.batch_size):
+                Order.objects.filter(
+                    pk__in=pks[start : start + self.batch_size]
+                ).update(created_at=now - timedelta(days=day))
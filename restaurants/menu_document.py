@@ -0,0 +1,139 @@
+import hashlib
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.core.serializers.json import DjangoJSONEncoder
+
+from restaurants.models import Category, Item, Menu, Restaurant
+
+
+def get_cache() -> BaseCache:
+    return caches[settings.MENU_DOCUMENT_CACHE]
+
+
+def version_key(restaurant_id: int) -> str:
+    return f"menu-document:{restaurant_id}:version"
+
+
+def document_key(restaurant_id: int, version: str) -> str:
+    return f"menu-document:{restaurant_id}:{version}"
+
+
+def new_version() -> str:
+    return str(time.time_ns())
+
+
+def build_menu_document(restaurant_id: int) -> bytes | None:
+    """
+    Render the Menu -> Category -> Item tree of a restaurant to JSON bytes.
+
+    Reads plain value rows with one query per table, so the cost does not
+    depend on how many menus, categories or items the restaurant has.
+    """
+    restaurant = (
+        Restaurant.objects.filter(pk=restaurant_id).values("id", "name").first()
+    )
+    if restaurant is None:
+        return None
+
+    categories = {
+        category["id"]: category
+        for category in Category.objects.filter(restaurant_id=restaurant_id)
+        .order_by("id")
+        .values("id", "name", "description")
+    }
+    menus = {
+        menu["id"]: {**menu, "categories": {}}
+        for menu in Menu.objects.filter(restaurant_id=restaurant_id)
+        .order_by("id")
+        .values("id", "name", "description")
+    }
+    items = (
+        Item.objects.filter(restaurant_id=restaurant_id)
+        .order_by("id")
+        .values(
+            "id",
+            "menu_id",
+            "category_id",
+            "name",
+            "description",
+            "price",
+            "is_available",
+        )
+    )
+    for item in items:
+        menu_categories = menus[item.pop("menu_id")]["categories"]
+        category_id = item.pop("category_id")
+        if category_id not in menu_categories:
+            menu_categories[category_id] = {**categories[category_id], "items": []}
+        menu_categories[category_id]["items"].append(item)
+
+    document = {
+        **restaurant,
+        "menus": [
+            {**menu, "categories": list(menu["categories"].values())}
+            for menu in menus.values()
+        ],
+    }
+    return json.dumps(document, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+
+
+def get_menu_document(restaurant_id: int) -> tuple[bytes, str] | None:
+    """
+    Return the rendered menu document of a restaurant and its ETag.
+
+    Documents are stored under a per-restaurant version token. Invalidation
+    replaces the token instead of deleting the document, so a document built
+    from data that changed while it was rendering is never served again.
+    """
+    cache = get_cache()
+    version = cache.get(version_key(restaurant_id))
+    if version is None:
+        # A missing token must never resolve to an older document
+        cache.add(version_key(restaurant_id), new_version(), timeout=None)
+        version = cache.get(version_key(restaurant_id))
+    key = document_key(restaurant_id, version)
+
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    body = build_menu_document(restaurant_id)
+    if body is None:
+        return None
+    etag = make_etag(body)
+    cache.set(key, (body, etag))
+    return body, etag
+
+
+async def aget_menu_document(restaurant_id: int) -> tuple[bytes, str] | None:
+    """Async counterpart of ``get_menu_document`` using the async cache API."""
+    cache = get_cache()
+    version = await cache.aget(version_key(restaurant_id))
+    if version is None:
+        await cache.aadd(version_key(restaurant_id), new_version(), timeout=None)
+        version = await cache.aget(version_key(restaurant_id))
+    key = document_key(restaurant_id, version)
+
+    cached = await cache.aget(key)
+    if cached is not None:
+        return cached
+
+    # Misses are rare, so the tree builder is shared with the sync path
+    body = await sync_to_async(build_menu_document)(restaurant_id)
+    if body is None:
+        return None
+    etag = make_etag(body)
+    await cache.aset(key, (body, etag))
+    return body, etag
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def invalidate_menu_document(restaurant_id: int) -> None:
+    get_cache().set(version_key(restaurant_id), new_version(), timeout=None)
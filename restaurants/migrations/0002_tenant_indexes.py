@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurants", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                fields=["restaurant", "category", "is_available"],
+                name="item_restaurant_category_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                condition=models.Q(("is_available", True)),
+                fields=["restaurant", "category", "-created_at", "-id"],
+                name="item_available_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["restaurant", "-created_at", "-id"],
+                name="order_restaurant_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["restaurant", "is_paid", "-created_at", "-id"],
+                name="order_restaurant_paid_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                condition=models.Q(("is_paid", False)),
+                fields=["restaurant", "-created_at", "-id"],
+                name="order_unpaid_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:50
+
+from typing import Any
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def rename_duplicate_items(apps: Any, schema_editor: Any) -> None:
+    # The oldest item keeps its name; later ones get their id appended, so
+    # the unique constraint can be added to a database holding duplicates
+    Item = apps.get_model("restaurants", "Item")
+    items = Item.objects.using(schema_editor.connection.alias)
+    duplicates = (
+        items.values("menu_id", "name")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .order_by()
+    )
+    max_length = Item._meta.get_field("name").max_length
+    for duplicate in duplicates:
+        renamed = items.filter(
+            menu_id=duplicate["menu_id"], name=duplicate["name"]
+        ).order_by("id")[1:]
+        for item in renamed:
+            suffix = f" ({item.pk})"
+            item.name = item.name[: max_length - len(suffix)] + suffix
+            item.save(update_fields=["name"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurants", "0003_daily_sales"),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_duplicate_items, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="item",
+            constraint=models.UniqueConstraint(
+                fields=("menu", "name"), name="unique_item_name_per_menu"
+            ),
+        ),
+    ]
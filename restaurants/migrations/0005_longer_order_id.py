@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurants", "0004_unique_item_name_per_menu"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="order",
+            name="order_id",
+            field=models.CharField(editable=False, max_length=40, unique=True),
+        ),
+    ]
@@ -0,0 +1,61 @@
+from typing import Any
+
+from django.db import migrations
+
+# The DDL is frozen here rather than imported from restaurants.search, so
+# later changes to the app cannot change what this migration does. The table
+# has no foreign key to restaurants_item: TRUNCATE (flush, sqlflush and
+# TransactionTestCase) only knows the tables of models and would refuse to
+# truncate restaurants_item while an unknown table references it. Rows of
+# deleted items are removed by the item post_delete signal.
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE restaurants_item_search USING fts5("
+    "name, description, category, restaurant, "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "INSERT INTO restaurants_item_search "
+    "(rowid, name, description, category, restaurant) "
+    "SELECT i.id, i.name, COALESCE(i.description, ''), c.name, r.name "
+    "FROM restaurants_item i "
+    "JOIN restaurants_category c ON c.id = i.category_id "
+    "JOIN restaurants_restaurant r ON r.id = i.restaurant_id",
+]
+
+POSTGRES_CREATE = [
+    "CREATE TABLE restaurants_item_search ("
+    "item_id bigint PRIMARY KEY, document tsvector NOT NULL)",
+    "CREATE INDEX restaurants_item_search_document_idx "
+    "ON restaurants_item_search USING GIN (document)",
+    "INSERT INTO restaurants_item_search (item_id, document) "
+    "SELECT i.id, "
+    "setweight(to_tsvector('simple', i.name), 'A') "
+    "|| setweight(to_tsvector('simple', COALESCE(i.description, '')), 'B') "
+    "|| setweight(to_tsvector('simple', c.name), 'B') "
+    "|| setweight(to_tsvector('simple', r.name), 'C') "
+    "FROM restaurants_item i "
+    "JOIN restaurants_category c ON c.id = i.category_id "
+    "JOIN restaurants_restaurant r ON r.id = i.restaurant_id",
+]
+
+CREATE = {"sqlite": SQLITE_CREATE, "postgresql": POSTGRES_CREATE}
+
+
+def create_index(apps: Any, schema_editor: Any) -> None:
+    # Other backends get no index and an empty search
+    for sql in CREATE.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_index(apps: Any, schema_editor: Any) -> None:
+    if schema_editor.connection.vendor in CREATE:
+        schema_editor.execute("DROP TABLE IF EXISTS restaurants_item_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurants", "0005_longer_order_id"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
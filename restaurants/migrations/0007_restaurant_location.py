@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:15
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurants", "0006_item_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="restaurant",
+            name="geohash",
+            field=models.CharField(blank=True, editable=False, max_length=12),
+        ),
+        migrations.AddField(
+            model_name="restaurant",
+            name="is_open",
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name="restaurant",
+            name="latitude",
+            field=models.FloatField(
+                blank=True,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(-90),
+                    django.core.validators.MaxValueValidator(90),
+                ],
+            ),
+        ),
+        migrations.AddField(
+            model_name="restaurant",
+            name="longitude",
+            field=models.FloatField(
+                blank=True,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(-180),
+                    django.core.validators.MaxValueValidator(180),
+                ],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="restaurant",
+            index=models.Index(fields=["geohash"], name="restaurant_geohash_idx"),
+        ),
+    ]
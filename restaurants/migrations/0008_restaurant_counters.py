@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:19
+
+from decimal import Decimal
+from typing import Any
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps: Any, schema_editor: Any) -> None:
+    Restaurant = apps.get_model("restaurants", "Restaurant")
+    Order = apps.get_model("restaurants", "Order")
+    orders = Order.objects.filter(restaurant=OuterRef("pk")).order_by()
+
+    def count(queryset: Any) -> Any:
+        counted = queryset.values("restaurant").annotate(count=Count("pk"))
+        return Coalesce(Subquery(counted.values("count")), 0)
+
+    paid = orders.filter(is_paid=True).values("restaurant")
+    Restaurant.objects.update(
+        order_count=count(orders),
+        unpaid_order_count=count(orders.filter(is_paid=False)),
+        revenue=Coalesce(
+            Subquery(paid.annotate(total=Sum("total_amount")).values("total")),
+            Value(Decimal("0")),
+            output_field=models.DecimalField(max_digits=14, decimal_places=2),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurants", "0007_restaurant_location"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="restaurant",
+            name="order_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="restaurant",
+            name="revenue",
+            field=models.DecimalField(
+                decimal_places=2, default=0, editable=False, max_digits=14
+            ),
+        ),
+        migrations.AddField(
+            model_name="restaurant",
+            name="unpaid_order_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
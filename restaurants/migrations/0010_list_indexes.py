@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurants", "0009_idempotency_keys"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(
+                fields=["restaurant", "-created_at", "-id"],
+                name="category_restaurant_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                fields=["restaurant", "-created_at", "-id"],
+                name="item_restaurant_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="menu",
+            index=models.Index(
+                fields=["restaurant", "-created_at", "-id"], name="menu_restaurant_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["-created_at", "-id"], name="order_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="orderitem",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="orderitem_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="restaurant",
+            index=models.Index(
+                fields=["owner", "-created_at", "-id"], name="restaurant_owner_idx"
+            ),
+        ),
+    ]
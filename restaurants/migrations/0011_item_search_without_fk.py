@@ -0,0 +1,25 @@
+from typing import Any
+
+from django.db import migrations
+
+
+def drop_foreign_key(apps: Any, schema_editor: Any) -> None:
+    # Databases that ran an earlier 0006 created the PostgreSQL index table
+    # with a foreign key to restaurants_item, which blocks TRUNCATE of the
+    # item table
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "ALTER TABLE restaurants_item_search "
+            "DROP CONSTRAINT IF EXISTS restaurants_item_search_item_id_fkey"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurants", "0010_list_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_foreign_key, migrations.RunPython.noop),
+    ]
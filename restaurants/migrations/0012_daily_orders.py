@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:10
+
+from typing import Any
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill(apps: Any, schema_editor: Any) -> None:
+    # Existing orders, so the daily analytics need no rebuild after deploying
+    Order = apps.get_model("restaurants", "Order")
+    DailyOrders = apps.get_model("restaurants", "DailyOrders")
+    alias = schema_editor.connection.alias
+    rows = (
+        Order.objects.using(alias)
+        .annotate(day=TruncDate("created_at"))
+        .values("restaurant_id", "day")
+        .annotate(orders=Count("id"), total=Sum("total_amount"))
+        .order_by()
+    )
+    DailyOrders.objects.using(alias).bulk_create(
+        [
+            DailyOrders(
+                restaurant_id=row["restaurant_id"],
+                date=row["day"],
+                order_count=row["orders"],
+                revenue=row["total"],
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("restaurants", "0011_item_search_without_fk"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyOrders",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("order_count", models.PositiveIntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "restaurant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_orders",
+                        to="restaurants.restaurant",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "daily orders",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="dailyorders",
+            constraint=models.UniqueConstraint(
+                fields=("restaurant", "date"), name="unique_daily_orders"
+            ),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
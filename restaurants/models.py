@@ -1,11 +1,12 @@
-import uuid
 from typing import Any
 
 from django.contrib.auth import get_user_model
-from django.core.validators import MinValueValidator
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
 from authentication.models import Owner
+from restaurants import geo
+from restaurants.order_ids import new_ulid, restaurant_codes
 
 User = get_user_model()
 
@@ -66,6 +67,50 @@ class Restaurant(OperationLogModel):
     email = models.EmailField(blank=True, null=True)
     website = models.URLField(blank=True, null=True)
     address = models.CharField(max_length=255)
+    latitude = models.FloatField(
+        blank=True,
+        null=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        blank=True,
+        null=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
+    is_open = models.BooleanField(default=True)
+    # Derived from the coordinates on save; empty when they are not set
+    geohash = models.CharField(max_length=12, blank=True, editable=False)
+    # Maintained from the orders by ``restaurants.counters``
+    order_count = models.PositiveIntegerField(default=0, editable=False)
+    unpaid_order_count = models.PositiveIntegerField(default=0, editable=False)
+    revenue = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0, editable=False
+    )
+
+    class Meta:
+        indexes = [
+            # Nearby lookups OR together geohash prefix ranges, which SQLite
+            # only serves from an index leading with the geohash
+            models.Index(fields=["geohash"], name="restaurant_geohash_idx"),
+            # The restaurant list of an owner, in keyset pagination order
+            models.Index(
+                fields=["owner", "-created_at", "-id"],
+                name="restaurant_owner_idx",
+            ),
+        ]
+
+    def update_geohash(self) -> None:
+        if self.latitude is None or self.longitude is None:
+            self.geohash = ""
+        else:
+            self.geohash = geo.encode(self.latitude, self.longitude)
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        self.update_geohash()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geohash"}
+        super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         return self.name
@@ -79,6 +124,15 @@ class Menu(OperationLogModel):
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # The scoped list, in keyset pagination order
+            models.Index(
+                fields=["restaurant", "-created_at", "-id"],
+                name="menu_restaurant_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return f"{self.name} - {self.restaurant.name}"
 
@@ -91,6 +145,15 @@ class Category(OperationLogModel):
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # The scoped list, in keyset pagination order
+            models.Index(
+                fields=["restaurant", "-created_at", "-id"],
+                name="category_restaurant_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return self.name
 
@@ -111,6 +174,32 @@ class Item(OperationLogModel):
     )
     is_available = models.BooleanField(default=True)
 
+    class Meta:
+        constraints = [
+            # Identifies an item for menu imports, which upsert on it
+            models.UniqueConstraint(
+                fields=["menu", "name"], name="unique_item_name_per_menu"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["restaurant", "category", "is_available"],
+                name="item_restaurant_category_idx",
+            ),
+            # Partial index for the customer facing "available items" lookups;
+            # backends without partial index support skip it.
+            models.Index(
+                fields=["restaurant", "category", "-created_at", "-id"],
+                condition=models.Q(is_available=True),
+                name="item_available_idx",
+            ),
+            # The scoped list, in keyset pagination order
+            models.Index(
+                fields=["restaurant", "-created_at", "-id"],
+                name="item_restaurant_created_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return self.name
 
@@ -119,7 +208,7 @@ class Order(OperationLogModel):
 
     PAYMENT_METHODS = [("card", "Card"), ("cash", "Cash")]
 
-    order_id = models.CharField(max_length=20, unique=True, editable=False)
+    order_id = models.CharField(max_length=40, unique=True, editable=False)
     client = models.ForeignKey(User, on_delete=models.CASCADE, related_name="orders")
     restaurant = models.ForeignKey(
         Restaurant, on_delete=models.CASCADE, related_name="orders"
@@ -132,18 +221,52 @@ class Order(OperationLogModel):
     payment_method = models.CharField(max_length=4, choices=PAYMENT_METHODS)
     is_paid = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # Trailing "-id" matches the keyset pagination ordering, so pages
+            # are read straight off the index without a sort.
+            models.Index(
+                fields=["restaurant", "-created_at", "-id"],
+                name="order_restaurant_created_idx",
+            ),
+            models.Index(
+                fields=["restaurant", "is_paid", "-created_at", "-id"],
+                name="order_restaurant_paid_idx",
+            ),
+            # Partial index for the "unpaid orders" queue
+            models.Index(
+                fields=["restaurant", "-created_at", "-id"],
+                condition=models.Q(is_paid=False),
+                name="order_unpaid_idx",
+            ),
+            # The order list is not filtered by restaurant
+            models.Index(fields=["-created_at", "-id"], name="order_created_idx"),
+        ]
+
     def generate_order_id(self) -> str:
-        prefix = "ORD"
-        restaurant_code = "".join(
-            [word[0].upper() for word in self.restaurant.name.split()]
-        )
-        unique_code = str(uuid.uuid4()).split("-")[0].upper()
-        return f"{prefix}-{restaurant_code}-{unique_code}"
+        # Time-ordered and unique without a lookup; the restaurant code is
+        # cached, so only the first order of a restaurant in a process whose
+        # restaurant is not loaded yet costs a query.
+        code = restaurant_codes.get(self.restaurant_id)
+        if code is None:
+            code = restaurant_codes.set(self.restaurant_id, self.restaurant.name)
+        return f"ORD-{code}-{new_ulid()}"
+
+    @classmethod
+    def from_db(cls, db: Any, field_names: Any, values: Any) -> "Order":
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored payment state so a flip can be detected on save
+        instance._stored_is_paid = instance.__dict__.get("is_paid")
+        return instance
 
     def save(self, *args: Any, **kwargs: Any) -> None:
         if not self.order_id:
             self.order_id = self.generate_order_id()
         super().save(*args, **kwargs)
+        # The post_save receivers have compared against the stored state
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "is_paid" in update_fields:
+            self._stored_is_paid = self.is_paid
 
     def __str__(self) -> str:
         return f"Order {self.order_id} - {self.client.get_full_name()}"
@@ -160,5 +283,98 @@ class OrderItem(OperationLogModel):
         max_digits=10, decimal_places=2, validators=[MinValueValidator(0)]
     )
 
+    class Meta:
+        indexes = [
+            # The order line list is not filtered by restaurant
+            models.Index(fields=["-created_at", "-id"], name="orderitem_created_idx"),
+        ]
+
     def __str__(self) -> str:
         return f"{self.quantity} x {self.item.name} - Order {self.order.order_id}"
+
+
+class DailySales(models.Model):
+    """
+    Per restaurant, day and item sales rollup.
+
+    Maintained incrementally as orders are placed and paid, and rebuilt from
+    ``Order``/``OrderItem`` by the ``rebuild_daily_sales`` command.
+    """
+
+    restaurant = models.ForeignKey(
+        Restaurant, on_delete=models.CASCADE, related_name="daily_sales"
+    )
+    date = models.DateField()
+    item = models.ForeignKey(Item, on_delete=models.CASCADE, related_name="daily_sales")
+    quantity = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    paid_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    order_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "daily sales"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["restaurant", "date", "item"], name="unique_daily_sales"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.date} - {self.item_id} x {self.quantity}"
+
+
+class DailyOrders(models.Model):
+    """
+    Per restaurant and day order rollup, behind the daily analytics series.
+
+    Maintained incrementally as orders are placed and deleted, and rebuilt
+    from ``Order`` by the ``rebuild_daily_sales`` command.
+    """
+
+    restaurant = models.ForeignKey(
+        Restaurant, on_delete=models.CASCADE, related_name="daily_orders"
+    )
+    date = models.DateField()
+    order_count = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name_plural = "daily orders"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["restaurant", "date"], name="unique_daily_orders"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.date} - {self.order_count} orders"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Stored response of a create request sent with an ``Idempotency-Key``.
+
+    A retry with the same key gets the stored response back instead of
+    creating the object again. Rows older than ``IDEMPOTENCY_KEY_TTL`` are
+    ignored and deleted by the ``purge_idempotency_keys`` command.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="idempotency_keys"
+    )
+    key = models.CharField(max_length=255)
+    # SHA-256 of the method, path and body the key was first used with
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField()
+    response = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"], name="unique_idempotency_key"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id} - {self.key}"
@@ -0,0 +1,88 @@
+"""
+Order id generation.
+
+Order ids look like ``ORD-<restaurant code>-<ULID>``. The ULID part is a
+48-bit millisecond timestamp followed by 80 random bits in Crockford base32,
+so ids sort by creation time and two workers would need to draw the same 80
+random bits within the same millisecond to collide. Within a process the
+generator is monotonic: ids minted in the same millisecond increment the
+random part instead of drawing a new one, so they never repeat.
+"""
+
+import secrets
+import threading
+import time
+
+CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+RANDOM_BITS = 80
+MAX_CODE_LENGTH = 6
+
+
+def encode(value: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        value, remainder = divmod(value, 32)
+        chars.append(CROCKFORD[remainder])
+    return "".join(reversed(chars))
+
+
+class ULIDGenerator:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._last_random = 0
+
+    def __call__(self) -> str:
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._last_random = secrets.randbits(RANDOM_BITS)
+            else:
+                # Same millisecond, or the clock stepped back: keep counting
+                self._last_random += 1
+                if self._last_random >> RANDOM_BITS:
+                    self._last_ms += 1
+                    self._last_random = secrets.randbits(RANDOM_BITS)
+            return encode(self._last_ms, 10) + encode(self._last_random, 16)
+
+
+new_ulid = ULIDGenerator()
+
+
+class RestaurantCodes:
+    """
+    Process-local map of restaurant id to the code used in its order ids.
+
+    Entries are dropped when a restaurant is saved, see ``signals``.
+    """
+
+    def __init__(self) -> None:
+        self._codes: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, restaurant_id: int) -> str | None:
+        return self._codes.get(restaurant_id)
+
+    def set(self, restaurant_id: int, name: str) -> str:
+        code = restaurant_code(name)
+        with self._lock:
+            self._codes[restaurant_id] = code
+        return code
+
+    def invalidate(self, restaurant_id: int) -> None:
+        with self._lock:
+            self._codes.pop(restaurant_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._codes.clear()
+
+
+restaurant_codes = RestaurantCodes()
+
+
+def restaurant_code(name: str) -> str:
+    # Initials of the restaurant name, e.g. "The Green Fork" -> "TGF"
+    initials = "".join(word[0] for word in name.split() if word[0].isalnum())
+    return initials.upper()[:MAX_CODE_LENGTH] or "R"
@@ -0,0 +1,119 @@
+from datetime import datetime
+from typing import Any
+
+from django.db.models import Q, QuerySet
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset pagination over ``(created_at, id)``, newest first.
+
+    DRF's stock cursor pagination only stores the first ordering field in the
+    cursor and breaks ties with an OFFSET. Here the cursor carries both
+    columns, so every page is a single ``WHERE (created_at, id) < (...)``
+    range scan and deep pages cost the same as the first one.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    ordering = ("-created_at", "-id")
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView | None = None
+    ) -> list | None:
+        page = self.page_queryset(queryset, request)
+        if page is None:
+            return None
+        return self.set_page(list(page))
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request
+    ) -> list | None:
+        """Async counterpart of ``paginate_queryset`` for async views."""
+        page = self.page_queryset(queryset, request)
+        if page is None:
+            return None
+        return self.set_page([instance async for instance in page])
+
+    def page_queryset(self, queryset: QuerySet, request: Request) -> QuerySet | None:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        self.reverse = self.cursor is not None and self.cursor.reverse
+        self.position = self.decode_position(self.cursor)
+
+        if self.reverse:
+            queryset = queryset.order_by("created_at", "id")
+        else:
+            queryset = queryset.order_by("-created_at", "-id")
+
+        if self.position is not None:
+            created_at, pk = self.position
+            if self.reverse:
+                keyset = Q(created_at__gt=created_at) | Q(
+                    created_at=created_at, id__gt=pk
+                )
+            else:
+                keyset = Q(created_at__lt=created_at) | Q(
+                    created_at=created_at, id__lt=pk
+                )
+            queryset = queryset.filter(keyset)
+
+        # Fetch one extra row to know whether another page follows.
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results: list) -> list:
+        has_following = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if self.reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = self.position is not None
+
+        return self.page
+
+    def decode_position(self, cursor: Cursor | None) -> tuple[datetime, int] | None:
+        if cursor is None or cursor.position is None:
+            return None
+        try:
+            created_at, pk = cursor.position.rsplit("|", 1)
+            parsed = parse_datetime(created_at)
+            if parsed is None:
+                raise ValueError(created_at)
+            return parsed, int(pk)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def encode_position(instance: Any) -> str:
+        return f"{instance.created_at.isoformat()}|{instance.pk}"
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or not self.page:
+            return None
+        cursor = Cursor(
+            offset=0, reverse=False, position=self.encode_position(self.page[-1])
+        )
+        return self.encode_cursor(cursor)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous or not self.page:
+            return None
+        cursor = Cursor(
+            offset=0, reverse=True, position=self.encode_position(self.page[0])
+        )
+        return self.encode_cursor(cursor)
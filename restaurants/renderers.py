@@ -0,0 +1,33 @@
+import json
+from typing import Any
+
+from rest_framework.renderers import BaseRenderer
+
+
+class StreamRenderer(BaseRenderer):
+    """
+    Renderer that only selects a ``?format=`` for streamed downloads.
+
+    Views using it return a ``StreamingHttpResponse`` directly; ``render`` is
+    only reached for error responses, which are emitted as JSON.
+    """
+
+    charset = "utf-8"
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: dict | None = None,
+    ) -> bytes:
+        return json.dumps(data).encode()
+
+
+class CSVRenderer(StreamRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+
+class NDJSONRenderer(StreamRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
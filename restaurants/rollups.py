@@ -0,0 +1,289 @@
+"""
+Incremental maintenance of the ``DailySales`` and ``DailyOrders`` rollups.
+
+Placing an order adds its lines to the rollup of the order's day, and paying
+for it (or reverting the payment) moves the line revenue in or out of
+``paid_revenue``. ``order_count`` counts the orders with at least one line of
+an item, so an order with repeated lines of an item is counted once.
+``DailyOrders`` counts every order and its total once per day, for the daily
+analytics series. Edits to existing order lines and totals are not tracked;
+run the ``rebuild_daily_sales`` command to resynchronise after bulk changes.
+"""
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Any, Iterable
+
+from django.db.models import (
+    Case,
+    Count,
+    DecimalField,
+    F,
+    IntegerField,
+    Q,
+    QuerySet,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from restaurants.models import DailyOrders, DailySales, Order, OrderItem
+
+MONEY = DecimalField(max_digits=12, decimal_places=2)
+
+
+class Delta:
+    __slots__ = ("quantity", "revenue", "paid_revenue", "order_count")
+
+    def __init__(self) -> None:
+        self.quantity = 0
+        self.revenue = Decimal("0")
+        self.paid_revenue = Decimal("0")
+        self.order_count = 0
+
+
+def increments(field: str, deltas: dict[int, Delta], output_field: Any) -> Any:
+    # One CASE per column so all items are updated by a single statement
+    return F(field) + Case(
+        *[
+            When(item_id=item_id, then=Value(getattr(delta, field)))
+            for item_id, delta in deltas.items()
+        ],
+        default=Value(0),
+        output_field=output_field,
+    )
+
+
+def apply(restaurant_id: int, day: date, deltas: dict[int, Delta]) -> None:
+    """Add ``deltas`` (keyed by item id) to the rollup rows of one day."""
+    if not deltas:
+        return
+    # Make sure every row exists, then increment them all in place. Concurrent
+    # writers cannot lose updates because the increments happen in SQL.
+    DailySales.objects.bulk_create(
+        [
+            DailySales(restaurant_id=restaurant_id, date=day, item_id=item_id)
+            for item_id in deltas
+        ],
+        ignore_conflicts=True,
+    )
+    DailySales.objects.filter(
+        restaurant_id=restaurant_id, date=day, item_id__in=list(deltas)
+    ).update(
+        quantity=increments("quantity", deltas, IntegerField()),
+        revenue=increments("revenue", deltas, MONEY),
+        paid_revenue=increments("paid_revenue", deltas, MONEY),
+        order_count=increments("order_count", deltas, IntegerField()),
+    )
+
+
+def record_lines(
+    order: Order,
+    lines: Iterable[tuple[int, int, Decimal]],
+    sign: int = 1,
+    counted: bool = True,
+) -> None:
+    """
+    Add (or with ``sign=-1`` remove) order lines given as
+    ``(item_id, quantity, price)`` to the rollup of the order's day.
+
+    The order is counted in (or out) once per item of ``lines``; pass
+    ``counted=False`` when other lines of the order keep it counted.
+    """
+    deltas: dict[int, Delta] = defaultdict(Delta)
+    for item_id, quantity, price in lines:
+        delta = deltas[item_id]
+        delta.order_count = sign if counted else 0
+        delta.quantity += sign * quantity
+        delta.revenue += sign * quantity * price
+        if order.is_paid:
+            delta.paid_revenue += sign * quantity * price
+    apply(order.restaurant_id, timezone.localdate(order.created_at), deltas)
+
+
+def add_line(line: OrderItem) -> None:
+    """Add a new order line, counting the order if it is its first of the item."""
+    others = OrderItem.objects.filter(
+        order_id=line.order_id, item_id=line.item_id
+    ).exclude(pk=line.pk)
+    record_lines(
+        line.order,
+        [(line.item_id, line.quantity, line.price)],
+        counted=not others.exists(),
+    )
+
+
+def remove_line(line: OrderItem, deleted: QuerySet | None = None) -> None:
+    """
+    Remove an order line about to be deleted, alone or as one of the
+    ``deleted`` lines.
+
+    The order is counted out when no line of the item is left, once: by the
+    deleted line of the item with the lowest id.
+    """
+    lines = OrderItem.objects.filter(order_id=line.order_id, item_id=line.item_id)
+    if deleted is None:
+        deleted = lines.filter(pk=line.pk)
+    else:
+        deleted = lines.filter(pk__in=deleted.values("pk"))
+    kept = lines.exclude(pk__in=deleted.values("pk")).exists()
+    record_lines(
+        line.order,
+        [(line.item_id, line.quantity, line.price)],
+        sign=-1,
+        counted=not kept and not deleted.filter(pk__lt=line.pk).exists(),
+    )
+
+
+def remove_order(order: Order) -> None:
+    """Remove all lines of an order about to be deleted."""
+    lines = OrderItem.objects.filter(order=order).values_list(
+        "item_id", "quantity", "price"
+    )
+    record_lines(order, lines, sign=-1)
+
+
+def apply_orders(restaurant_id: int, day: date, orders: int, revenue: Decimal) -> None:
+    """Add ``orders`` and ``revenue`` to the order rollup row of one day."""
+    DailyOrders.objects.bulk_create(
+        [DailyOrders(restaurant_id=restaurant_id, date=day)], ignore_conflicts=True
+    )
+    DailyOrders.objects.filter(restaurant_id=restaurant_id, date=day).update(
+        order_count=F("order_count") + orders, revenue=F("revenue") + revenue
+    )
+
+
+def record_order(order: Order, sign: int = 1) -> None:
+    """Count an order and its total in (or with ``sign=-1`` out of) its day."""
+    apply_orders(
+        order.restaurant_id,
+        timezone.localdate(order.created_at),
+        sign,
+        sign * order.total_amount,
+    )
+
+
+def record_order_total(order: Order, total: Decimal) -> None:
+    """Add the total of an order that was counted before its total was set."""
+    apply_orders(order.restaurant_id, timezone.localdate(order.created_at), 0, total)
+
+
+def record_payment(order: Order, sign: int = 1) -> None:
+    """Move the revenue of an order in or out of ``paid_revenue``."""
+    deltas: dict[int, Delta] = defaultdict(Delta)
+    lines = (
+        OrderItem.objects.filter(order=order)
+        .values("item_id")
+        .annotate(revenue=Sum(F("price") * F("quantity"), output_field=MONEY))
+    )
+    for line in lines:
+        deltas[line["item_id"]].paid_revenue = sign * line["revenue"]
+    apply(order.restaurant_id, timezone.localdate(order.created_at), deltas)
+
+
+def rebuild(
+    restaurant_ids: list[int] | None = None,
+    since: date | None = None,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Recompute rollup rows from ``Order``/``OrderItem``.
+
+    Existing rows in scope are deleted and replaced by a grouped aggregate
+    streamed through ``iterator()`` and written with ``bulk_create`` in
+    batches; the ``DailyOrders`` rows in scope are rebuilt the same way.
+    Returns the number of ``DailySales`` rows written.
+    """
+    rebuild_orders(restaurant_ids, since, batch_size)
+    rows = DailySales.objects.all()
+    lines = OrderItem.objects.all()
+    if restaurant_ids is not None:
+        rows = rows.filter(restaurant_id__in=restaurant_ids)
+        lines = lines.filter(order__restaurant_id__in=restaurant_ids)
+    if since is not None:
+        rows = rows.filter(date__gte=since)
+        lines = lines.filter(order__created_at__date__gte=since)
+    rows.delete()
+
+    revenue = F("price") * F("quantity")
+    aggregates = (
+        lines.annotate(
+            restaurant=F("order__restaurant_id"), day=TruncDate("order__created_at")
+        )
+        .values("restaurant", "day", "item_id")
+        .annotate(
+            units=Sum("quantity"),
+            total=Sum(revenue, output_field=MONEY),
+            paid=Sum(
+                revenue, filter=Q(order__is_paid=True), default=0, output_field=MONEY
+            ),
+            orders=Count("order_id", distinct=True),
+        )
+        .order_by()
+    )
+
+    written = 0
+    batch: list[DailySales] = []
+    for row in aggregates.iterator(chunk_size=batch_size):
+        batch.append(
+            DailySales(
+                restaurant_id=row["restaurant"],
+                date=row["day"],
+                item_id=row["item_id"],
+                quantity=row["units"],
+                revenue=row["total"],
+                paid_revenue=row["paid"],
+                order_count=row["orders"],
+            )
+        )
+        if len(batch) >= batch_size:
+            written += len(DailySales.objects.bulk_create(batch))
+            batch = []
+    if batch:
+        written += len(DailySales.objects.bulk_create(batch))
+    return written
+
+
+def rebuild_orders(
+    restaurant_ids: list[int] | None = None,
+    since: date | None = None,
+    batch_size: int = 1000,
+) -> int:
+    """Recompute ``DailyOrders`` rows from ``Order``, like ``rebuild``."""
+    rows = DailyOrders.objects.all()
+    orders = Order.objects.all()
+    if restaurant_ids is not None:
+        rows = rows.filter(restaurant_id__in=restaurant_ids)
+        orders = orders.filter(restaurant_id__in=restaurant_ids)
+    if since is not None:
+        rows = rows.filter(date__gte=since)
+        orders = orders.filter(created_at__date__gte=since)
+    rows.delete()
+
+    aggregates = (
+        orders.annotate(day=TruncDate("created_at"))
+        .values("restaurant_id", "day")
+        .annotate(orders=Count("id"), total=Sum("total_amount"))
+        .order_by()
+    )
+
+    written = 0
+    batch: list[DailyOrders] = []
+    for row in aggregates.iterator(chunk_size=batch_size):
+        batch.append(
+            DailyOrders(
+                restaurant_id=row["restaurant_id"],
+                date=row["day"],
+                order_count=row["orders"],
+                revenue=row["total"],
+            )
+        )
+        if len(batch) >= batch_size:
+            written += len(DailyOrders.objects.bulk_create(batch))
+            batch = []
+    if batch:
+        written += len(DailyOrders.objects.bulk_create(batch))
+    return written
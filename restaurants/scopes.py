@@ -0,0 +1,64 @@
+"""
+Restaurant scopes.
+
+The set of restaurants a user may manage is resolved once per request and
+cached on it, so querysets and object permission checks compare plain
+``restaurant_id`` values instead of walking ``obj.restaurant.owner`` or
+``user.employee.restaurant`` for every object.
+"""
+
+from typing import Any
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import QuerySet
+from rest_framework.request import Request
+
+from restaurants.models import Restaurant
+
+# Cached on the request; ``None`` means every restaurant (superusers)
+CACHE_ATTRIBUTE = "_restaurant_scope"
+
+
+def resolve_scope(user: Any) -> frozenset[int] | None:
+    if user.is_superuser:
+        return None
+    if not user.is_authenticated:
+        return frozenset()
+    if user.user_type == "owner":
+        # Owner profiles share the primary key of their user
+        return frozenset(
+            Restaurant.objects.filter(owner_id=user.pk).values_list("id", flat=True)
+        )
+    if user.user_type == "employee":
+        # Token authentication loads the employee profile with the user
+        try:
+            restaurant_id = user.employee.restaurant_id
+        except ObjectDoesNotExist:
+            # An employee user without an employee profile manages nothing
+            return frozenset()
+        return frozenset() if restaurant_id is None else frozenset([restaurant_id])
+    return frozenset()
+
+
+def restaurant_scope(request: Request) -> frozenset[int] | None:
+    """Ids of the restaurants the user manages, or ``None`` for all of them."""
+    try:
+        return getattr(request, CACHE_ATTRIBUTE)
+    except AttributeError:
+        scope = resolve_scope(request.user)
+        setattr(request, CACHE_ATTRIBUTE, scope)
+        return scope
+
+
+def in_scope(request: Request, restaurant_id: int | None) -> bool:
+    scope = restaurant_scope(request)
+    return scope is None or restaurant_id in scope
+
+
+def filter_by_scope(
+    queryset: QuerySet, request: Request, field: str = "restaurant_id"
+) -> QuerySet:
+    scope = restaurant_scope(request)
+    if scope is None:
+        return queryset
+    return queryset.filter(**{f"{field}__in": scope})
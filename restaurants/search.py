@@ -0,0 +1,146 @@
+"""
+Full-text item search.
+
+Items are indexed by name, description, category name and restaurant name
+in a backend specific table created by migration 0006: an FTS5 virtual table
+on SQLite and a weighted ``tsvector`` column with a GIN index on PostgreSQL.
+Other backends get no index and an empty search.
+
+Signals keep the index in sync with saves and deletes; the table has no
+foreign key to the items, so rows of deleted items are removed by a signal
+too. Code writing items in bulk, which bypasses signals, calls
+``reindex_items`` or ``reindex_restaurants`` itself; ``rebuild`` recreates
+the whole index.
+"""
+
+import re
+
+from django.db import connection
+
+TABLE = "restaurants_item_search"
+
+# Relative weight of a match in the name, description, category and restaurant
+SQLITE_WEIGHTS = (10.0, 2.0, 5.0, 1.0)
+
+ITEMS = """
+    FROM restaurants_item i
+    JOIN restaurants_category c ON c.id = i.category_id
+    JOIN restaurants_restaurant r ON r.id = i.restaurant_id
+"""
+
+POSTGRES_DOCUMENT = """
+    setweight(to_tsvector('simple', i.name), 'A')
+    || setweight(to_tsvector('simple', COALESCE(i.description, '')), 'B')
+    || setweight(to_tsvector('simple', c.name), 'B')
+    || setweight(to_tsvector('simple', r.name), 'C')
+"""
+
+
+def supported() -> bool:
+    return connection.vendor in ("sqlite", "postgresql")
+
+
+def reindex(where: str = "", params: tuple = ()) -> None:
+    """(Re)index the items matching an SQL condition on ``i``, ``c`` or ``r``."""
+    condition = f"WHERE {where}" if where else ""
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            # FTS5 tables have no upsert: replace the rows instead
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE rowid IN (SELECT i.id {ITEMS} {condition})",
+                params,
+            )
+            cursor.execute(
+                f"INSERT INTO {TABLE} (rowid, name, description, category, "
+                "restaurant) SELECT i.id, i.name, COALESCE(i.description, ''), "
+                f"c.name, r.name {ITEMS} {condition}",
+                params,
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                f"INSERT INTO {TABLE} (item_id, document) "
+                f"SELECT i.id, {POSTGRES_DOCUMENT} {ITEMS} {condition} "
+                "ON CONFLICT (item_id) DO UPDATE SET document = EXCLUDED.document",
+                params,
+            )
+
+
+def reindex_items(item_ids: list[int]) -> None:
+    if item_ids:
+        reindex(in_condition("i.id", item_ids), tuple(item_ids))
+
+
+def reindex_category(category_id: int) -> None:
+    reindex("i.category_id = %s", (category_id,))
+
+
+def reindex_restaurants(restaurant_ids: list[int]) -> None:
+    if restaurant_ids:
+        reindex(in_condition("i.restaurant_id", restaurant_ids), tuple(restaurant_ids))
+
+
+def remove_items(item_ids: list[int]) -> None:
+    if not item_ids or not supported():
+        return
+    column = "rowid" if connection.vendor == "sqlite" else "item_id"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {TABLE} WHERE {in_condition(column, item_ids)}",
+            tuple(item_ids),
+        )
+
+
+def rebuild() -> int:
+    """Recreate the whole index; returns the number of indexed items."""
+    if not supported():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+        reindex()
+        cursor.execute(f"SELECT COUNT(*) FROM {TABLE}")
+        return cursor.fetchone()[0]
+
+
+def in_condition(column: str, values: list) -> str:
+    return f"{column} IN ({', '.join(['%s'] * len(values))})"
+
+
+def terms(query: str) -> list[str]:
+    # Plain words only, so user input can never inject query syntax
+    return re.findall(r"\w+", query.lower())[:10]
+
+
+def search(query: str, limit: int = 20, offset: int = 0) -> list[int]:
+    """
+    Ids of the available items matching every word of ``query``, best first.
+
+    Words match as prefixes, so partial input such as "bir" finds "Biryani".
+    Neither index stems words: a stemmed prefix no longer matches the word
+    it was typed from, and type-ahead matters more here than plurals.
+    """
+    words = terms(query)
+    if not words or not supported():
+        return []
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            weights = ", ".join(str(weight) for weight in SQLITE_WEIGHTS)
+            cursor.execute(
+                f"SELECT s.rowid FROM {TABLE} s "
+                "JOIN restaurants_item i ON i.id = s.rowid "
+                f"WHERE {TABLE} MATCH %s AND i.is_available "
+                f"ORDER BY bm25({TABLE}, {weights}), s.rowid "
+                "LIMIT %s OFFSET %s",
+                (" ".join(f'"{word}"*' for word in words), limit, offset),
+            )
+        else:
+            cursor.execute(
+                f"SELECT s.item_id FROM {TABLE} s "
+                "JOIN restaurants_item i ON i.id = s.item_id, "
+                "to_tsquery('simple', %s) query "
+                "WHERE s.document @@ query AND i.is_available "
+                "ORDER BY ts_rank(s.document, query) DESC, s.item_id "
+                "LIMIT %s OFFSET %s",
+                (" & ".join(f"{word}:*" for word in words), limit, offset),
+            )
+        return [row[0] for row in cursor.fetchall()]
@@ -1,7 +1,19 @@
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
 from typing import Any
 
+from django.db import transaction
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.utils import model_meta
 
+from core.metrics import SerializeTimingMixin
+from core.sparse_fields import SparseFieldsMixin
+from restaurants import rollups
+from restaurants.analytics import BUCKETS
+from restaurants.menu_document import invalidate_menu_document
 from restaurants.models import (
     Category,
     Company,
@@ -11,23 +23,47 @@ from restaurants.models import (
     OrderItem,
     Restaurant,
 )
+from restaurants.scopes import filter_by_scope
 
 
-class CustomModelSerializer(serializers.ModelSerializer):
+class CustomModelSerializer(
+    SerializeTimingMixin, SparseFieldsMixin, serializers.ModelSerializer
+):
     def create(self, validated_data: Any) -> Any:
-        # Create the instance
-        instance = super().create(validated_data)
+        # Set the audit fields before the INSERT so a create is one statement
+        user = self.context["request"].user
+        validated_data["created_by"] = user
+        validated_data["last_updated_by"] = user
+        return super().create(validated_data)
 
-        # Update the instance with the created_by field
-        instance.created_by = self.context["request"].user
-        instance.save()
+    def update(self, instance: Any, validated_data: Any) -> Any:
+        # Write only the fields that changed, plus the audit fields
+        info = model_meta.get_field_info(instance)
+        many_to_many = {}
+        update_fields = ["last_updated_by", "updated_at"]
+        for attr, value in validated_data.items():
+            relation = info.relations.get(attr)
+            if relation is not None and relation.to_many:
+                many_to_many[attr] = value
+                continue
 
-        return instance
+            if relation is not None:
+                # Compare foreign keys by id to avoid loading the related row
+                current = getattr(instance, relation.model_field.attname)
+                changed = current != getattr(value, "pk", value)
+            else:
+                changed = getattr(instance, attr) != value
+            if changed:
+                setattr(instance, attr, value)
+                update_fields.append(attr)
 
-    def update(self, instance: Any, validated_data: Any) -> Any:
-        # Update the instance with the updated_by field
         instance.last_updated_by = self.context["request"].user
-        return super().update(instance, validated_data)
+        instance.save(update_fields=update_fields)
+
+        for attr, value in many_to_many.items():
+            getattr(instance, attr).set(value)
+
+        return instance
 
 
 class CompanySerializer(CustomModelSerializer):
@@ -37,36 +73,323 @@ class CompanySerializer(CustomModelSerializer):
 
 
 class RestaurantSerializer(CustomModelSerializer):
+    # The owner's view of a restaurant, counters included. Everyone else gets
+    # PublicRestaurantSerializer.
+    expandable_fields = {"company": CompanySerializer}
+
     class Meta:
         model = Restaurant
         fields = "__all__"
 
+    def validate(self, attrs: dict) -> dict:
+        latitude = attrs.get("latitude", getattr(self.instance, "latitude", None))
+        longitude = attrs.get("longitude", getattr(self.instance, "longitude", None))
+        if (latitude is None) != (longitude is None):
+            raise serializers.ValidationError(
+                "Set both latitude and longitude, or neither."
+            )
+        return attrs
+
+
+class PublicRestaurantSerializer(CustomModelSerializer):
+    # What customers and anonymous clients may see of a restaurant: no owner,
+    # audit fields or order counters
+    class Meta:
+        model = Restaurant
+        fields = [
+            "id",
+            "company",
+            "name",
+            "description",
+            "phone_number",
+            "email",
+            "website",
+            "address",
+            "latitude",
+            "longitude",
+            "is_open",
+        ]
+        read_only_fields = fields
+
+
+class NearbyRestaurantSerializer(PublicRestaurantSerializer):
+    # Great-circle distance in km from the searched point
+    distance = serializers.FloatField(read_only=True)
+
+    class Meta(PublicRestaurantSerializer.Meta):
+        fields = PublicRestaurantSerializer.Meta.fields + ["distance"]
+        read_only_fields = fields
+
 
 class MenuSerializer(CustomModelSerializer):
+    expandable_fields = {"restaurant": PublicRestaurantSerializer}
+
     class Meta:
         model = Menu
         fields = "__all__"
 
 
 class CategorySerializer(CustomModelSerializer):
+    expandable_fields = {"restaurant": PublicRestaurantSerializer}
+
     class Meta:
         model = Category
         fields = "__all__"
 
 
 class ItemSerializer(CustomModelSerializer):
+    expandable_fields = {
+        "restaurant": PublicRestaurantSerializer,
+        "menu": MenuSerializer,
+        "category": CategorySerializer,
+    }
+
     class Meta:
         model = Item
         fields = "__all__"
 
+    def validate(self, attrs: dict) -> dict:
+        # An item, its menu and its category belong to the same restaurant
+        restaurant, menu, category = (
+            attrs.get(name, getattr(self.instance, name, None))
+            for name in ("restaurant", "menu", "category")
+        )
+        if restaurant is not None and not (
+            menu.restaurant_id == category.restaurant_id == restaurant.pk
+        ):
+            raise serializers.ValidationError(
+                "The menu and category must belong to the item's restaurant."
+            )
+        return attrs
+
+
+class BulkItemUpdateSerializer(serializers.ListSerializer):
+    def validate(self, attrs: list) -> list:
+        # Merge repeated ids, then check ownership of the whole set at once
+        changes: dict[int, dict] = {}
+        for change in attrs:
+            changes.setdefault(change["id"], {}).update(change)
+
+        items = filter_by_scope(Item.objects.all(), self.context["request"])
+        self.items = items.in_bulk(list(changes))
+        missing = sorted(set(changes) - set(self.items))
+        if missing:
+            raise serializers.ValidationError(
+                f"Items not found or not editable: {missing}"
+            )
+        return list(changes.values())
+
+    def create(self, validated_data: Any) -> list[Item]:
+        # bulk_update skips save() and the signals, so the audit fields and
+        # the menu document invalidation are handled here
+        user = self.context["request"].user
+        now = timezone.now()
+        items = []
+        for change in validated_data:
+            item = self.items[change["id"]]
+            item.price = change.get("price", item.price)
+            item.is_available = change.get("is_available", item.is_available)
+            item.last_updated_by = user
+            item.updated_at = now
+            items.append(item)
+
+        with transaction.atomic():
+            Item.objects.bulk_update(
+                items, ["price", "is_available", "last_updated_by", "updated_at"]
+            )
+            for restaurant_id in {item.restaurant_id for item in items}:
+                transaction.on_commit(
+                    lambda pk=restaurant_id: invalidate_menu_document(pk)
+                )
+        return items
+
+
+class ItemChangeSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=0, required=False
+    )
+    is_available = serializers.BooleanField(required=False)
+
+    class Meta:
+        list_serializer_class = BulkItemUpdateSerializer
+
 
 class OrderSerializer(CustomModelSerializer):
+    expandable_fields = {"restaurant": PublicRestaurantSerializer}
+
     class Meta:
         model = Order
         fields = "__all__"
 
 
 class OrderItemSerializer(CustomModelSerializer):
+    expandable_fields = {"order": OrderSerializer, "item": ItemSerializer}
+
     class Meta:
         model = OrderItem
         fields = "__all__"
+
+
+class OrderLineSerializer(serializers.ModelSerializer):
+    item_name = serializers.CharField(source="item.name", read_only=True)
+
+    class Meta:
+        model = OrderItem
+        fields = ["id", "item", "item_name", "quantity", "price"]
+
+
+class OrderReadSerializer(
+    SerializeTimingMixin, SparseFieldsMixin, serializers.ModelSerializer
+):
+    # Read-only representation of an order with its lines embedded. Relies on
+    # the view prefetching ``order_items__item`` to stay free of N+1 queries.
+    client_name = serializers.CharField(source="client.get_full_name", read_only=True)
+    restaurant_name = serializers.CharField(source="restaurant.name", read_only=True)
+    order_items = OrderLineSerializer(many=True, read_only=True)
+
+    expandable_fields = {"restaurant": PublicRestaurantSerializer}
+
+    class Meta:
+        model = Order
+        fields = [
+            "id",
+            "order_id",
+            "client",
+            "client_name",
+            "restaurant",
+            "restaurant_name",
+            "address",
+            "total_amount",
+            "payment_method",
+            "is_paid",
+            "order_items",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class CartLineSerializer(serializers.Serializer):
+    item_id = serializers.IntegerField()
+    quantity = serializers.IntegerField(min_value=1)
+
+
+class PlaceOrderSerializer(serializers.Serializer):
+    restaurant = serializers.PrimaryKeyRelatedField(queryset=Restaurant.objects.all())
+    address = serializers.CharField(max_length=500)
+    payment_method = serializers.ChoiceField(choices=Order.PAYMENT_METHODS)
+    items = CartLineSerializer(many=True, allow_empty=False)
+
+    def validate(self, attrs: dict) -> dict:
+        # Merge repeated cart lines and resolve every item with a single query
+        quantities: Counter = Counter()
+        for line in attrs["items"]:
+            quantities[line["item_id"]] += line["quantity"]
+
+        items = Item.objects.filter(
+            restaurant=attrs["restaurant"], is_available=True
+        ).in_bulk(list(quantities))
+        missing = sorted(set(quantities) - set(items))
+        if missing:
+            raise serializers.ValidationError(
+                {"items": f"Items not available at this restaurant: {missing}"}
+            )
+
+        attrs["lines"] = [(items[pk], quantity) for pk, quantity in quantities.items()]
+        return attrs
+
+    def create(self, validated_data: Any) -> Order:
+        user = self.context["request"].user
+        with transaction.atomic():
+            order = Order.objects.create(
+                client=user,
+                restaurant=validated_data["restaurant"],
+                address=validated_data["address"],
+                payment_method=validated_data["payment_method"],
+                total_amount=Decimal("0"),
+                created_by=user,
+            )
+            OrderItem.objects.bulk_create(
+                [
+                    OrderItem(
+                        order=order,
+                        item=item,
+                        quantity=quantity,
+                        price=item.price,
+                        created_by=user,
+                    )
+                    for item, quantity in validated_data["lines"]
+                ]
+            )
+            lines = [
+                (item.pk, quantity, item.price)
+                for item, quantity in validated_data["lines"]
+            ]
+            rollups.record_lines(order, lines)
+            # Let the database sum the lines rather than trusting the client
+            line_total = (
+                OrderItem.objects.filter(order=OuterRef("pk"))
+                .values("order")
+                .annotate(
+                    total=Sum(
+                        F("price") * F("quantity"),
+                        output_field=DecimalField(max_digits=10, decimal_places=2),
+                    )
+                )
+                .values("total")
+            )
+            Order.objects.filter(pk=order.pk).update(total_amount=Subquery(line_total))
+            # The order was counted in DailyOrders before its total was known
+            rollups.record_order_total(
+                order,
+                sum((quantity * price for _, quantity, price in lines), Decimal(0)),
+            )
+        return order
+
+
+class AnalyticsQuerySerializer(serializers.Serializer):
+    DEFAULT_RANGE = {"day": timedelta(days=30), "hour": timedelta(days=2)}
+    MAX_BUCKETS = 2000
+
+    start = serializers.DateTimeField(
+        required=False, input_formats=["iso-8601", "%Y-%m-%d"]
+    )
+    end = serializers.DateTimeField(
+        required=False, input_formats=["iso-8601", "%Y-%m-%d"]
+    )
+    bucket = serializers.ChoiceField(choices=list(BUCKETS), default="day")
+
+    def validate(self, attrs: dict) -> dict:
+        bucket = attrs["bucket"]
+        attrs.setdefault("end", timezone.now())
+        attrs.setdefault("start", attrs["end"] - self.DEFAULT_RANGE[bucket])
+
+        if attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError("'from' must be before 'to'.")
+        if (attrs["end"] - attrs["start"]) / BUCKETS[bucket][1] > self.MAX_BUCKETS:
+            raise serializers.ValidationError(
+                f"The range spans more than {self.MAX_BUCKETS} {bucket} buckets."
+            )
+        return attrs
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+    offset = serializers.IntegerField(min_value=0, max_value=1000, default=0)
+
+
+class NearbyQuerySerializer(serializers.Serializer):
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lng = serializers.FloatField(min_value=-180, max_value=180)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+    radius = serializers.FloatField(min_value=0, max_value=20000, required=False)
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    start = serializers.DateTimeField(
+        required=False, input_formats=["iso-8601", "%Y-%m-%d"]
+    )
+    end = serializers.DateTimeField(
+        required=False, input_formats=["iso-8601", "%Y-%m-%d"]
+    )
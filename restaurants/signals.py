@@ -0,0 +1,144 @@
+from typing import Any
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from restaurants import counters, events, rollups, search
+from restaurants.menu_document import invalidate_menu_document
+from restaurants.models import Category, Item, Menu, Order, OrderItem, Restaurant
+from restaurants.order_ids import restaurant_codes
+
+
+@receiver([post_save, post_delete], sender=Menu)
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=Item)
+def invalidate_menu_on_change(sender: Any, instance: Any, **kwargs: Any) -> None:
+    # Drop the cached menu document once the change is committed, so a reader
+    # racing the transaction cannot cache the old tree under the new version.
+    restaurant_id = instance.restaurant_id
+    transaction.on_commit(lambda: invalidate_menu_document(restaurant_id))
+
+
+@receiver(post_save, sender=Restaurant)
+def invalidate_menu_on_restaurant_change(
+    sender: Any, instance: Restaurant, created: bool, **kwargs: Any
+) -> None:
+    if not created:
+        transaction.on_commit(lambda: invalidate_menu_document(instance.pk))
+
+
+@receiver(post_save, sender=Restaurant)
+def invalidate_restaurant_code(
+    sender: Any, instance: Restaurant, **kwargs: Any
+) -> None:
+    # A renamed restaurant gets a new code in its next order ids
+    restaurant_codes.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=OrderItem)
+def add_line_to_daily_sales(
+    sender: Any, instance: OrderItem, created: bool, **kwargs: Any
+) -> None:
+    if created:
+        rollups.add_line(instance)
+
+
+@receiver(pre_delete, sender=OrderItem)
+def remove_line_from_daily_sales(
+    sender: Any, instance: OrderItem, origin: Any = None, **kwargs: Any
+) -> None:
+    if isinstance(origin, OrderItem):
+        rollups.remove_line(instance)
+    elif isinstance(origin, QuerySet) and origin.model is OrderItem:
+        rollups.remove_line(instance, deleted=origin)
+    # Lines deleted with their order are removed by remove_order_from_daily_sales;
+    # with their item, the item's rollup rows are deleted too
+
+
+@receiver(pre_delete, sender=Order)
+def remove_order_from_daily_sales(sender: Any, instance: Order, **kwargs: Any) -> None:
+    rollups.remove_order(instance)
+
+
+def payment_flipped(instance: Order, created: bool, update_fields: Any) -> bool:
+    # Order.save refreshes ``_stored_is_paid`` once every receiver has run
+    previous = getattr(instance, "_stored_is_paid", None)
+    if created or previous is None or previous == instance.is_paid:
+        return False
+    return update_fields is None or "is_paid" in update_fields
+
+
+@receiver(post_save, sender=Order)
+def record_payment_in_daily_sales(
+    sender: Any, instance: Order, created: bool, update_fields: Any, **kwargs: Any
+) -> None:
+    if payment_flipped(instance, created, update_fields):
+        rollups.record_payment(instance, sign=1 if instance.is_paid else -1)
+
+
+@receiver(post_save, sender=Order)
+def add_order_to_daily_orders(
+    sender: Any, instance: Order, created: bool, **kwargs: Any
+) -> None:
+    if created:
+        rollups.record_order(instance)
+
+
+@receiver(post_delete, sender=Order)
+def remove_order_from_daily_orders(sender: Any, instance: Order, **kwargs: Any) -> None:
+    rollups.record_order(instance, sign=-1)
+
+
+@receiver(post_save, sender=Order)
+def update_restaurant_counters(
+    sender: Any, instance: Order, created: bool, update_fields: Any, **kwargs: Any
+) -> None:
+    if created:
+        counters.record_order(instance)
+    elif payment_flipped(instance, created, update_fields):
+        counters.record_payment(instance, sign=1 if instance.is_paid else -1)
+
+
+@receiver(post_delete, sender=Order)
+def remove_order_from_counters(sender: Any, instance: Order, **kwargs: Any) -> None:
+    counters.record_order(instance, sign=-1)
+
+
+@receiver(post_save, sender=Order)
+def publish_order_status(sender: Any, instance: Order, **kwargs: Any) -> None:
+    # Snapshot the status now, but only push it once it is visible to others
+    event = events.order_event(instance)
+    transaction.on_commit(lambda: events.publish_order_event(event))
+
+
+@receiver(post_save, sender=Item)
+def index_item(sender: Any, instance: Item, update_fields: Any, **kwargs: Any) -> None:
+    # Written in the same transaction, so the index never sees a rolled back
+    # change. Availability is checked at query time, not indexed.
+    indexed = {"name", "description", "category", "restaurant"}
+    if update_fields is None or indexed & set(update_fields):
+        search.reindex_items([instance.pk])
+
+
+@receiver(post_delete, sender=Item)
+def unindex_item(sender: Any, instance: Item, **kwargs: Any) -> None:
+    search.remove_items([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def index_category_items(
+    sender: Any, instance: Category, created: bool, update_fields: Any, **kwargs: Any
+) -> None:
+    # Only the name is indexed, and a new category has no items yet
+    if not created and (update_fields is None or "name" in update_fields):
+        search.reindex_category(instance.pk)
+
+
+@receiver(post_save, sender=Restaurant)
+def index_restaurant_items(
+    sender: Any, instance: Restaurant, created: bool, update_fields: Any, **kwargs: Any
+) -> None:
+    if not created and (update_fields is None or "name" in update_fields):
+        search.reindex_restaurants([instance.pk])
@@ -0,0 +1,118 @@
+from datetime import datetime, timezone
+from typing import Any
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from restaurants import rollups
+from restaurants.models import Order
+from restaurants.tests.utils import (
+    create_item,
+    create_order,
+    create_restaurant,
+    create_user,
+)
+
+
+class RestaurantAnalyticsTest(APITestCase):
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.owner_user = create_user("owner", "owner")
+        self.customer = create_user("customer", "customer")
+        self.restaurant = create_restaurant(self.owner_user)
+        burger = create_item(self.restaurant, name="Burger", price="8.00")
+        fries = create_item(
+            self.restaurant,
+            name="Fries",
+            price="2.00",
+            menu=burger.menu,
+            category=burger.category,
+        )
+        placed = [
+            (datetime(2024, 1, 1, 9, tzinfo=timezone.utc), [burger, fries]),
+            (datetime(2024, 1, 1, 12, tzinfo=timezone.utc), [fries]),
+            (datetime(2024, 1, 3, 18, tzinfo=timezone.utc), [burger]),
+        ]
+        for created_at, items in placed:
+            order = create_order(self.customer, self.restaurant, items)
+            Order.objects.filter(pk=order.pk).update(created_at=created_at)
+        rollups.rebuild()
+
+        self.client.force_authenticate(user=self.owner_user)
+        self.url = reverse(
+            "restaurants:restaurant-analytics", kwargs={"pk": self.restaurant.pk}
+        )
+
+    def test_daily_series(self) -> None:
+        # Test orders are bucketed per day with revenue and average ticket
+        response: Any = self.client.get(
+            self.url, {"from": "2024-01-01", "to": "2024-01-03"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["series"],
+            [
+                ["2024-01-01T00:00:00+00:00", 2, "12.00", "6.00"],
+                ["2024-01-03T00:00:00+00:00", 1, "8.00", "8.00"],
+            ],
+        )
+        self.assertEqual(
+            response.data["totals"],
+            {"orders": 3, "revenue": "20.00", "average": "6.67"},
+        )
+        top = response.data["top_items"][0]
+        self.assertEqual(
+            (top["name"], top["quantity"], top["revenue"]), ("Burger", 2, "16.00")
+        )
+        self.assertIn("max-age=86400", response["Cache-Control"])
+
+    def test_daily_series_reads_no_orders(self) -> None:
+        # Test day buckets come from the rollups rather than the order rows
+        params = {"from": "2024-01-01", "to": "2024-01-03"}
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, params)
+        self.assertFalse(
+            any('FROM "restaurants_order"' in query["sql"] for query in queries)
+        )
+
+    def test_hourly_series(self) -> None:
+        response: Any = self.client.get(
+            self.url,
+            {
+                "from": "2024-01-01T00:00:00Z",
+                "to": "2024-01-01T23:00:00Z",
+                "bucket": "hour",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row[:2] for row in response.data["series"]],
+            [["2024-01-01T09:00:00+00:00", 1], ["2024-01-01T12:00:00+00:00", 1]],
+        )
+
+    def test_cached_per_bucket(self) -> None:
+        # Test a repeated request within the same buckets is served from cache
+        params = {"from": "2024-01-01T10:00:00Z", "to": "2024-01-03T10:00:00Z"}
+        self.client.get(self.url, params)
+        with self.assertNumQueries(2):
+            # Only the restaurant lookup and its permission check remain
+            response = self.client.get(
+                self.url, {"from": "2024-01-01", "to": "2024-01-03T23:59:00Z"}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_invalid_parameters(self) -> None:
+        response = self.client.get(self.url, {"bucket": "week"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {"from": "2024-02-01", "to": "2024-01-01"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_other_owner(self) -> None:
+        self.client.force_authenticate(user=create_user("other", "owner"))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
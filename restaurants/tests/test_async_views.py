@@ -0,0 +1,122 @@
+import json
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from authentication.cache import token_cache
+from restaurants.menu_document import get_cache
+from restaurants.tests.utils import (
+    create_item,
+    create_order,
+    create_restaurant,
+    create_user,
+)
+
+
+class AsyncViewsTest(TestCase):
+
+    def setUp(self) -> None:
+        get_cache().clear()
+        token_cache.clear()
+        self.owner_user = create_user("owner", "owner")
+        self.restaurant = create_restaurant(self.owner_user)
+        self.item = create_item(self.restaurant, name="Burger", price="8.50")
+        self.customer = create_user("customer", "customer")
+        self.orders = [
+            create_order(self.customer, self.restaurant, [self.item]) for _ in range(3)
+        ]
+        token = Token.objects.create(user=self.customer)
+        self.headers = {"Authorization": f"Token {token.key}"}
+
+    async def test_menu_document(self) -> None:
+        # Test the async document matches the sync one, ETag included
+        url = reverse(
+            "restaurants:async-menu-document", kwargs={"pk": self.restaurant.pk}
+        )
+        sync_url = reverse(
+            "restaurants:restaurant-menu-document", kwargs={"pk": self.restaurant.pk}
+        )
+        response: Any = await self.async_client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = await sync_to_async(self.client.get)(sync_url)
+        self.assertEqual(response.content, expected.content)
+
+        response = await self.async_client.get(
+            url, headers={"If-None-Match": response["ETag"]}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_order_list(self) -> None:
+        # Test the async list pages like the sync endpoint
+        url = reverse("restaurants:async-order-list")
+        response: Any = await self.async_client.get(
+            url, {"page_size": 2}, headers=self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertEqual(
+            [order["id"] for order in data["results"]],
+            [self.orders[2].pk, self.orders[1].pk],
+        )
+        self.assertEqual(data["results"][0]["order_items"][0]["item_name"], "Burger")
+
+        response = await self.async_client.get(data["next"], headers=self.headers)
+        data = json.loads(response.content)
+        self.assertEqual(
+            [order["id"] for order in data["results"]], [self.orders[0].pk]
+        )
+        self.assertIsNone(data["next"])
+
+    async def test_order_status(self) -> None:
+        order = self.orders[0]
+        url = reverse("restaurants:async-order-status", kwargs={"pk": order.pk})
+        response: Any = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertEqual(data["order_id"], order.order_id)
+        self.assertFalse(data["is_paid"])
+
+        url = reverse("restaurants:async-order-status", kwargs={"pk": 0})
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_orders_of_other_clients_are_hidden(self) -> None:
+        # Test another customer sees none of the orders; the owner sees all
+        other = await sync_to_async(create_user)("other", "customer")
+        token = await Token.objects.acreate(user=other)
+        headers = {"Authorization": f"Token {token.key}"}
+        url = reverse(
+            "restaurants:async-order-status", kwargs={"pk": self.orders[0].pk}
+        )
+        response: Any = await self.async_client.get(url, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        url = reverse("restaurants:async-order-list")
+        response = await self.async_client.get(url, headers=headers)
+        self.assertEqual(json.loads(response.content)["results"], [])
+
+        token = await Token.objects.acreate(user=self.owner_user)
+        headers = {"Authorization": f"Token {token.key}"}
+        response = await self.async_client.get(url, headers=headers)
+        self.assertEqual(len(json.loads(response.content)["results"]), 3)
+
+    async def test_authentication_required(self) -> None:
+        url = reverse("restaurants:async-order-list")
+        response: Any = await self.async_client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response["WWW-Authenticate"], "Token")
+
+        response = await self.async_client.get(
+            url, headers={"Authorization": "Token invalid"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_server_timing(self) -> None:
+        # Test the metrics middleware also times async requests
+        url = reverse("restaurants:async-order-list")
+        response: Any = await self.async_client.get(url, headers=self.headers)
+        self.assertRegex(response["Server-Timing"], r'db;dur=[\d.]+;desc="[1-9]\d*')
@@ -0,0 +1,195 @@
+from datetime import timedelta
+from typing import Any
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from restaurants.models import Item
+from restaurants.serializers import ItemSerializer
+from restaurants.tests.utils import (
+    create_item,
+    create_order,
+    create_restaurant,
+    create_user,
+)
+
+
+class ConditionalGetTest(APITestCase):
+
+    def setUp(self) -> None:
+        self.owner_user = create_user("owner", "owner")
+        self.customer = create_user("customer", "customer")
+        self.restaurant = create_restaurant(self.owner_user)
+        self.item = create_item(self.restaurant, name="Burger", price="8.50")
+        self.client.force_authenticate(user=self.owner_user)
+        self.item_url = reverse("restaurants:item-detail", kwargs={"pk": self.item.pk})
+        self.items_url = reverse("restaurants:item-list")
+
+    def revalidate(self, url: str, response: Any, **params: Any) -> Any:
+        return self.client.get(url, params, headers={"If-None-Match": response["ETag"]})
+
+    def test_detail(self) -> None:
+        # Test a matching ETag or date is answered before serializing
+        Item.objects.filter(pk=self.item.pk).update(
+            updated_at=timezone.now() - timedelta(minutes=1)
+        )
+        response = self.client.get(self.item_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertIn("Last-Modified", response)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        self.assertIn("Authorization", response["Vary"])
+
+        with mock.patch.object(
+            ItemSerializer, "to_representation", side_effect=AssertionError
+        ):
+            not_modified = self.revalidate(self.item_url, response)
+            self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(not_modified["ETag"], response["ETag"])
+            by_date = self.client.get(
+                self.item_url,
+                headers={"If-Modified-Since": response["Last-Modified"]},
+            )
+            self.assertEqual(by_date.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.item.price = "9.00"
+        self.item.save()
+        self.assertEqual(
+            self.revalidate(self.item_url, response).status_code, status.HTTP_200_OK
+        )
+
+    def test_no_last_modified_within_the_second_of_a_change(self) -> None:
+        # Test an order bumping the restaurant counters later in the same
+        # second cannot be hidden behind an unchanged Last-Modified
+        url = reverse(
+            "restaurants:restaurant-detail", kwargs={"pk": self.restaurant.pk}
+        )
+        self.restaurant.refresh_from_db()
+        changed = self.restaurant.updated_at
+        with mock.patch("core.conditional.timezone.now", return_value=changed):
+            response = self.client.get(url)
+        self.assertNotIn("Last-Modified", response)
+
+        create_order(self.customer, self.restaurant, [self.item])
+        response = self.client.get(
+            url, headers={"If-Modified-Since": http_date(changed.timestamp())}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["order_count"], 1)
+
+        later = timezone.now() + timedelta(seconds=1)
+        with mock.patch("core.conditional.timezone.now", return_value=later):
+            self.assertIn("Last-Modified", self.client.get(url))
+
+    def test_representation_is_part_of_the_etag(self) -> None:
+        # Test other fields or another user do not reuse the ETag
+        response = self.client.get(self.item_url)
+        sparse = self.revalidate(self.item_url, response, fields="id,name")
+        self.assertEqual(sparse.status_code, status.HTTP_200_OK)
+        admin = create_user("admin", "owner", is_superuser=True)
+        self.client.force_authenticate(user=admin)
+        self.assertEqual(
+            self.revalidate(self.item_url, response).status_code, status.HTTP_200_OK
+        )
+
+    def test_list(self) -> None:
+        # Test lists revalidate from their page and change on add or delete
+        response = self.client.get(self.items_url)
+        self.assertNotIn("Last-Modified", response)
+        with mock.patch.object(
+            ItemSerializer, "to_representation", side_effect=AssertionError
+        ):
+            not_modified = self.revalidate(self.items_url, response)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        create_item(
+            self.restaurant,
+            name="Fries",
+            menu=self.item.menu,
+            category=self.item.category,
+        )
+        changed = self.revalidate(self.items_url, response)
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        # Deleting a row moves no timestamp, but leaves the page
+        self.item.delete()
+        self.assertEqual(
+            self.revalidate(self.items_url, changed).status_code, status.HTTP_200_OK
+        )
+
+    def test_embedded_relations(self) -> None:
+        # Test an order changes when one of its embedded lines changes
+        order = create_order(self.customer, self.restaurant, [self.item])
+        self.client.force_authenticate(user=self.customer)
+        url = reverse("restaurants:order-detail", kwargs={"pk": order.pk})
+        response = self.client.get(url)
+        self.assertNotIn("Last-Modified", response)
+        self.assertEqual(
+            self.revalidate(url, response).status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        line = order.order_items.get()
+        line.quantity = 2
+        line.save()
+        self.assertEqual(self.revalidate(url, response).status_code, status.HTTP_200_OK)
+
+        list_url = reverse("restaurants:order-list")
+        response = self.client.get(list_url)
+        self.item.name = "Cheeseburger"
+        self.item.save()
+        self.assertEqual(
+            self.revalidate(list_url, response).status_code, status.HTTP_200_OK
+        )
+
+    def test_client_rename_changes_orders(self) -> None:
+        # Test the client name rendered into orders is part of the ETag
+        order = create_order(self.customer, self.restaurant, [self.item])
+        self.client.force_authenticate(user=self.customer)
+        for url in (
+            reverse("restaurants:order-list"),
+            reverse("restaurants:order-detail", kwargs={"pk": order.pk}),
+        ):
+            response = self.client.get(url)
+            self.customer.first_name = f"Renamed {url}"
+            self.customer.save()
+            self.assertEqual(
+                self.revalidate(url, response).status_code, status.HTTP_200_OK
+            )
+
+    def test_list_revalidation_reads_only_the_page(self) -> None:
+        # Test revalidating the order list costs the page queries, nothing more
+        create_order(self.customer, self.restaurant, [self.item])
+        self.client.force_authenticate(user=self.customer)
+        url = reverse("restaurants:order-list")
+        response = self.client.get(url)
+        # The page with its client and restaurant, and the lines with items
+        with self.assertNumQueries(2):
+            not_modified = self.revalidate(url, response)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_counters_change_the_restaurant(self) -> None:
+        # Test a new order changes the restaurant through its counters
+        url = reverse(
+            "restaurants:restaurant-detail", kwargs={"pk": self.restaurant.pk}
+        )
+        response = self.client.get(url)
+        create_order(self.customer, self.restaurant, [self.item])
+        self.assertEqual(self.revalidate(url, response).status_code, status.HTTP_200_OK)
+
+    @override_settings(
+        READ_CACHE_CONTROL={
+            "default": {"private": True, "no_cache": True},
+            "item": {"private": True, "max_age": 60},
+        }
+    )
+    def test_cache_control_per_resource(self) -> None:
+        # Test Cache-Control is looked up by resource with a default
+        response = self.client.get(self.item_url)
+        self.assertEqual(response["Cache-Control"], "private, max-age=60")
+        response = self.client.get(reverse("restaurants:menu-list"))
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
@@ -0,0 +1,129 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from restaurants.models import Order, Restaurant
+from restaurants.tests.utils import (
+    create_item,
+    create_order,
+    create_restaurant,
+    create_user,
+)
+
+
+class RestaurantCountersTest(APITestCase):
+
+    def setUp(self) -> None:
+        self.owner_user = create_user("owner", "owner")
+        self.customer = create_user("customer", "customer")
+        self.restaurant = create_restaurant(self.owner_user)
+        self.item = create_item(self.restaurant, price="12.50")
+
+    def counters(self) -> tuple:
+        self.restaurant.refresh_from_db()
+        return (
+            self.restaurant.order_count,
+            self.restaurant.unpaid_order_count,
+            self.restaurant.revenue,
+        )
+
+    def test_counters_follow_orders(self) -> None:
+        # Test creating, paying, unpaying and deleting orders update counters
+        order = create_order(self.customer, self.restaurant, [self.item])
+        create_order(self.customer, self.restaurant, [self.item], is_paid=True)
+        self.assertEqual(self.counters(), (2, 1, Decimal("12.50")))
+
+        order.is_paid = True
+        order.save()
+        self.assertEqual(self.counters(), (2, 0, Decimal("25.00")))
+        # Saving again without a change does not count the payment twice
+        order.save()
+        self.assertEqual(self.counters(), (2, 0, Decimal("25.00")))
+
+        order.is_paid = False
+        order.save(update_fields=["is_paid"])
+        self.assertEqual(self.counters(), (2, 1, Decimal("12.50")))
+
+        order.delete()
+        self.assertEqual(self.counters(), (1, 0, Decimal("12.50")))
+
+    def test_payment_through_the_api(self) -> None:
+        # Test paying a placed order moves its total into the revenue
+        self.client.force_authenticate(user=self.customer)
+        response = self.client.post(
+            reverse("restaurants:order-place"),
+            {
+                "restaurant": self.restaurant.pk,
+                "address": "Client Address",
+                "payment_method": "cash",
+                "items": [{"item_id": self.item.pk, "quantity": 2}],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.counters(), (1, 1, Decimal("0")))
+
+        url = reverse("restaurants:order-detail", kwargs={"pk": response.data["id"]})
+        response = self.client.patch(url, {"is_paid": True}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.counters(), (1, 0, Decimal("25.00")))
+
+    def test_reconcile(self) -> None:
+        # Test the command fixes drifted counters and leaves the rest alone
+        create_order(self.customer, self.restaurant, [self.item], is_paid=True)
+        other = create_restaurant(self.owner_user, name="Other")
+        Order.objects.filter(restaurant=self.restaurant).update(
+            total_amount=Decimal("30.00")
+        )
+        Restaurant.objects.filter(pk=self.restaurant.pk).update(unpaid_order_count=5)
+
+        output = StringIO()
+        call_command("reconcile_restaurant_counters", stdout=output)
+        self.assertIn("Fixed 1 restaurant(s)", output.getvalue())
+        self.assertEqual(self.counters(), (1, 0, Decimal("30.00")))
+        other.refresh_from_db()
+        self.assertEqual(other.order_count, 0)
+
+    def test_counters_are_owner_only(self) -> None:
+        # Test counters and owner ids never reach customers or anonymous users
+        private = {"order_count", "unpaid_order_count", "revenue", "owner"}
+        private |= {"created_by", "last_updated_by"}
+        self.restaurant.latitude, self.restaurant.longitude = 23.78, 90.4
+        self.restaurant.save()
+        create_order(self.customer, self.restaurant, [self.item])
+
+        response = self.client.get(
+            reverse("restaurants:restaurant-nearby"), {"lat": 23.78, "lng": 90.4}
+        )
+        self.assertEqual(response.data[0]["id"], self.restaurant.pk)
+        self.assertFalse(private & set(response.data[0]))
+
+        self.client.force_authenticate(user=self.customer)
+        response = self.client.get(
+            reverse("restaurants:order-list"), {"expand": "restaurant"}
+        )
+        restaurant = response.data["results"][0]["restaurant"]
+        self.assertEqual(restaurant["id"], self.restaurant.pk)
+        self.assertFalse(private & set(restaurant))
+
+    def test_list_includes_counters(self) -> None:
+        # Test the counters are plain columns of the restaurant list
+        create_order(self.customer, self.restaurant, [self.item])
+        self.client.force_authenticate(user=self.owner_user)
+        url = reverse("restaurants:restaurant-list")
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        restaurant = response.data["results"][0]
+        self.assertEqual(restaurant["order_count"], 1)
+        self.assertEqual(restaurant["unpaid_order_count"], 1)
+        self.assertEqual(restaurant["revenue"], "0.00")
+
+        response = self.client.patch(
+            reverse("restaurants:restaurant-detail", kwargs={"pk": restaurant["id"]}),
+            {"order_count": 100},
+        )
+        self.assertEqual(self.counters()[0], 1)
@@ -0,0 +1,142 @@
+import json
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+
+from authentication.cache import token_cache
+from restaurants import events
+from restaurants.tests.utils import (
+    create_item,
+    create_order,
+    create_restaurant,
+    create_user,
+)
+
+
+async def read(content: Any) -> str:
+    return (await anext(content)).decode()
+
+
+class RecordingBroker(events.InProcessBroker):
+    published: list[tuple[str, dict]] = []
+
+    def publish(self, channel: str, event: dict) -> None:
+        self.published.append((channel, event))
+        super().publish(channel, event)
+
+
+class InProcessBrokerTest(TestCase):
+
+    async def test_publish(self) -> None:
+        # Test events published from another thread reach subscribers
+        broker = events.InProcessBroker()
+        subscription = broker.subscribe("order:1")
+        await sync_to_async(broker.publish)("order:1", {"id": 1})
+        await sync_to_async(broker.publish)("order:2", {"id": 2})
+        self.assertEqual(await subscription.get(timeout=1), {"id": 1})
+        self.assertIsNone(await subscription.get(timeout=0.01))
+
+        subscription.close()
+        self.assertEqual(broker.subscriber_count("order:1"), 0)
+
+    async def test_overflow(self) -> None:
+        # Test a subscriber that falls behind is flagged instead of buffering
+        broker = events.InProcessBroker(queue_size=1)
+        subscription = broker.subscribe("order:1")
+        broker.publish("order:1", {"id": 1})
+        broker.publish("order:1", {"id": 1})
+        await subscription.get(timeout=1)
+        self.assertTrue(subscription.overflowed)
+
+
+@override_settings(
+    ORDER_EVENTS_BROKER="restaurants.tests.test_events.RecordingBroker",
+    ORDER_EVENTS_HEARTBEAT=0.01,
+)
+class OrderEventsTest(TestCase):
+
+    def setUp(self) -> None:
+        events.get_broker.cache_clear()
+        self.addCleanup(events.get_broker.cache_clear)
+        RecordingBroker.published = []
+        token_cache.clear()
+
+        self.owner_user = create_user("owner", "owner")
+        self.restaurant = create_restaurant(self.owner_user)
+        item = create_item(self.restaurant)
+        self.customer = create_user("customer", "customer")
+        self.order = create_order(self.customer, self.restaurant, [item])
+
+    def headers(self, user: Any) -> dict:
+        token, _ = Token.objects.get_or_create(user=user)
+        return {"Authorization": f"Token {token.key}"}
+
+    def test_order_save_publishes_after_commit(self) -> None:
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.order.is_paid = True
+            self.order.save()
+        self.assertEqual(RecordingBroker.published, [])
+
+        for callback in callbacks:
+            callback()
+        channels = [channel for channel, _ in RecordingBroker.published]
+        self.assertEqual(
+            channels, [f"restaurant:{self.restaurant.pk}", f"order:{self.order.pk}"]
+        )
+        self.assertTrue(RecordingBroker.published[0][1]["is_paid"])
+
+    async def test_order_stream(self) -> None:
+        # Test the stream starts with the current state, then pushes changes
+        url = reverse("restaurants:async-order-events", kwargs={"pk": self.order.pk})
+        headers = await sync_to_async(self.headers)(self.customer)
+        response: Any = await self.async_client.get(url, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        content = response.streaming_content
+        first = await read(content)
+        self.assertTrue(first.startswith("event: order\ndata: "))
+        self.assertFalse(json.loads(first.split("data: ")[1])["is_paid"])
+        self.assertEqual(await read(content), ": heartbeat\n\n")
+
+        event = {**json.loads(first.split("data: ")[1]), "is_paid": True}
+        events.publish_order_event(event)
+        pushed = await read(content)
+        self.assertTrue(json.loads(pushed.split("data: ")[1])["is_paid"])
+
+        await content.aclose()
+        await sync_to_async(response.close)()
+        broker = events.get_broker()
+        self.assertEqual(broker.subscriber_count(f"order:{self.order.pk}"), 0)
+
+    async def test_restaurant_stream(self) -> None:
+        url = reverse(
+            "restaurants:async-restaurant-events", kwargs={"pk": self.restaurant.pk}
+        )
+        headers = await sync_to_async(self.headers)(self.owner_user)
+        response: Any = await self.async_client.get(url, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = response.streaming_content
+        self.assertEqual(await read(content), ": heartbeat\n\n")
+        await content.aclose()
+
+    async def test_streams_outside_scope(self) -> None:
+        # Test other customers and owners cannot follow the order
+        stranger = await sync_to_async(create_user)("stranger", "customer")
+        headers = await sync_to_async(self.headers)(stranger)
+        url = reverse("restaurants:async-order-events", kwargs={"pk": self.order.pk})
+        response: Any = await self.async_client.get(url, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        url = reverse(
+            "restaurants:async-restaurant-events", kwargs={"pk": self.restaurant.pk}
+        )
+        response = await self.async_client.get(url, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            events.get_broker().subscriber_count(f"order:{self.order.pk}"), 0
+        )
@@ -0,0 +1,86 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import Any
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from restaurants.models import Order
+from restaurants.tests.utils import (
+    create_item,
+    create_order,
+    create_restaurant,
+    create_user,
+)
+
+
+class OrderExportTest(APITestCase):
+
+    def setUp(self) -> None:
+        self.owner_user = create_user("owner", "owner")
+        self.customer = create_user("customer", "customer")
+        self.restaurant = create_restaurant(self.owner_user)
+        burger = create_item(self.restaurant, name="Burger", price="8.00")
+        fries = create_item(
+            self.restaurant,
+            name="Fries",
+            price="2.00",
+            menu=burger.menu,
+            category=burger.category,
+        )
+        self.january = create_order(self.customer, self.restaurant, [burger, fries])
+        self.february = create_order(self.customer, self.restaurant, [fries])
+        Order.objects.filter(pk=self.january.pk).update(
+            created_at=datetime(2024, 1, 15, tzinfo=timezone.utc)
+        )
+        Order.objects.filter(pk=self.february.pk).update(
+            created_at=datetime(2024, 2, 15, tzinfo=timezone.utc)
+        )
+        self.client.force_authenticate(user=self.owner_user)
+        self.url = reverse(
+            "restaurants:restaurant-export-orders", kwargs={"pk": self.restaurant.pk}
+        )
+
+    def content(self, response: Any) -> str:
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_export(self) -> None:
+        # Test CSV is the default and has one row per order line
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        rows = list(csv.DictReader(io.StringIO(self.content(response))))
+        self.assertEqual(
+            [(row["order_id"], row["item_name"], row["price"]) for row in rows],
+            [
+                (self.january.order_id, "Burger", "8.00"),
+                (self.january.order_id, "Fries", "2.00"),
+                (self.february.order_id, "Fries", "2.00"),
+            ],
+        )
+
+    def test_ndjson_export(self) -> None:
+        # Test NDJSON folds the lines into one document per order
+        response = self.client.get(self.url, {"format": "ndjson"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        documents = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual(len(documents), 2)
+        self.assertEqual(documents[0]["order_id"], self.january.order_id)
+        self.assertEqual(
+            [item["item_name"] for item in documents[0]["items"]], ["Burger", "Fries"]
+        )
+
+    def test_date_range(self) -> None:
+        response = self.client.get(
+            self.url, {"format": "csv", "from": "2024-02-01", "to": "2024-03-01"}
+        )
+        rows = list(csv.DictReader(io.StringIO(self.content(response))))
+        self.assertEqual({row["order_id"] for row in rows}, {self.february.order_id})
+
+    def test_other_owner(self) -> None:
+        self.client.force_authenticate(user=create_user("other", "owner"))
+        response = self.client.get(self.url, {"format": "csv"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
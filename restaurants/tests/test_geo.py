@@ -0,0 +1,147 @@
+import random
+from typing import Any
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from restaurants import geo
+from restaurants.models import Company, Restaurant
+from restaurants.tests.utils import create_restaurant, create_user
+
+
+class GeohashTest(TestCase):
+
+    def test_encode(self) -> None:
+        # Test the reference geohash of a known point
+        self.assertEqual(geo.encode(57.64911, 10.40744, 11), "u4pruydqqvj")
+        self.assertEqual(geo.encode(-25.382708, -49.265506, 8), "6gkzwgjz")
+
+    def test_block_wraps_the_antimeridian(self) -> None:
+        # Test the neighbours of a cell on the date line are on both sides
+        cells = geo.block(0.1, 179.99, 3)
+        self.assertEqual(len(cells), 9)
+        self.assertIn(geo.encode(0.1, -179.99, 3), cells)
+
+    def test_covered_radius(self) -> None:
+        # Test every point within the covered radius falls in the block
+        rng = random.Random(1)
+        for _ in range(200):
+            lat, lng = rng.uniform(-80, 80), rng.uniform(-180, 180)
+            precision = rng.randint(2, 7)
+            covered = geo.covered_radius(lat, precision)
+            cells = geo.block(lat, lng, precision)
+            for _ in range(10):
+                # A random point at most ``covered`` km away
+                other_lat = lat + rng.uniform(-1, 1) * covered / 111.2
+                other_lng = lng + rng.uniform(-1, 1) * covered / 111.2
+                other_lng = (other_lng + 180) % 360 - 180
+                if geo.distance(lat, lng, other_lat, other_lng) <= covered:
+                    self.assertIn(geo.encode(other_lat, other_lng, precision), cells)
+
+
+class NearbyRestaurantsTest(APITestCase):
+
+    def setUp(self) -> None:
+        self.owner_user = create_user("owner", "owner")
+        self.company = Company.objects.create(name="Company")
+        self.url = reverse("restaurants:restaurant-nearby")
+
+    def create(self, name: str, latitude: Any, longitude: Any, **kwargs: Any) -> Any:
+        return Restaurant.objects.create(
+            company=self.company,
+            owner=self.owner_user.owner,
+            name=name,
+            phone_number="01700000000",
+            address="Address",
+            latitude=latitude,
+            longitude=longitude,
+            **kwargs,
+        )
+
+    def test_nearest_matches_a_full_scan(self) -> None:
+        # Test the k nearest equal the brute force answer, sparse or dense
+        rng = random.Random(7)
+        for i in range(300):
+            # A dense cluster plus restaurants scattered over the globe
+            if i % 3:
+                self.create(
+                    f"R{i}", 23.78 + rng.gauss(0, 0.05), 90.4 + rng.gauss(0, 0.05)
+                )
+            else:
+                self.create(f"R{i}", rng.uniform(-85, 85), rng.uniform(-180, 180))
+        restaurants = list(Restaurant.objects.all())
+        for _ in range(30):
+            lat, lng = rng.uniform(-60, 60), rng.uniform(-180, 180)
+            if rng.random() < 0.5:
+                lat, lng = 23.78 + rng.gauss(0, 0.1), 90.4 + rng.gauss(0, 0.1)
+            limit = rng.choice([1, 5, 20])
+            expected = sorted(
+                restaurants,
+                key=lambda r: (geo.distance(lat, lng, r.latitude, r.longitude), r.pk),
+            )[:limit]
+            found = geo.nearest(Restaurant.objects.all(), lat, lng, limit)
+            self.assertEqual([r.pk for _, r in found], [r.pk for r in expected])
+
+    def test_nearby_endpoint(self) -> None:
+        # Test open restaurants are returned nearest first with their distance
+        near = self.create("Near", 23.7800, 90.4000)
+        self.create("Closed", 23.7801, 90.4001, is_open=False)
+        far = self.create("Far", 23.8000, 90.4000)
+        self.create("Elsewhere", 51.5, -0.12)
+        self.create("Unknown", None, None)
+
+        response = self.client.get(self.url, {"lat": 23.7801, "lng": 90.4, "limit": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [r["id"] for r in response.data], [near.pk, far.pk, response.data[2]["id"]]
+        )
+        self.assertEqual(response.data[2]["name"], "Elsewhere")
+        self.assertAlmostEqual(response.data[1]["distance"], 2.213, places=2)
+
+        response = self.client.get(self.url, {"lat": 23.78, "lng": 90.4, "radius": 1})
+        self.assertEqual([r["id"] for r in response.data], [near.pk])
+
+    def test_nearby_validation(self) -> None:
+        # Test coordinates are required and range checked
+        self.assertEqual(
+            self.client.get(self.url, {"lat": 91, "lng": 0}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(
+            self.client.get(self.url, {"lat": 1}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    def test_nearby_query_count(self) -> None:
+        # Test a lookup in a dense area is one range query plus loading results
+        for i in range(20):
+            self.create(f"R{i}", 23.78 + i * 0.0005, 90.4)
+        with self.assertNumQueries(2):
+            self.client.get(self.url, {"lat": 23.781, "lng": 90.4, "limit": 5})
+
+
+class RestaurantLocationTest(APITestCase):
+
+    def setUp(self) -> None:
+        self.owner_user = create_user("owner", "owner")
+        self.restaurant = create_restaurant(self.owner_user)
+        self.client.force_authenticate(user=self.owner_user)
+        self.url = reverse(
+            "restaurants:restaurant-detail", kwargs={"pk": self.restaurant.pk}
+        )
+
+    def test_geohash_follows_coordinates(self) -> None:
+        # Test a partial update of the coordinates also writes the geohash
+        self.assertEqual(self.restaurant.geohash, "")
+        response = self.client.patch(self.url, {"latitude": 23.78, "longitude": 90.4})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.restaurant.refresh_from_db()
+        self.assertEqual(self.restaurant.geohash, geo.encode(23.78, 90.4))
+        self.assertEqual(response.data["geohash"], self.restaurant.geohash)
+
+    def test_coordinates_are_set_together(self) -> None:
+        # Test a latitude without a longitude is rejected
+        response = self.client.patch(self.url, {"latitude": 23.78})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,111 @@
+from datetime import timedelta
+from io import StringIO
+from typing import Any
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from restaurants.models import IdempotencyKey, Order, OrderItem
+from restaurants.tests.utils import (
+    create_item,
+    create_order,
+    create_restaurant,
+    create_user,
+)
+
+
+class IdempotencyKeyTest(APITestCase):
+
+    def setUp(self) -> None:
+        self.owner_user = create_user("owner", "owner")
+        self.customer = create_user("customer", "customer")
+        self.restaurant = create_restaurant(self.owner_user)
+        self.item = create_item(self.restaurant, price="8.50")
+        self.client.force_authenticate(user=self.customer)
+        self.url = reverse("restaurants:order-place")
+        self.cart = {
+            "restaurant": self.restaurant.pk,
+            "address": "Client Address",
+            "payment_method": "cash",
+            "items": [{"item_id": self.item.pk, "quantity": 2}],
+        }
+
+    def post(self, url: str, data: dict, key: str | None = "key-1") -> Any:
+        headers = {"Idempotency-Key": key} if key is not None else {}
+        return self.client.post(url, data, format="json", headers=headers)
+
+    def test_retry_replays_the_response(self) -> None:
+        # Test a retried order is created once and gets the same response
+        first = self.post(self.url, self.cart)
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn("Idempotent-Replayed", first)
+
+        with self.assertNumQueries(1):
+            retry = self.post(self.url, self.cart)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.json()["order_id"], first.data["order_id"])
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_requests_without_a_key_are_not_deduplicated(self) -> None:
+        # Test the header is optional
+        self.post(self.url, self.cart, key=None)
+        self.post(self.url, self.cart, key=None)
+        self.assertEqual(Order.objects.count(), 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_key_reused_for_a_different_request(self) -> None:
+        # Test a key cannot be replayed for another body or endpoint
+        self.post(self.url, self.cart)
+        self.cart["items"][0]["quantity"] = 3
+        response = self.post(self.url, self.cart)
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_keys_are_per_user(self) -> None:
+        # Test another user's key of the same name is not replayed
+        self.post(self.url, self.cart)
+        self.client.force_authenticate(user=create_user("other", "customer"))
+        response = self.post(self.url, self.cart)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn("Idempotent-Replayed", response)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_failed_requests_are_not_stored(self) -> None:
+        # Test a rejected request can be corrected and sent with the same key
+        self.cart["items"][0]["item_id"] = 0
+        response = self.post(self.url, self.cart)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        self.cart["items"][0]["item_id"] = self.item.pk
+        self.assertEqual(
+            self.post(self.url, self.cart).status_code, status.HTTP_201_CREATED
+        )
+
+    def test_order_item_create(self) -> None:
+        # Test order lines added with a key are not duplicated by a retry
+        order = create_order(self.customer, self.restaurant, [])
+        url = reverse("restaurants:order-item-list")
+        data = {"order": order.pk, "item": self.item.pk, "quantity": 1, "price": "8.50"}
+        first = self.post(url, data)
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.post(url, data).json()["id"], first.data["id"])
+        self.assertEqual(OrderItem.objects.count(), 1)
+
+    def test_expired_keys(self) -> None:
+        # Test expired keys are not replayed and are purged
+        self.post(self.url, self.cart)
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+        response = self.post(self.url, self.cart)
+        self.assertNotIn("Idempotent-Replayed", response)
+        self.assertEqual(Order.objects.count(), 2)
+
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+        output = StringIO()
+        call_command("purge_idempotency_keys", stdout=output)
+        self.assertIn("Deleted 1 expired key(s)", output.getvalue())
+        self.assertFalse(IdempotencyKey.objects.exists())
@@ -0,0 +1,129 @@
+import json
+from typing import Any
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from restaurants.imports import MenuImporter
+from restaurants.models import Category, Item, Menu
+from restaurants.tests.utils import create_item, create_restaurant, create_user
+
+CSV = b"""menu,category,name,description,price,is_available
+Lunch,Burgers,Cheeseburger,With cheddar,8.50,true
+Lunch,Burgers,Veggie Burger,,7.00,false
+Lunch,Sides,Fries,,abc,true
+Dinner,Burgers,Cheeseburger,Double,11.00,true
+"""
+
+
+class MenuImportTest(APITestCase):
+
+    def setUp(self) -> None:
+        self.owner_user = create_user("owner", "owner")
+        self.restaurant = create_restaurant(self.owner_user)
+        self.client.force_authenticate(user=self.owner_user)
+        self.url = reverse(
+            "restaurants:restaurant-menu-import", kwargs={"pk": self.restaurant.pk}
+        )
+
+    def upload(self, name: str, content: bytes) -> Any:
+        return self.client.post(
+            self.url, {"file": SimpleUploadedFile(name, content)}, format="multipart"
+        )
+
+    def test_csv_import(self) -> None:
+        # Test valid rows are imported and invalid rows are reported
+        response = self.upload("menu.csv", CSV)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["imported"], 3)
+        self.assertEqual(response.data["error_count"], 1)
+        self.assertEqual(response.data["errors"][0]["row"], 3)
+        self.assertIn("price", response.data["errors"][0]["errors"])
+
+        self.assertEqual(
+            set(Menu.objects.values_list("name", flat=True)), {"Lunch", "Dinner"}
+        )
+        self.assertEqual(
+            set(Category.objects.values_list("name", flat=True)), {"Burgers"}
+        )
+        veggie = Item.objects.get(name="Veggie Burger")
+        self.assertFalse(veggie.is_available)
+        self.assertEqual(veggie.created_by, self.owner_user)
+
+    def test_import_updates_existing_items(self) -> None:
+        # Test re-importing an item of an existing menu updates it in place
+        item = create_item(self.restaurant, name="Fries", price="2.00")
+        rows = [
+            {
+                "menu": item.menu.name,
+                "category": item.category.name,
+                "name": "Fries",
+                "price": "2.50",
+            }
+        ]
+        response = self.upload("menu.json", json.dumps(rows).encode())
+        self.assertEqual(response.data["imported"], 1)
+        item.refresh_from_db()
+        self.assertEqual(str(item.price), "2.50")
+        self.assertEqual(Item.objects.count(), 1)
+
+    def test_ndjson_import_reports_malformed_lines(self) -> None:
+        content = b'{"menu": "M", "category": "C", "name": "A", "price": "1"}\n{oops\n'
+        response = self.upload("menu.ndjson", content)
+        self.assertEqual(response.data["imported"], 1)
+        self.assertEqual(response.data["errors"][0]["row"], 2)
+
+    def test_repeated_rows_are_imported_once(self) -> None:
+        # Test the count reports items written, not rows repeating an item
+        row = {"menu": "M", "category": "C", "name": "A", "price": "1"}
+        response = self.upload("menu.json", json.dumps([row, row]).encode())
+        self.assertEqual(response.data["imported"], 1)
+        self.assertEqual(Item.objects.count(), 1)
+
+    def test_undecodable_file(self) -> None:
+        # Test files that are not UTF-8 or not CSV are rejected, not a 500
+        for name, content in (
+            ("menu.csv", b"\xff\xfe"),
+            ("menu.ndjson", b"\xff\xfe"),
+            ("menu.csv", CSV + b"Lunch,Sides," + b"x" * 200_000 + b",,2.00,true\n"),
+        ):
+            with self.subTest(name=name, content=content[-10:]):
+                response = self.upload(name, content)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Item.objects.exists())
+
+    def test_item_names_are_unique_per_menu(self) -> None:
+        # Test creating an item named like another one of its menu is a 400
+        item = create_item(self.restaurant, name="Fries", price="2.00")
+        data = {
+            "restaurant": self.restaurant.pk,
+            "menu": item.menu.pk,
+            "category": item.category.pk,
+            "name": "Fries",
+            "price": "3.00",
+        }
+        response = self.client.post(reverse("restaurants:item-list"), data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Item.objects.count(), 1)
+
+    def test_unsupported_file(self) -> None:
+        response = self.upload("menu.xlsx", b"")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_count_does_not_grow_with_rows(self) -> None:
+        # Test a batch costs the same number of queries whatever its size
+        def run(count: int) -> int:
+            rows = [
+                {"menu": "M", "category": "C", "name": f"Item {i}", "price": "1"}
+                for i in range(count)
+            ]
+            importer = MenuImporter(self.restaurant, self.owner_user)
+            with CaptureQueriesContext(connection) as context:
+                importer.run(rows)
+            return len(context.captured_queries)
+
+        self.assertEqual(run(5), run(200))
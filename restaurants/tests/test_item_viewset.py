@@ -0,0 +1,90 @@
+from decimal import Decimal
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from restaurants.menu_document import get_cache, get_menu_document
+from restaurants.models import Item
+from restaurants.tests.utils import create_item, create_restaurant, create_user
+
+
+class ItemBulkUpdateTest(APITestCase):
+
+    def setUp(self) -> None:
+        get_cache().clear()
+        self.owner_user = create_user("owner", "owner")
+        self.restaurant = create_restaurant(self.owner_user)
+        self.burger = create_item(self.restaurant, name="Burger", price="8.00")
+        self.fries = create_item(
+            self.restaurant,
+            name="Fries",
+            price="3.00",
+            menu=self.burger.menu,
+            category=self.burger.category,
+        )
+        self.url = reverse("restaurants:item-bulk")
+        self.client.force_authenticate(user=self.owner_user)
+
+    def test_bulk_update(self) -> None:
+        # Test prices and availability of several items change in one request
+        data = [
+            {"id": self.burger.pk, "price": "9.50"},
+            {"id": self.fries.pk, "is_available": False},
+        ]
+        response = self.client.patch(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+
+        self.burger.refresh_from_db()
+        self.fries.refresh_from_db()
+        self.assertEqual(self.burger.price, Decimal("9.50"))
+        self.assertTrue(self.burger.is_available)
+        self.assertEqual(self.fries.price, Decimal("3.00"))
+        self.assertFalse(self.fries.is_available)
+        self.assertEqual(self.fries.last_updated_by, self.owner_user)
+
+    def test_query_count_does_not_grow_with_items(self) -> None:
+        # Test ownership is checked with one query and the update is batched
+        items = [self.burger, self.fries] + [
+            create_item(
+                self.restaurant,
+                name=f"Item {i}",
+                menu=self.burger.menu,
+                category=self.burger.category,
+            )
+            for i in range(10)
+        ]
+        data = [{"id": item.pk, "is_available": False} for item in items]
+        # The restaurant scope, the item lookup and one UPDATE in a savepoint
+        with self.assertNumQueries(5):
+            response = self.client.patch(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Item.objects.filter(is_available=True).exists())
+
+    def test_menu_document_invalidated(self) -> None:
+        # Test the cached menu document is refreshed after a bulk update
+        get_menu_document(self.restaurant.pk)
+        data = [{"id": self.burger.pk, "price": "9.50"}]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(self.url, data, format="json")
+        document = get_menu_document(self.restaurant.pk)
+        assert document is not None
+        self.assertIn(b'"price":"9.50"', document[0])
+
+    def test_items_of_other_restaurants_are_rejected(self) -> None:
+        # Test the whole request fails when any item is not editable
+        other_user = create_user("other", "owner")
+        other = create_item(create_restaurant(other_user, name="Other"), name="Soup")
+        data = [
+            {"id": self.burger.pk, "price": "1.00"},
+            {"id": other.pk, "price": "1.00"},
+        ]
+        response = self.client.patch(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.burger.refresh_from_db()
+        self.assertEqual(self.burger.price, Decimal("8.00"))
+
+    def test_empty_list(self) -> None:
+        response = self.client.patch(self.url, [], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,82 @@
+import json
+from typing import Any
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from restaurants.menu_document import get_cache
+from restaurants.tests.utils import create_item, create_restaurant, create_user
+
+
+class MenuDocumentTest(APITestCase):
+
+    def setUp(self) -> None:
+        get_cache().clear()
+        self.owner_user = create_user("owner", "owner")
+        self.restaurant = create_restaurant(self.owner_user)
+        self.item = create_item(self.restaurant, name="Burger", price="8.50")
+        self.url = reverse(
+            "restaurants:restaurant-menu-document", kwargs={"pk": self.restaurant.pk}
+        )
+
+    def test_menu_document(self) -> None:
+        # Test anonymous clients get the full menu tree
+        response: Any = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        document = json.loads(response.content)
+        self.assertEqual(document["name"], self.restaurant.name)
+        category = document["menus"][0]["categories"][0]
+        self.assertEqual(category["name"], self.item.category.name)
+        self.assertEqual(category["items"][0]["name"], "Burger")
+        self.assertEqual(category["items"][0]["price"], "8.50")
+
+    def test_cached_document_costs_no_queries(self) -> None:
+        # Test a warm cache serves the document without touching the database
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_none_match(self) -> None:
+        # Test an unchanged menu is answered with 304 Not Modified
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_invalidated_on_item_change(self) -> None:
+        # Test saving an item invalidates the cached document
+        etag = self.client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.price = "9.00"
+            self.item.save()
+        response: Any = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b'"price":"9.00"', response.content)
+
+    def test_items_of_foreign_menus_are_rejected(self) -> None:
+        # Test an item cannot be filed under another restaurant's menu, which
+        # would leave it out of the document tree
+        foreign = create_item(create_restaurant(self.owner_user, name="Other"))
+        self.client.force_authenticate(user=self.owner_user)
+        data = {
+            "restaurant": self.restaurant.pk,
+            "menu": foreign.menu_id,
+            "category": self.item.category_id,
+            "name": "Stray",
+            "price": "1.00",
+        }
+        response: Any = self.client.post(
+            reverse("restaurants:item-list"), data, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("non_field_errors", response.data)
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unknown_restaurant(self) -> None:
+        url = reverse("restaurants:restaurant-menu-document", kwargs={"pk": 0})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,95 @@
+import threading
+from contextlib import AbstractContextManager, nullcontext
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from restaurants.models import Order
+from restaurants.order_ids import new_ulid, restaurant_codes
+from restaurants.tests.utils import create_restaurant, create_user
+
+
+class OrderIdTest(TestCase):
+
+    def setUp(self) -> None:
+        restaurant_codes.clear()
+        self.owner_user = create_user("owner", "owner")
+        self.restaurant = create_restaurant(self.owner_user, name="The Green Fork")
+
+    def test_format(self) -> None:
+        order_id = Order(restaurant=self.restaurant).generate_order_id()
+        prefix, code, ulid = order_id.split("-")
+        self.assertEqual((prefix, code), ("ORD", "TGF"))
+        self.assertEqual(len(ulid), 26)
+
+    def test_ids_are_monotonic(self) -> None:
+        # Test ids minted in the same millisecond still sort in order
+        ids = [new_ulid() for _ in range(1000)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_restaurant_code_is_cached(self) -> None:
+        # Test only the first id of an unloaded restaurant costs a query
+        with self.assertNumQueries(1):
+            Order(restaurant_id=self.restaurant.pk).generate_order_id()
+        with self.assertNumQueries(0):
+            Order(restaurant_id=self.restaurant.pk).generate_order_id()
+
+    def test_renamed_restaurant(self) -> None:
+        Order(restaurant=self.restaurant).generate_order_id()
+        self.restaurant.name = "Blue Door"
+        self.restaurant.save()
+        order_id = Order(restaurant_id=self.restaurant.pk).generate_order_id()
+        self.assertTrue(order_id.startswith("ORD-BD-"))
+
+
+class ConcurrentOrderIdTest(TransactionTestCase):
+
+    def test_concurrent_inserts(self) -> None:
+        # Test orders inserted from many threads never collide on order_id
+        owner_user = create_user("owner", "owner")
+        customer = create_user("customer", "customer")
+        restaurant = create_restaurant(owner_user)
+        threads, per_thread = 8, 25
+        errors: list[Exception] = []
+        barrier = threading.Barrier(threads)
+        # SQLite's shared in-memory test database locks tables instead of
+        # waiting, so writes take turns there; the ids are still minted
+        # concurrently, before the lock is taken.
+        write_lock: AbstractContextManager = (
+            threading.Lock() if connection.vendor == "sqlite" else nullcontext()
+        )
+        # Minting reads the restaurant name on a cache miss, which would race
+        # the locked writes of the order counters
+        restaurant_codes.set(restaurant.pk, restaurant.name)
+
+        def insert() -> None:
+            try:
+                barrier.wait()
+                for _ in range(per_thread):
+                    order = Order(
+                        client=customer,
+                        restaurant_id=restaurant.pk,
+                        address="Address",
+                        payment_method="cash",
+                        total_amount=Decimal("1.00"),
+                    )
+                    order.order_id = order.generate_order_id()
+                    with write_lock:
+                        order.save()
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=insert) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(errors, [])
+        order_ids = list(Order.objects.values_list("order_id", flat=True))
+        self.assertEqual(len(order_ids), threads * per_thread)
+        self.assertEqual(len(set(order_ids)), len(order_ids))
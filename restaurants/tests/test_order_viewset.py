@@ -0,0 +1,128 @@
+from decimal import Decimal
+from typing import Any
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from restaurants.models import Order
+from restaurants.tests.utils import (
+    create_item,
+    create_order,
+    create_restaurant,
+    create_user,
+)
+
+
+class OrderViewSetTest(APITestCase):
+
+    def setUp(self) -> None:
+        self.owner_user = create_user("owner", "owner")
+        self.customer = create_user(
+            "customer", "customer", first_name="Jane", last_name="Doe"
+        )
+        self.restaurant = create_restaurant(self.owner_user)
+        burger = create_item(self.restaurant, name="Burger", price="8.50")
+        fries = create_item(
+            self.restaurant,
+            name="Fries",
+            price="3.00",
+            menu=burger.menu,
+            category=burger.category,
+        )
+        self.items = [burger, fries]
+        self.client.force_authenticate(user=self.customer)
+        self.url = reverse("restaurants:order-list")
+
+    def count_list_queries(self) -> int:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries)
+
+    def test_list_embeds_order_lines(self) -> None:
+        # Test the list endpoint embeds lines with the item name and price
+        order = create_order(self.customer, self.restaurant, self.items)
+        response: Any = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result = response.data["results"][0]
+        self.assertEqual(result["order_id"], order.order_id)
+        self.assertEqual(result["client_name"], "Jane Doe")
+        self.assertEqual(result["restaurant_name"], self.restaurant.name)
+        self.assertEqual(
+            [(line["item_name"], line["price"]) for line in result["order_items"]],
+            [("Burger", "8.50"), ("Fries", "3.00")],
+        )
+
+    def test_list_query_count_is_constant(self) -> None:
+        # Test the number of queries does not grow with the number of orders
+        for _ in range(2):
+            create_order(self.customer, self.restaurant, self.items)
+        few = self.count_list_queries()
+
+        for _ in range(10):
+            create_order(self.customer, self.restaurant, self.items)
+        many = self.count_list_queries()
+
+        self.assertEqual(few, many)
+
+
+class PlaceOrderTest(APITestCase):
+
+    def setUp(self) -> None:
+        self.owner_user = create_user("owner", "owner")
+        self.customer = create_user("customer", "customer")
+        self.restaurant = create_restaurant(self.owner_user)
+        first = create_item(self.restaurant, name="Item 0", price="2.50")
+        self.items = [first] + [
+            create_item(
+                self.restaurant,
+                name=f"Item {i}",
+                price="2.50",
+                menu=first.menu,
+                category=first.category,
+            )
+            for i in range(1, 20)
+        ]
+        self.client.force_authenticate(user=self.customer)
+        self.url = reverse("restaurants:order-place")
+
+    def place(self, lines: list[dict]) -> Any:
+        data = {
+            "restaurant": self.restaurant.pk,
+            "address": "Client Address",
+            "payment_method": "card",
+            "items": lines,
+        }
+        return self.client.post(self.url, data, format="json")
+
+    def test_place_order(self) -> None:
+        # Test the total is computed server side from the item prices
+        lines = [{"item_id": item.pk, "quantity": 2} for item in self.items[:3]]
+        lines.append({"item_id": self.items[0].pk, "quantity": 1})
+        response = self.place(lines)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["total_amount"], "17.50")
+        self.assertEqual(len(response.data["order_items"]), 3)
+        order = Order.objects.get(pk=response.data["id"])
+        self.assertEqual(order.client, self.customer)
+        self.assertEqual(order.total_amount, Decimal("17.50"))
+
+    def test_query_count_does_not_grow_with_lines(self) -> None:
+        # Test a 20 line cart costs as many queries as a 2 line cart
+        with CaptureQueriesContext(connection) as small:
+            self.place([{"item_id": item.pk, "quantity": 1} for item in self.items[:2]])
+        with CaptureQueriesContext(connection) as large:
+            self.place([{"item_id": item.pk, "quantity": 1} for item in self.items])
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_unavailable_item(self) -> None:
+        # Test the whole cart is rejected when an item is not available
+        self.items[1].is_available = False
+        self.items[1].save()
+        lines = [{"item_id": item.pk, "quantity": 1} for item in self.items[:2]]
+        response = self.place(lines)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Order.objects.exists())
@@ -0,0 +1,63 @@
+from typing import Any
+
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from authentication.models import User
+from restaurants.models import Company
+
+
+class KeysetPaginationTest(APITestCase):
+
+    def setUp(self) -> None:
+        self.owner_user = User.objects.create_user(
+            username="owner", password="password", user_type="owner"
+        )
+        self.companies = [
+            Company.objects.create(name=f"Company {i}", created_by=self.owner_user)
+            for i in range(7)
+        ]
+        # Give a few rows the same timestamp so the id tie-breaker is exercised
+        Company.objects.filter(
+            pk__in=[company.pk for company in self.companies[2:5]]
+        ).update(created_at=timezone.now())
+        self.client.force_authenticate(user=self.owner_user)
+        self.url = reverse("restaurants:company-list")
+
+    def expected_order(self) -> list[int]:
+        return list(
+            Company.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+    def test_walk_forward_and_back(self) -> None:
+        # Test following next links visits every row once, newest first
+        seen: list[int] = []
+        pages: list[str] = []
+        url: Any = f"{self.url}?page_size=3"
+        while url:
+            response: Any = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(url)
+            seen.extend(row["id"] for row in response.data["results"])
+            url = response.data["next"]
+        self.assertEqual(seen, self.expected_order())
+        self.assertEqual(len(pages), 3)
+
+        # Test following previous links from the last page returns the same pages
+        response = self.client.get(pages[-1])
+        previous: Any = self.client.get(response.data["previous"])
+        self.assertEqual(
+            [row["id"] for row in previous.data["results"]], self.expected_order()[3:6]
+        )
+        first: Any = self.client.get(previous.data["previous"])
+        self.assertEqual(
+            [row["id"] for row in first.data["results"]], self.expected_order()[:3]
+        )
+        self.assertIsNone(first.data["previous"])
+
+    def test_invalid_cursor(self) -> None:
+        # Test a tampered cursor is rejected
+        response = self.client.get(f"{self.url}?cursor=bogus")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,77 @@
+import re
+from typing import Any
+from unittest import skipUnless
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from authentication.models import User
+from restaurants.tests.utils import create_restaurant, create_user
+from restaurants.views import (
+    CategoryViewSet,
+    ItemViewSet,
+    MenuViewSet,
+    OrderItemViewSet,
+    OrderViewSet,
+    RestaurantViewSet,
+)
+
+
+@skipUnless(connection.vendor == "sqlite", "Asserts on SQLite query plans")
+class QueryPlanTest(TestCase):
+
+    def setUp(self) -> None:
+        self.owner_user = create_user("owner", "owner")
+        self.restaurant = create_restaurant(self.owner_user)
+        self.employee_user = create_user("employee", "employee")
+        self.employee_user.employee.restaurant = self.restaurant
+        self.employee_user.employee.save()
+
+    def list_page(self, viewset: Any, user: User) -> QuerySet:
+        # The page queryset the list endpoint of the viewset runs for the user
+        request = APIRequestFactory().get("/")
+        force_authenticate(request, user)
+        view = viewset(action_map={"get": "list"}, format_kwarg=None, kwargs={})
+        view.request = view.initialize_request(request)
+        queryset = view.filter_queryset(view.get_queryset())
+        return view.paginator.page_queryset(queryset, view.request)
+
+    def assertUsesIndex(self, queryset: QuerySet, index: str) -> None:
+        plan = queryset.explain()
+        self.assertRegex(plan, rf"USING (COVERING )?INDEX {re.escape(index)}\b")
+        # Unfiltered lists walk the index and stop after one page
+        for line in plan.splitlines():
+            if "SCAN restaurants_" in line:
+                self.assertIn(f"INDEX {index}", line)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_restaurant_list(self) -> None:
+        # Test an owner's restaurants are read in index order
+        self.assertUsesIndex(
+            self.list_page(RestaurantViewSet, self.owner_user), "restaurant_owner_idx"
+        )
+
+    def test_menu_category_and_item_lists(self) -> None:
+        # Test the scoped lists are read in index order for owners and employees
+        for user in (self.owner_user, self.employee_user):
+            with self.subTest(user=user.username):
+                self.assertUsesIndex(
+                    self.list_page(MenuViewSet, user), "menu_restaurant_idx"
+                )
+                self.assertUsesIndex(
+                    self.list_page(CategoryViewSet, user), "category_restaurant_idx"
+                )
+                self.assertUsesIndex(
+                    self.list_page(ItemViewSet, user), "item_restaurant_created_idx"
+                )
+
+    def test_order_and_order_item_lists(self) -> None:
+        # Test the order lists are read in index order
+        self.assertUsesIndex(
+            self.list_page(OrderViewSet, self.owner_user), "order_created_idx"
+        )
+        self.assertUsesIndex(
+            self.list_page(OrderItemViewSet, self.owner_user), "orderitem_created_idx"
+        )
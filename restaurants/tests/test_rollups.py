@@ -0,0 +1,142 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from restaurants.models import DailyOrders, DailySales, OrderItem
+from restaurants.tests.utils import (
+    create_item,
+    create_order,
+    create_restaurant,
+    create_user,
+)
+
+
+def snapshot() -> list[tuple]:
+    return list(
+        DailySales.objects.order_by("item_id").values_list(
+            "item_id", "quantity", "revenue", "paid_revenue", "order_count"
+        )
+    )
+
+
+def order_snapshot() -> list[tuple]:
+    return list(DailyOrders.objects.values_list("order_count", "revenue"))
+
+
+class DailySalesTest(TestCase):
+
+    def setUp(self) -> None:
+        self.owner_user = create_user("owner", "owner")
+        self.customer = create_user("customer", "customer")
+        self.restaurant = create_restaurant(self.owner_user)
+        self.burger = create_item(self.restaurant, name="Burger", price="8.00")
+        self.fries = create_item(
+            self.restaurant,
+            name="Fries",
+            price="2.00",
+            menu=self.burger.menu,
+            category=self.burger.category,
+        )
+
+    def test_lines_are_rolled_up(self) -> None:
+        # Test each new order line is added to the rollup of its day
+        create_order(self.customer, self.restaurant, [self.burger, self.fries])
+        create_order(self.customer, self.restaurant, [self.fries])
+        self.assertEqual(
+            snapshot(),
+            [
+                (self.burger.pk, 1, Decimal("8.00"), Decimal("0.00"), 1),
+                (self.fries.pk, 2, Decimal("4.00"), Decimal("0.00"), 2),
+            ],
+        )
+
+    def test_payment_flips_paid_revenue(self) -> None:
+        # Test marking an order paid, then unpaid, moves its revenue
+        order = create_order(self.customer, self.restaurant, [self.burger])
+        order.is_paid = True
+        order.save()
+        self.assertEqual(snapshot()[0][3], Decimal("8.00"))
+        order.is_paid = False
+        order.save(update_fields=["is_paid"])
+        self.assertEqual(snapshot()[0][3], Decimal("0.00"))
+
+    def test_deleted_lines_are_removed(self) -> None:
+        order = create_order(self.customer, self.restaurant, [self.burger])
+        OrderItem.objects.get(order=order).delete()
+        self.assertEqual(snapshot(), [(self.burger.pk, 0, Decimal("0.00"), 0, 0)])
+
+    def test_repeated_item_lines_count_one_order(self) -> None:
+        # Test an order with several lines of an item counts once for it
+        order = create_order(self.customer, self.restaurant, [self.burger] * 2)
+        OrderItem.objects.create(
+            order=order, item=self.burger, quantity=1, price=self.burger.price
+        )
+        self.assertEqual(snapshot(), [(self.burger.pk, 3, Decimal("24.00"), 0, 1)])
+        incremental = snapshot()
+        call_command("rebuild_daily_sales", stdout=StringIO())
+        self.assertEqual(snapshot(), incremental)
+
+        lines = OrderItem.objects.filter(order=order).order_by("pk")
+        lines.last().delete()
+        self.assertEqual(snapshot(), [(self.burger.pk, 2, Decimal("16.00"), 0, 1)])
+        lines.delete()
+        self.assertEqual(snapshot(), [(self.burger.pk, 0, Decimal("0.00"), 0, 0)])
+
+    def test_deleted_order_with_repeated_lines(self) -> None:
+        # Test deleting an order counts it out once per item
+        create_order(self.customer, self.restaurant, [self.fries])
+        order = create_order(
+            self.customer, self.restaurant, [self.burger, self.fries, self.fries]
+        )
+        order.delete()
+        self.assertEqual(
+            snapshot(),
+            [
+                (self.burger.pk, 0, Decimal("0.00"), 0, 0),
+                (self.fries.pk, 1, Decimal("2.00"), 0, 1),
+            ],
+        )
+
+    def test_orders_are_rolled_up_per_day(self) -> None:
+        # Test orders are counted once per day with their totals, and out again
+        create_order(self.customer, self.restaurant, [self.burger, self.fries])
+        order = create_order(self.customer, self.restaurant, [self.fries] * 2)
+        self.assertEqual(order_snapshot(), [(2, Decimal("14.00"))])
+        order.delete()
+        self.assertEqual(order_snapshot(), [(1, Decimal("10.00"))])
+
+    def test_rebuild_matches_incremental(self) -> None:
+        # Test the rebuild command reproduces the incrementally kept rollups
+        create_order(self.customer, self.restaurant, [self.burger, self.fries])
+        create_order(self.customer, self.restaurant, [self.fries], is_paid=True)
+        incremental, orders = snapshot(), order_snapshot()
+        DailySales.objects.update(quantity=0, revenue=0)
+        DailyOrders.objects.all().delete()
+        call_command("rebuild_daily_sales", stdout=StringIO())
+        self.assertEqual(snapshot(), incremental)
+        self.assertEqual(order_snapshot(), orders)
+
+
+class PlaceOrderRollupTest(APITestCase):
+
+    def test_placed_order_is_rolled_up(self) -> None:
+        # Test bulk placed orders are added to the rollup in the same request
+        restaurant = create_restaurant(create_user("owner", "owner"))
+        item = create_item(restaurant, price="3.00")
+        self.client.force_authenticate(user=create_user("customer", "customer"))
+        self.client.post(
+            reverse("restaurants:order-place"),
+            {
+                "restaurant": restaurant.pk,
+                "address": "Client Address",
+                "payment_method": "cash",
+                "items": [{"item_id": item.pk, "quantity": 3}],
+            },
+            format="json",
+        )
+        self.assertEqual(snapshot(), [(item.pk, 3, Decimal("9.00"), 0, 1)])
+        self.assertEqual(order_snapshot(), [(1, Decimal("9.00"))])
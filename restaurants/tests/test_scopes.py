@@ -0,0 +1,106 @@
+from typing import Any
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from restaurants.models import Menu
+from restaurants.scopes import restaurant_scope
+from restaurants.tests.utils import create_item, create_restaurant, create_user
+
+
+class RestaurantScopeTest(APITestCase):
+
+    def setUp(self) -> None:
+        self.owner_user = create_user("owner", "owner")
+        self.restaurant = create_restaurant(self.owner_user)
+        self.item = create_item(self.restaurant, name="Burger")
+
+        other_owner = create_user("other", "owner")
+        self.other_restaurant = create_restaurant(other_owner, name="Other")
+        self.other_item = create_item(self.other_restaurant, name="Soup")
+
+        self.employee_user = create_user("employee", "employee")
+        self.employee_user.employee.restaurant = self.restaurant
+        self.employee_user.employee.save()
+
+    def test_scope(self) -> None:
+        # Test the scope is resolved with one query and cached on the request
+        request: Any = APIRequestFactory().get("/")
+        request.user = self.owner_user
+        with self.assertNumQueries(1):
+            self.assertEqual(restaurant_scope(request), {self.restaurant.pk})
+            self.assertEqual(restaurant_scope(request), {self.restaurant.pk})
+
+        request = APIRequestFactory().get("/")
+        request.user = create_user("customer", "customer")
+        self.assertEqual(restaurant_scope(request), frozenset())
+
+    def test_employee_without_profile(self) -> None:
+        # Test an employee user missing its employee row gets an empty scope
+        self.employee_user.employee.delete()
+        self.employee_user.refresh_from_db()
+        self.client.force_authenticate(user=self.employee_user)
+        response: Any = self.client.get(reverse("restaurants:item-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [])
+
+    def test_list_is_limited_to_scope(self) -> None:
+        # Test owners and employees only list objects of their restaurants
+        for user in (self.owner_user, self.employee_user):
+            self.client.force_authenticate(user=user)
+            response: Any = self.client.get(reverse("restaurants:item-list"))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            names = [item["name"] for item in response.data["results"]]
+            self.assertEqual(names, ["Burger"])
+
+    def test_employee_can_update_restaurant_objects(self) -> None:
+        self.client.force_authenticate(user=self.employee_user)
+        url = reverse("restaurants:item-detail", kwargs={"pk": self.item.pk})
+        response = self.client.patch(url, {"price": "12.00"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_objects_outside_scope_are_hidden(self) -> None:
+        self.client.force_authenticate(user=self.employee_user)
+        url = reverse("restaurants:item-detail", kwargs={"pk": self.other_item.pk})
+        response = self.client.patch(url, {"price": "12.00"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_create_outside_scope(self) -> None:
+        # Test objects cannot be created for a restaurant outside the scope
+        self.client.force_authenticate(user=self.owner_user)
+        url = reverse("restaurants:menu-list")
+        data = {"restaurant": self.other_restaurant.pk, "name": "Brunch"}
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        data["restaurant"] = self.restaurant.pk
+        response = self.client.post(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Menu.objects.filter(name="Brunch").exists())
+
+    def test_move_outside_scope(self) -> None:
+        # Test objects cannot be moved into a restaurant outside the scope
+        self.client.force_authenticate(user=self.owner_user)
+        url = reverse("restaurants:menu-detail", kwargs={"pk": self.item.menu_id})
+        data = {"restaurant": self.other_restaurant.pk}
+        response = self.client.patch(url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.item.menu.refresh_from_db()
+        self.assertEqual(self.item.menu.restaurant_id, self.restaurant.pk)
+
+    def test_item_parts_belong_to_its_restaurant(self) -> None:
+        # Test an item cannot point at a menu or category of another restaurant
+        self.client.force_authenticate(user=self.owner_user)
+        url = reverse("restaurants:item-detail", kwargs={"pk": self.item.pk})
+        for data in (
+            {"restaurant": self.other_restaurant.pk},
+            {"menu": self.other_item.menu_id},
+            {"category": self.other_item.category_id},
+        ):
+            with self.subTest(data=data):
+                response = self.client.patch(url, data, format="json")
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.restaurant_id, self.restaurant.pk)
+        self.assertEqual(self.item.menu.restaurant_id, self.restaurant.pk)
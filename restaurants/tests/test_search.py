@@ -0,0 +1,117 @@
+from typing import Any
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from restaurants import search
+from restaurants.tests.utils import create_item, create_restaurant, create_user
+
+
+class ItemSearchTest(APITestCase):
+
+    def setUp(self) -> None:
+        self.owner_user = create_user("owner", "owner")
+        self.restaurant = create_restaurant(self.owner_user, name="Spice Garden")
+        self.biryani = create_item(
+            self.restaurant,
+            name="Chicken Biryani",
+            description="Basmati rice with spiced chicken",
+        )
+        self.curry = create_item(
+            self.restaurant,
+            name="Chicken Curry",
+            description="Served with a side of biryani rice",
+            menu=self.biryani.menu,
+        )
+        self.url = reverse("restaurants:item-search")
+
+    def get(self, **params: Any) -> Any:
+        return self.client.get(self.url, params)
+
+    def names(self, response: Any) -> list[str]:
+        return [item["name"] for item in response.data]
+
+    def test_search_ranks_name_matches_first(self) -> None:
+        # Test a match in the name outranks one in the description
+        response = self.get(q="biryani")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.names(response), ["Chicken Biryani", "Chicken Curry"])
+
+    def test_search_matches_prefixes(self) -> None:
+        # Test partial words and different case or accents match
+        self.assertEqual(self.names(self.get(q="cur")), ["Chicken Curry"])
+        self.assertEqual(len(self.get(q="CHICK").data), 2)
+        self.assertEqual(len(self.get(q="spicé").data), 2)
+
+    def test_search_requires_every_word(self) -> None:
+        # Test all words must match, in any of the indexed fields
+        self.assertEqual(self.names(self.get(q="spice curry")), ["Chicken Curry"])
+        self.assertEqual(self.get(q="curry pizza").data, [])
+
+    def test_search_ignores_query_syntax(self) -> None:
+        # Test operators in the input are treated as plain words
+        response = self.get(q='curry" OR NOT (name:*')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get(q="***").data, [])
+
+    def test_search_follows_changes(self) -> None:
+        # Test saves, renames and deletes are reflected in the results
+        self.curry.name = "Vegetable Korma"
+        self.curry.is_available = False
+        self.curry.save()
+        self.assertEqual(self.get(q="korma").data, [])
+        self.curry.is_available = True
+        self.curry.save()
+        self.assertEqual(self.names(self.get(q="korma")), ["Vegetable Korma"])
+
+        self.biryani.category.name = "Rice Dishes"
+        self.biryani.category.save()
+        self.assertEqual(self.names(self.get(q="dishes")), ["Chicken Biryani"])
+
+        self.restaurant.name = "Saffron House"
+        self.restaurant.save()
+        self.assertEqual(len(self.get(q="saffron").data), 2)
+
+        other = create_restaurant(self.owner_user, name="Tandoor Express")
+        self.curry.restaurant = other
+        self.curry.save(update_fields=["restaurant"])
+        self.assertEqual(self.names(self.get(q="tandoor")), ["Vegetable Korma"])
+
+        self.biryani.delete()
+        self.assertNotIn("Chicken Biryani", self.names(self.get(q="biryani")))
+
+    def test_search_pagination(self) -> None:
+        # Test limit and offset page through the ranked results
+        self.assertEqual(
+            self.names(self.get(q="chicken", limit=1, offset=1)), ["Chicken Curry"]
+        )
+        response = self.get(q="chicken", limit=0)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get().status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_query_count(self) -> None:
+        # Test a search is one index query plus one to load the items
+        with self.assertNumQueries(2):
+            self.get(q="chicken")
+
+    def test_imported_items_are_indexed(self) -> None:
+        # Test items written in bulk by a menu import can be found
+        self.client.force_authenticate(user=self.owner_user)
+        url = reverse(
+            "restaurants:restaurant-menu-import", kwargs={"pk": self.restaurant.pk}
+        )
+        rows = b"menu,category,name,price\nLunch,Soups,Lentil Soup,4.00\n"
+        self.client.post(
+            url, {"file": SimpleUploadedFile("menu.csv", rows)}, format="multipart"
+        )
+        self.assertEqual(self.names(self.get(q="lentil")), ["Lentil Soup"])
+
+    def test_rebuild(self) -> None:
+        # Test the command recreates the index from the items
+        search.remove_items([self.biryani.pk, self.curry.pk])
+        self.assertEqual(self.get(q="chicken").data, [])
+        call_command("rebuild_search_index", stdout=open("/dev/null", "w"))
+        self.assertEqual(len(self.get(q="chicken").data), 2)
@@ -0,0 +1,32 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from authentication.models import Customer, Owner
+from restaurants.models import Item, Order, OrderItem, Restaurant
+
+
+class SeedDataCommandTest(TestCase):
+
+    def test_seed_data(self) -> None:
+        # Test the requested volume is created along with user profiles
+        call_command(
+            "seed_data",
+            companies=2,
+            restaurants=2,
+            menus=1,
+            categories=2,
+            items=3,
+            customers=5,
+            orders=4,
+            lines=2,
+            stdout=StringIO(),
+        )
+        self.assertEqual(Owner.objects.count(), 2)
+        self.assertEqual(Customer.objects.count(), 5)
+        self.assertEqual(Restaurant.objects.count(), 4)
+        self.assertEqual(Item.objects.count(), 24)
+        self.assertEqual(Order.objects.count(), 16)
+        self.assertEqual(OrderItem.objects.count(), 32)
+        self.assertFalse(Order.objects.filter(order_id="").exists())
@@ -0,0 +1,65 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from restaurants.models import Company
+from restaurants.serializers import CompanySerializer, RestaurantSerializer
+from restaurants.tests.utils import create_restaurant, create_user
+
+
+class CustomModelSerializerTest(TestCase):
+
+    def setUp(self) -> None:
+        self.owner_user = create_user("owner", "owner")
+        self.request = APIRequestFactory().post("/")
+        self.request.user = self.owner_user
+        self.context = {"request": self.request}
+
+    def test_create_is_a_single_insert(self) -> None:
+        # Test the audit fields are written by the INSERT itself
+        serializer = CompanySerializer(
+            data={"name": "New Company"}, context=self.context
+        )
+        self.assertTrue(serializer.is_valid())
+        with self.assertNumQueries(1):
+            company = serializer.save()
+        company.refresh_from_db()
+        self.assertEqual(company.created_by, self.owner_user)
+        self.assertEqual(company.last_updated_by, self.owner_user)
+
+    def test_update_writes_changed_fields_only(self) -> None:
+        # Test an update only writes the changed columns and audit fields
+        company = Company.objects.create(name="Company", description="Kept")
+        serializer = CompanySerializer(
+            company,
+            data={"name": "Renamed", "description": "Kept"},
+            context=self.context,
+        )
+        self.assertTrue(serializer.is_valid())
+        with CaptureQueriesContext(connection) as context:
+            serializer.save()
+        self.assertEqual(len(context.captured_queries), 1)
+        sql = context.captured_queries[0]["sql"]
+        self.assertIn('"name"', sql)
+        self.assertIn('"last_updated_by_id"', sql)
+        self.assertNotIn('"description"', sql)
+        company.refresh_from_db()
+        self.assertEqual(company.name, "Renamed")
+        self.assertEqual(company.last_updated_by, self.owner_user)
+
+    def test_update_compares_foreign_keys_by_id(self) -> None:
+        # Test an unchanged foreign key neither loads nor writes the relation
+        restaurant = create_restaurant(self.owner_user)
+        restaurant.refresh_from_db()
+        serializer = RestaurantSerializer(
+            restaurant,
+            data={"company": restaurant.company_id, "address": "New Address"},
+            context=self.context,
+            partial=True,
+        )
+        self.assertTrue(serializer.is_valid())
+        with CaptureQueriesContext(connection) as context:
+            serializer.save()
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertNotIn('"company_id"', context.captured_queries[0]["sql"])
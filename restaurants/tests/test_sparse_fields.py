@@ -0,0 +1,82 @@
+from typing import Any
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from restaurants.tests.utils import (
+    create_item,
+    create_order,
+    create_restaurant,
+    create_user,
+)
+
+
+class SparseFieldsTest(APITestCase):
+
+    def setUp(self) -> None:
+        self.owner_user = create_user("owner", "owner")
+        self.restaurant = create_restaurant(self.owner_user)
+        self.item = create_item(self.restaurant, name="Burger", price="8.50")
+        self.client.force_authenticate(user=self.owner_user)
+        self.url = reverse("restaurants:item-list")
+
+    def test_fields(self) -> None:
+        # Test only the requested fields are rendered and read from the database
+        with CaptureQueriesContext(connection) as context:
+            response: Any = self.client.get(self.url, {"fields": "id,name,price"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"],
+            [{"id": self.item.pk, "name": "Burger", "price": "8.50"}],
+        )
+        item_query = next(
+            query["sql"]
+            for query in context.captured_queries
+            if 'FROM "restaurants_item"' in query["sql"]
+        )
+        self.assertNotIn("description", item_query)
+        self.assertNotIn("last_updated_by_id", item_query)
+
+    def test_expand(self) -> None:
+        # Test expanded relations are embedded and joined, not queried per row
+        for i in range(3):
+            create_item(
+                self.restaurant,
+                name=f"Item {i}",
+                menu=self.item.menu,
+                category=self.item.category,
+            )
+        params = {"fields": "id,menu", "expand": "menu,unknown"}
+        with CaptureQueriesContext(connection) as context:
+            response: Any = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result = response.data["results"][0]
+        self.assertEqual(set(result), {"id", "menu"})
+        self.assertEqual(result["menu"]["name"], self.item.menu.name)
+        # The restaurant scope and the joined item page
+        self.assertEqual(len(context.captured_queries), 2)
+
+    def test_unused_joins_and_prefetches_are_dropped(self) -> None:
+        customer = create_user("customer", "customer")
+        order = create_order(customer, self.restaurant, [self.item])
+        url = reverse("restaurants:order-list")
+        with self.assertNumQueries(1):
+            response: Any = self.client.get(url, {"fields": "id,order_id"})
+        self.assertEqual(
+            response.data["results"], [{"id": order.pk, "order_id": order.order_id}]
+        )
+
+    def test_detail(self) -> None:
+        url = reverse("restaurants:item-detail", kwargs={"pk": self.item.pk})
+        response: Any = self.client.get(url, {"fields": "name"})
+        self.assertEqual(response.data, {"name": "Burger"})
+
+    def test_writes_are_not_narrowed(self) -> None:
+        url = reverse("restaurants:item-detail", kwargs={"pk": self.item.pk})
+        url += "?fields=name"
+        response: Any = self.client.patch(url, {"price": "9.00"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("description", response.data)
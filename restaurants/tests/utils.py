@@ -0,0 +1,66 @@
+from decimal import Decimal
+from typing import Any
+
+from authentication.models import User
+from restaurants.models import (
+    Category,
+    Company,
+    Item,
+    Menu,
+    Order,
+    OrderItem,
+    Restaurant,
+)
+
+
+def create_user(username: str, user_type: str, **kwargs: Any) -> User:
+    return User.objects.create_user(
+        username=username, password="password", user_type=user_type, **kwargs
+    )
+
+
+def create_restaurant(owner: User, name: str = "Test Restaurant") -> Restaurant:
+    company = Company.objects.create(name=f"{name} Company", created_by=owner)
+    return Restaurant.objects.create(
+        company=company,
+        owner=owner.owner,
+        name=name,
+        phone_number="01700000000",
+        address="Restaurant Address",
+        created_by=owner,
+    )
+
+
+def create_item(
+    restaurant: Restaurant, name: str = "Item", price: str = "10.00", **kwargs: Any
+) -> Item:
+    menu = kwargs.pop("menu", None) or Menu.objects.create(
+        restaurant=restaurant, name="Menu"
+    )
+    category = kwargs.pop("category", None) or Category.objects.create(
+        restaurant=restaurant, name="Category"
+    )
+    return Item.objects.create(
+        restaurant=restaurant,
+        menu=menu,
+        category=category,
+        name=name,
+        price=Decimal(price),
+        **kwargs,
+    )
+
+
+def create_order(
+    client: User, restaurant: Restaurant, items: list[Item], **kwargs: Any
+) -> Order:
+    kwargs.setdefault("payment_method", "cash")
+    order = Order.objects.create(
+        client=client,
+        restaurant=restaurant,
+        address="Client Address",
+        total_amount=sum((item.price for item in items), Decimal("0")),
+        **kwargs,
+    )
+    for item in items:
+        OrderItem.objects.create(order=order, item=item, quantity=1, price=item.price)
+    return order
@@ -1,6 +1,7 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from restaurants import async_views
 from restaurants.views import (
     CategoryViewSet,
     CompanyViewSet,
@@ -25,5 +26,26 @@ router.register(r"order-items", OrderItemViewSet, basename="order-item")
 
 
 urlpatterns = [
+    path(
+        "async/restaurants/<int:pk>/menu-document/",
+        async_views.menu_document,
+        name="async-menu-document",
+    ),
+    path(
+        "async/restaurants/<int:pk>/events/",
+        async_views.restaurant_events,
+        name="async-restaurant-events",
+    ),
+    path("async/orders/", async_views.order_list, name="async-order-list"),
+    path(
+        "async/orders/<int:pk>/status/",
+        async_views.order_status,
+        name="async-order-status",
+    ),
+    path(
+        "async/orders/<int:pk>/events/",
+        async_views.order_events,
+        name="async-order-events",
+    ),
     path("", include(router.urls)),
 ]
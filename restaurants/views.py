@@ -1,10 +1,28 @@
+from functools import partial
 from typing import Any
 
-from django.db.models import QuerySet
-from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
+from django.db.models import Prefetch, QuerySet
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
 from authentication.permissions import IsOwner, IsOwnerOrEmployeeOrReadOnly
+from core.conditional import ConditionalGetMixin
+from core.sparse_fields import SparseQuerysetMixin
+from restaurants import exports, geo, search
+from restaurants.analytics import order_analytics
+from restaurants.idempotency import IdempotentCreateMixin
+from restaurants.imports import MenuImporter, parse_rows
+from restaurants.menu_document import get_menu_document
 from restaurants.models import (
     Category,
     Company,
@@ -14,24 +32,34 @@ from restaurants.models import (
     OrderItem,
     Restaurant,
 )
+from restaurants.renderers import CSVRenderer, NDJSONRenderer
+from restaurants.scopes import filter_by_scope, in_scope
 from restaurants.serializers import (
+    AnalyticsQuerySerializer,
     CategorySerializer,
     CompanySerializer,
+    ExportQuerySerializer,
+    ItemChangeSerializer,
     ItemSerializer,
     MenuSerializer,
+    NearbyQuerySerializer,
+    NearbyRestaurantSerializer,
     OrderItemSerializer,
+    OrderReadSerializer,
     OrderSerializer,
+    PlaceOrderSerializer,
     RestaurantSerializer,
+    SearchQuerySerializer,
 )
 
 
-class CompanyViewSet(ModelViewSet):
+class CompanyViewSet(ConditionalGetMixin, SparseQuerysetMixin, ModelViewSet):
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
     permission_classes = [IsOwner]
 
 
-class RestaurantViewSet(ModelViewSet):
+class RestaurantViewSet(ConditionalGetMixin, SparseQuerysetMixin, ModelViewSet):
     queryset = Restaurant.objects.all()
     serializer_class = RestaurantSerializer
     permission_classes = [IsOwner]
@@ -39,20 +67,149 @@ class RestaurantViewSet(ModelViewSet):
     def get_queryset(self) -> QuerySet | None:
         user: Any = self.request.user
         if user.user_type == "owner":
-            return self.queryset.filter(owner=user)
+            # Owner profiles share the primary key of their user
+            return self.queryset.filter(owner_id=user.pk)
         return self.queryset.none()
 
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="menu-document",
+        permission_classes=[AllowAny],
+    )
+    def menu_document(self, request: Request, pk: str) -> HttpResponse:
+        # Public, pre-rendered Menu -> Category -> Item tree of a restaurant
+        document = get_menu_document(int(pk)) if pk.isdigit() else None
+        if document is None:
+            raise NotFound()
+        body, etag = document
 
-class CustomViewSetForEmployee(ModelViewSet):
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(body, content_type="application/json")
+        response["ETag"] = etag
+        # Let shared caches keep the document but revalidate it on every use
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="nearby",
+        permission_classes=[AllowAny],
+        serializer_class=NearbyRestaurantSerializer,
+    )
+    def nearby(self, request: Request) -> Response:
+        # The open restaurants nearest to ?lat=&lng=, closest first
+        query = NearbyQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        matches = geo.nearest(
+            Restaurant.objects.filter(is_open=True),
+            params["lat"],
+            params["lng"],
+            params["limit"],
+            params.get("radius"),
+        )
+        restaurants = []
+        for distance, restaurant in matches:
+            restaurant.distance = round(distance, 3)
+            restaurants.append(restaurant)
+        return Response(self.get_serializer(restaurants, many=True).data)
+
+    @action(detail=True, methods=["get"], url_path="analytics")
+    def analytics(self, request: Request, pk: str) -> Response:
+        # Revenue and order time series aggregated in the database
+        restaurant = self.get_object()
+        params = request.query_params
+        query = AnalyticsQuerySerializer(
+            data={
+                key: params[param]
+                for key, param in (
+                    ("start", "from"),
+                    ("end", "to"),
+                    ("bucket", "bucket"),
+                )
+                if param in params
+            }
+        )
+        query.is_valid(raise_exception=True)
+
+        data, timeout = order_analytics(restaurant.pk, **query.validated_data)
+        response = Response(data)
+        patch_cache_control(response, private=True, max_age=timeout)
+        return response
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="orders/export",
+        renderer_classes=[JSONRenderer, CSVRenderer, NDJSONRenderer],
+    )
+    def export_orders(self, request: Request, pk: str) -> StreamingHttpResponse:
+        # Stream every order and its lines as CSV (default) or NDJSON
+        restaurant = self.get_object()
+        params = request.query_params
+        query = ExportQuerySerializer(
+            data={
+                key: params[param]
+                for key, param in (("start", "from"), ("end", "to"))
+                if param in params
+            }
+        )
+        query.is_valid(raise_exception=True)
+
+        rows = exports.order_rows(restaurant.pk, **query.validated_data)
+        if request.accepted_renderer.format == "ndjson":
+            stream, renderer = exports.ndjson_stream(rows), NDJSONRenderer
+        else:
+            stream, renderer = exports.csv_stream(rows), CSVRenderer
+
+        response = StreamingHttpResponse(
+            stream, content_type=f"{renderer.media_type}; charset=utf-8"
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="orders-{restaurant.pk}.{renderer.format}"'
+        )
+        return response
+
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="menu-import",
+        parser_classes=[MultiPartParser],
+    )
+    def menu_import(self, request: Request, pk: str) -> Response:
+        # Upsert menus, categories and items from an uploaded CSV/JSON file
+        restaurant = self.get_object()
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": "No file was submitted."})
+
+        importer = MenuImporter(restaurant, request.user)
+        result = importer.run(parse_rows(upload, upload.name))
+        return Response(result)
+
+
+class CustomViewSetForEmployee(ConditionalGetMixin, SparseQuerysetMixin, ModelViewSet):
     permission_classes = [IsOwnerOrEmployeeOrReadOnly]
 
     def get_queryset(self) -> QuerySet | None:
-        user: Any = self.request.user
-        if user.user_type == "owner":
-            return self.queryset.filter(owner=user)  # type: ignore
-        elif user.user_type == "employee":
-            return self.queryset.filter(employees=user)  # type: ignore
-        return self.queryset.none()  # type: ignore
+        # Objects of the restaurants the user owns or works at
+        return filter_by_scope(self.queryset, self.request)  # type: ignore
+
+    def perform_create(self, serializer: Any) -> None:
+        if not in_scope(self.request, serializer.validated_data["restaurant"].pk):
+            raise PermissionDenied()
+        serializer.save()
+
+    def perform_update(self, serializer: Any) -> None:
+        # Objects cannot be moved into a restaurant the user does not manage
+        restaurant = serializer.validated_data.get("restaurant")
+        if restaurant is not None and not in_scope(self.request, restaurant.pk):
+            raise PermissionDenied()
+        serializer.save()
 
 
 class MenuViewSet(CustomViewSetForEmployee):
@@ -72,14 +229,95 @@ class ItemViewSet(CustomViewSetForEmployee):
     serializer_class = ItemSerializer
     permission_classes = [IsOwnerOrEmployeeOrReadOnly]
 
+    @action(
+        detail=False,
+        methods=["patch"],
+        url_path="bulk",
+        serializer_class=ItemChangeSerializer,
+    )
+    def bulk(self, request: Request) -> Response:
+        # Change the price and/or availability of many items in one request
+        serializer = self.get_serializer(
+            data=request.data, many=True, allow_empty=False
+        )
+        serializer.is_valid(raise_exception=True)
+        items = serializer.save()
+        output = ItemSerializer(items, many=True, context=self.get_serializer_context())
+        return Response(output.data)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="search",
+        permission_classes=[AllowAny],
+    )
+    def search(self, request: Request) -> Response:
+        # Available items of every restaurant matching ?q=, best match first
+        query = SearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        params = query.validated_data
+        ids = search.search(params["q"], params["limit"], params["offset"])
+        items = Item.objects.in_bulk(ids)
+        output = ItemSerializer(
+            [items[pk] for pk in ids if pk in items],
+            many=True,
+            context=self.get_serializer_context(),
+        )
+        return Response(output.data)
+
 
-class OrderViewSet(ModelViewSet):
-    queryset = Order.objects.all()
+class OrderViewSet(
+    IdempotentCreateMixin, ConditionalGetMixin, SparseQuerysetMixin, ModelViewSet
+):
+    queryset = Order.objects.select_related("client", "restaurant").prefetch_related(
+        Prefetch("order_items", queryset=OrderItem.objects.select_related("item"))
+    )
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated]
+    # Read through by the item, restaurant and client names of
+    # OrderReadSerializer
+    conditional_related = ["order_items__item", "restaurant", "client"]
 
+    def get_serializer_class(self) -> Any:
+        if self.action in ("list", "retrieve"):
+            return OrderReadSerializer
+        return self.serializer_class
 
-class OrderItemViewSet(ModelViewSet):
+    @transaction.atomic
+    def perform_update(self, serializer: Any) -> None:
+        # Keeps the payment change and the sales rollup in one transaction
+        serializer.save()
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="place",
+        serializer_class=PlaceOrderSerializer,
+    )
+    def place(self, request: Request) -> Any:
+        # Create an order and all of its lines from a cart in one transaction
+        return self.idempotent(request, partial(self.place_order, request))
+
+    def place_order(self, request: Request) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        order = serializer.save()
+        output = OrderReadSerializer(
+            self.get_queryset().get(pk=order.pk),
+            context=self.get_serializer_context(),
+        )
+        return Response(output.data, status=status.HTTP_201_CREATED)
+
+
+class OrderItemViewSet(
+    IdempotentCreateMixin, ConditionalGetMixin, SparseQuerysetMixin, ModelViewSet
+):
     queryset = OrderItem.objects.all()
     serializer_class = OrderItemSerializer
     permission_classes = [IsAuthenticated]
+
+    @transaction.atomic
+    def perform_create(self, serializer: Any) -> None:
+        # Keeps the new line and the sales rollup in one transaction
+        serializer.save()